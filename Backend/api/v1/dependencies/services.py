@@ -0,0 +1,30 @@
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Backend.core.v1.db.session import get_db_session
+from Backend.core.v1.db_manager.postgresql.chat_db_manager import AsyncChatDBManager
+from Backend.services.v1.chat.service import ChatService
+from Backend.services.v1.container import ServiceContainer
+from Backend.services.v1.documents.job_queue import DocumentJobQueue
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """Return the process-wide service container created at application startup."""
+    return request.app.state.container
+
+
+def get_chat_service(
+    db: AsyncSession = Depends(get_db_session),
+    container: ServiceContainer = Depends(get_container),
+) -> ChatService:
+    """Return a ChatService bound to this request's database session and the shared agent."""
+    return ChatService(
+        chat_db_manager=AsyncChatDBManager(db),
+        agent=container.chat_agent,
+        turn_writer=container.turn_writer,
+    )
+
+
+def get_document_jobs(container: ServiceContainer = Depends(get_container)) -> DocumentJobQueue:
+    """Return the shared document-processing job queue."""
+    return container.document_jobs
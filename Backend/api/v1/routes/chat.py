@@ -1,39 +1,74 @@
 # This file contains the routes for the chat API
+import json
 import os
+from typing import AsyncIterator, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, File, Query, UploadFile
+from fastapi.responses import StreamingResponse
 
 from Backend.api.v1.dependencies.auth import UserInfo, verify_api_key
-from Backend.core.v1.common.exceptions import NotFoundOrAccessException
+from Backend.api.v1.dependencies.services import get_chat_service, get_document_jobs
+from Backend.config.v1.constants import OCR_JOB_MAX_WAIT_SECONDS
+from Backend.core.v1.common.exceptions import (
+    DatabaseOperationException,
+    InvalidCursorException,
+    NotFoundOrAccessException,
+    QueueFullException,
+)
 from Backend.services.v1.chat.service import ChatService
+from Backend.services.v1.documents.job_queue import DocumentJob, DocumentJobQueue
 from Backend.api.v1.schema.chat.request import ChatRequest
-from Backend.api.v1.schema.chat.response import ChatResponse, ChatSession, ChatSessionList
-from Backend.core.v1.agents.ocr_agent import process_document
-from Backend.core.v1.utils.env_config import load_environment, configure_google_api
+from Backend.api.v1.schema.chat.response import (
+    ChatHistoryPage,
+    ChatResponse,
+    ChatSessionList,
+    ChatStreamChunk,
+    DocumentJobStatus,
+)
+from Backend.core.v1.utils.env_config import load_environment
 
-# Load environment variables and configure Google API on startup
+# Load environment variables on startup; the Google API is configured by the ServiceContainer
 load_environment()
-configure_google_api()
 
 router = APIRouter()
 
+
+def _sse_event(event: str, data: str) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _sse_stream(events: AsyncIterator[Union[ChatStreamChunk, ChatResponse]]) -> AsyncIterator[str]:
+    """Translate chat stream events into Server-Sent Events."""
+    try:
+        async for event in events:
+            if isinstance(event, ChatResponse):
+                yield _sse_event("done", event.model_dump_json())
+            else:
+                yield _sse_event("chunk", event.model_dump_json())
+    except Exception as e:
+        yield _sse_event("error", json.dumps({"detail": str(e)}))
+
+
 @router.post("/new", response_model=ChatResponse)
 async def create_new_chat(
-    request: ChatRequest, user_info: UserInfo = Depends(verify_api_key)
+    request: ChatRequest,
+    user_info: UserInfo = Depends(verify_api_key),
+    chat_service: ChatService = Depends(get_chat_service),
 ):
     """Create a new chat session and send the first message"""
-    chat_service = ChatService()
     return await chat_service.handle_new_chat_message(
         user_info.user_id, request.message
     )
 
 @router.post("/{session_id}", response_model=ChatResponse)
 async def send_message(
-    session_id: str, request: ChatRequest, user_info: UserInfo = Depends(verify_api_key)
+    session_id: str,
+    request: ChatRequest,
+    user_info: UserInfo = Depends(verify_api_key),
+    chat_service: ChatService = Depends(get_chat_service),
 ):
     """Send a message to an existing chat session"""
-    chat_service = ChatService()
     try:
         # Remove the request.sources parameter which doesn't exist in the method signature
         return await chat_service.handle_message(
@@ -41,24 +76,59 @@ async def send_message(
         )
     except NotFoundOrAccessException as e:
         raise HTTPException(status_code=403, detail=str(e))
+    except (DatabaseOperationException, QueueFullException) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@router.post("/{session_id}/stream")
+async def stream_message(
+    session_id: str,
+    request: ChatRequest,
+    user_info: UserInfo = Depends(verify_api_key),
+    chat_service: ChatService = Depends(get_chat_service),
+):
+    """Send a message to an existing chat session and stream the reply as Server-Sent Events.
+
+    Emits `chunk` events with partial text as it is generated, then a single `done`
+    event carrying the ChatResponse once the turn has been saved.
+    """
+    try:
+        session, conversation = await chat_service.load_conversation(user_info.user_id, session_id)
+    except NotFoundOrAccessException as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except DatabaseOperationException as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
-@router.get("/{session_id}", response_model=ChatSession)
+    return StreamingResponse(
+        _sse_stream(chat_service.stream_message(session, conversation, request.message)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/{session_id}", response_model=ChatHistoryPage)
 async def get_chat_history(
-    session_id: str, user_info: UserInfo = Depends(verify_api_key)
+    session_id: str,
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of messages to return"),
+    before: Optional[int] = Query(None, ge=0, description="next_before from the previous page"),
+    user_info: UserInfo = Depends(verify_api_key),
+    chat_service: ChatService = Depends(get_chat_service),
 ):
-    """Get the full history of a chat session"""
-    chat_service = ChatService()
+    """Get the latest messages of a chat session; page back with `before`"""
     try:
-        return chat_service.get_chat_history(user_info.user_id, session_id)
+        return await chat_service.get_chat_history(user_info.user_id, session_id, limit, before)
     except NotFoundOrAccessException as e:
         raise HTTPException(status_code=403, detail=str(e))
+    except DatabaseOperationException as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 @router.delete("/{session_id}")
-async def delete_chat(session_id: str, user_info: UserInfo = Depends(verify_api_key)):
+async def delete_chat(
+    session_id: str,
+    user_info: UserInfo = Depends(verify_api_key),
+    chat_service: ChatService = Depends(get_chat_service),
+):
     """Delete a chat session"""
-    chat_service = ChatService()
     try:
-        delete_status = chat_service.delete_session(user_info.user_id, session_id)
+        delete_status = await chat_service.delete_session(user_info.user_id, session_id)
         if delete_status:
             return {
                 "status": "success",
@@ -72,12 +142,17 @@ async def delete_chat(session_id: str, user_info: UserInfo = Depends(verify_api_
         )
 
 @router.get("/", response_model=ChatSessionList)
-async def get_all_chats(user_info: UserInfo = Depends(verify_api_key)):
-    """Get metadata for all chat sessions"""
-    chat_service = ChatService()
-    return ChatSessionList(
-        sessions=chat_service.get_chat_history_by_user_id(user_info.user_id)
-    )
+async def get_all_chats(
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of sessions to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    user_info: UserInfo = Depends(verify_api_key),
+    chat_service: ChatService = Depends(get_chat_service),
+):
+    """Get metadata for the user's chat sessions, most recently updated first"""
+    try:
+        return await chat_service.list_sessions(user_info.user_id, limit, cursor)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # @router.post("/upload", response_model=JSONResponse)
 # async def upload_file(
@@ -105,14 +180,32 @@ async def get_all_chats(user_info: UserInfo = Depends(verify_api_key)):
     
 #     return JSONResponse(content={"filename": file.filename, "result": result})
 
-@router.post("/process-file/{session_id}", response_model=dict)
+def _job_status(job: DocumentJob) -> DocumentJobStatus:
+    return DocumentJobStatus(
+        job_id=job.id,
+        status=job.status,
+        filename=job.filename,
+        extracted_data=job.result,
+        message=job.error,
+        pages=job.page_stats,
+    )
+
+
+@router.post("/process-file/{session_id}", response_model=DocumentJobStatus, status_code=202)
 async def process_file(
     session_id: str,
     file: UploadFile = File(...),
-    user_info: UserInfo = Depends(verify_api_key)
+    user_info: UserInfo = Depends(verify_api_key),
+    chat_service: ChatService = Depends(get_chat_service),
+    document_jobs: DocumentJobQueue = Depends(get_document_jobs),
 ):
+    """Queue an uploaded PDF or image for processing and return the job to poll."""
     import tempfile
-    import shutil
+
+    try:
+        await chat_service.check_session_access(user_info.user_id, session_id)
+    except NotFoundOrAccessException as e:
+        raise HTTPException(status_code=403, detail=str(e))
     
     # Validate file type
     allowed_types = ["application/pdf", "image/jpeg", "image/png", "image/jpg"]
@@ -138,32 +231,14 @@ async def process_file(
             content = await file.read()
             tmp_file.write(content)
             file_location = tmp_file.name
-        
-        # Extract text and generate summary
-        result = process_document(file_location)
-        
-        # Clean up temporary file
+
+        # OCR runs in the job queue's worker processes; the queue removes the file when done
+        job = await document_jobs.submit(user_info.user_id, session_id, file.filename, file_location)
+        return _job_status(job)
+
+    except QueueFullException as e:
         os.remove(file_location)
-          # Check if processing was successful
-        if result.startswith("Error") or result.startswith("File not found") or result.startswith("No text"):
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "status": "error",
-                    "message": result,
-                    "filename": file.filename
-                }
-            )
-        
-        # Return processed data without injecting into chat session
-        # The frontend will handle adding this to the conversation
-        return JSONResponse(content={
-            "status": "success",
-            "message": "Document processed successfully",
-            "filename": file.filename,
-            "extracted_data": result
-        })
-            
+        raise HTTPException(status_code=503, detail=e.message, headers={"Retry-After": "5"})
     except Exception as e:
         # Clean up temporary file if it exists
         if 'file_location' in locals() and os.path.exists(file_location):
@@ -171,4 +246,21 @@ async def process_file(
         raise HTTPException(
             status_code=500, 
             detail=f"Error processing file: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/process-file/jobs/{job_id}", response_model=DocumentJobStatus)
+async def get_process_file_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to wait for the job to finish before responding"),
+    user_info: UserInfo = Depends(verify_api_key),
+    document_jobs: DocumentJobQueue = Depends(get_document_jobs),
+):
+    """Return the status of a document job, optionally long-polling until it finishes."""
+    try:
+        job = await document_jobs.get(user_info.user_id, job_id)
+    except NotFoundOrAccessException as e:
+        raise HTTPException(status_code=404, detail=e.message)
+
+    job = await document_jobs.wait(job, min(wait, OCR_JOB_MAX_WAIT_SECONDS))
+    return _job_status(job)
@@ -0,0 +1,51 @@
+# This file contains the routes for operational metrics
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from Backend.api.v1.dependencies.auth import UserInfo, require_admin
+from Backend.api.v1.dependencies.services import get_container
+from Backend.core.v1.common.cache import get_cache_metrics
+from Backend.core.v1.common.startup import startup_report
+from Backend.core.v1.db.session import get_pool_metrics
+from Backend.services.v1.container import ServiceContainer
+
+router = APIRouter()
+
+
+@router.get("/cache")
+async def cache_metrics(user_info: UserInfo = Depends(require_admin)) -> Dict[str, Any]:
+    """Return hit/miss metrics for the agent response cache."""
+    return get_cache_metrics()
+
+
+@router.get("/intents")
+async def intent_metrics(
+    user_info: UserInfo = Depends(require_admin),
+    container: ServiceContainer = Depends(get_container),
+) -> Dict[str, Any]:
+    """Return per-intent routing decisions and turn latency percentiles."""
+    return container.chat_agent.intent_router.stats.snapshot()
+
+
+@router.get("/startup")
+async def startup_metrics(user_info: UserInfo = Depends(require_admin)) -> Dict[str, Any]:
+    """Return the cold-start phase timings of this worker."""
+    return startup_report.summary()
+
+
+@router.get("/db-pool")
+async def db_pool_metrics(user_info: UserInfo = Depends(require_admin)) -> Dict[str, Any]:
+    """Return database connection pool utilization for this worker."""
+    return get_pool_metrics()
+
+
+@router.get("/chat-writes")
+async def chat_write_metrics(
+    user_info: UserInfo = Depends(require_admin),
+    container: ServiceContainer = Depends(get_container),
+) -> Dict[str, Any]:
+    """Return the chat durability mode and, in write-behind mode, queue and flush counters."""
+    if container.turn_writer is None:
+        return {"mode": "sync"}
+    return {"mode": "write_behind", **container.turn_writer.stats()}
@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-from Backend.core.v1.types.chat import ChatMessage, ChatSession
+from Backend.core.v1.types.chat import ChatMessage, ChatSession, ChatSessionSummary
 
 
 class ChatResponse(BaseModel):
@@ -11,7 +11,39 @@ class ChatResponse(BaseModel):
     session_title: Optional[str] = Field(None, description="Title of the chat session")
 
 
+class ChatHistoryPage(ChatSession):
+    next_before: Optional[int] = Field(
+        None,
+        description="Pass as `before` to fetch the previous page; null when the start of the session is reached",
+    )
+
+
+class ChatStreamChunk(BaseModel):
+    text: str = Field(..., description="Partial assistant response text")
+
+
 class ChatSessionList(BaseModel):
-    sessions: List[ChatSession] = Field(
-        default_factory=list, description="List of chat sessions"
+    sessions: List[ChatSessionSummary] = Field(
+        default_factory=list, description="Chat session metadata, most recently updated first"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null when there are no more sessions"
+    )
+
+
+class DocumentPageStat(BaseModel):
+    page: int = Field(..., description="1-based page number")
+    method: str = Field(..., description="text (text layer), ocr or blank")
+    seconds: float = Field(..., description="Time spent extracting the page")
+    chars: int = Field(..., description="Characters of text extracted")
+
+
+class DocumentJobStatus(BaseModel):
+    job_id: str = Field(..., description="ID of the document-processing job")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    filename: str = Field(..., description="Name of the uploaded file")
+    extracted_data: Optional[str] = Field(None, description="Document summary once the job has succeeded")
+    message: Optional[str] = Field(None, description="Failure reason once the job has failed")
+    pages: List[DocumentPageStat] = Field(
+        default_factory=list, description="Per-page extraction method and timing for PDFs"
     )
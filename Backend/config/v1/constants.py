@@ -1,3 +1,88 @@
+import os
+
 # Chat Service Constants
 CHAT_DEFAULT_TITLE = "New Untitled Chat"
 
+# Symptom Analysis Constants
+# Per-call timeout for the downstream lookups (Wikipedia context, Gemini disease info)
+SYMPTOM_LOOKUP_TIMEOUT_SECONDS = float(os.getenv("SYMPTOM_LOOKUP_TIMEOUT_SECONDS", "8"))
+SYMPTOM_CONTEXT_FALLBACK = "No additional context available"
+
+# Conversation Context Constants
+# Number of most recent user/assistant turns sent verbatim to the model
+CONTEXT_MAX_RECENT_TURNS = int(os.getenv("CONTEXT_MAX_RECENT_TURNS", "6"))
+# Approximate token budget for summary + recent history + the new message
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+CONTEXT_SUMMARY_MAX_WORDS = int(os.getenv("CONTEXT_SUMMARY_MAX_WORDS", "150"))
+
+# Response Cache Constants
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "86400"))
+# Optional SQLite file shared by all workers on a host; empty disables the shared tier
+RESPONSE_CACHE_SQLITE_PATH = os.getenv("RESPONSE_CACHE_SQLITE_PATH", "")
+
+# Disease Knowledge Index Constants
+DISEASE_INDEX_PATH = os.getenv(
+    "DISEASE_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "disease_index.sqlite"),
+)
+# Minimum difflib similarity ratio for a fuzzy condition-name match
+DISEASE_INDEX_MATCH_CUTOFF = float(os.getenv("DISEASE_INDEX_MATCH_CUTOFF", "0.85"))
+# Disable in air-gapped deployments so unknown conditions use the static fallback
+DISEASE_CONTEXT_LIVE_FALLBACK = os.getenv("DISEASE_CONTEXT_LIVE_FALLBACK", "true").lower() == "true"
+
+# Intent Router Constants
+# Rule-based decisions below this confidence are settled by a short LLM classification
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.6"))
+INTENT_LLM_FALLBACK = os.getenv("INTENT_LLM_FALLBACK", "true").lower() == "true"
+# Number of recent turn latencies kept per intent for percentile stats
+INTENT_LATENCY_WINDOW = int(os.getenv("INTENT_LATENCY_WINDOW", "500"))
+
+# Structured Output Constants
+# Model calls allowed per structured request, including re-asks after malformed JSON
+STRUCTURED_OUTPUT_MAX_ATTEMPTS = int(os.getenv("STRUCTURED_OUTPUT_MAX_ATTEMPTS", "2"))
+
+# Document (OCR) Job Constants
+# Worker processes running OCR concurrently; each holds its own OCR model in memory
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", "2"))
+# Queued plus running jobs accepted before uploads are rejected with 503
+OCR_MAX_QUEUE_DEPTH = int(os.getenv("OCR_MAX_QUEUE_DEPTH", "16"))
+# Finished jobs are kept for polling this long
+OCR_JOB_TTL_SECONDS = float(os.getenv("OCR_JOB_TTL_SECONDS", "3600"))
+# Upper bound for the long-poll `wait` parameter of the job status route
+OCR_JOB_MAX_WAIT_SECONDS = float(os.getenv("OCR_JOB_MAX_WAIT_SECONDS", "30"))
+# Load the OCR model when each worker process starts instead of on its first job
+OCR_PRELOAD_IN_WORKERS = os.getenv("OCR_PRELOAD_IN_WORKERS", "true").lower() == "true"
+# Rasterization resolution for OCR of scanned PDF pages
+OCR_PDF_DPI = int(os.getenv("OCR_PDF_DPI", "200"))
+# Pages beyond this cap are not processed
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "50"))
+# Pages rasterized/OCRed concurrently inside one worker; also bounds how many page images are in memory
+OCR_PAGE_WORKERS = int(os.getenv("OCR_PAGE_WORKERS", "2"))
+# A PDF page whose text layer has fewer alphanumeric characters than this is OCRed instead
+OCR_TEXT_LAYER_MIN_CHARS = int(os.getenv("OCR_TEXT_LAYER_MIN_CHARS", "30"))
+
+# Database Connection Pool Constants
+# Each worker holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections; size these against Postgres max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Seconds a request waits for a free connection before failing
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections older than this many seconds are replaced, staying ahead of server/proxy idle timeouts
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Apply pending Alembic migrations when a worker starts; disable when migrations run as a separate deploy step
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "true").lower() == "true"
+
+# Chat Persistence Constants
+# "sync" commits every turn before the response is sent; "write_behind" responds first and
+# commits turns in batches, so a crash can lose up to one flush interval of turns
+CHAT_DURABILITY_MODE = os.getenv("CHAT_DURABILITY_MODE", "sync").lower()
+# Write-behind: queued turns are flushed at least this often
+CHAT_WRITE_BEHIND_FLUSH_MS = int(os.getenv("CHAT_WRITE_BEHIND_FLUSH_MS", "100"))
+# Write-behind: flush early once this many messages are queued
+CHAT_WRITE_BEHIND_MAX_BATCH = int(os.getenv("CHAT_WRITE_BEHIND_MAX_BATCH", "200"))
+# Write-behind: queued messages allowed per worker; a full queue makes new turns wait for a flush
+CHAT_WRITE_BEHIND_MAX_PENDING = int(os.getenv("CHAT_WRITE_BEHIND_MAX_PENDING", "5000"))
+# Write-behind: failed flush attempts per session before its queued turns are dropped
+CHAT_WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("CHAT_WRITE_BEHIND_MAX_ATTEMPTS", "3"))
@@ -1,10 +1,14 @@
 import google.generativeai as genai
 import os
-import re
+import time
 from .symptom_agent import SymptomAnalyzerAgent as symptom_agent
 from .dietitian_agent import DietitianAgent as diet_agent
+from .context_window import ContextWindowManager
+from .conversation import ConversationState, TurnContext, bind_turn, record_model_call
+from .intent_router import PRESCRIPTION_DATA_PREFIX, Intent, IntentRouter
+from .symptom_matcher import match_symptoms, symptom_phrases
 from dotenv import load_dotenv
-from typing import Dict, List
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 from Backend.core.v1.common.logger import get_logger
 from Backend.core.v1.common.exceptions import AgentProcessingException
 
@@ -12,7 +16,7 @@ load_dotenv()
 logger = get_logger(__name__)
 
 class HealthcareChatAgent:
-    def __init__(self):
+    def __init__(self, symptom_analyzer: symptom_agent = None, dietitian: diet_agent = None):
         # Define system_instruction first
         self.system_instruction = """
         You are a medical AI assistant designed to provide users with basic medical insights based on symptoms, prescriptions, and reports. Your responses should be informative, empathetic, and easy to understand. Follow these rules:
@@ -32,9 +36,11 @@ class HealthcareChatAgent:
 
         self.api_key = os.getenv("GEMINI_API_KEY")
         self._configure_model()
-        self.conversation_history: List[Dict[str, str]] = []
-        self.last_symptoms = ""
-        self.suggestion_count = 0
+        self.context_window = ContextWindowManager(self.model)
+        self.intent_router = IntentRouter(self.model)
+        # Specialist agents are stateless, so they are built once and reused across conversations
+        self.symptom_analyzer = symptom_analyzer or symptom_agent()
+        self.dietitian = dietitian or diet_agent()
 
     def _configure_model(self):
         genai.configure(api_key=self.api_key)
@@ -57,223 +63,246 @@ class HealthcareChatAgent:
             system_instruction=self.system_instruction,
             safety_settings=self.safety_settings
         )
-    def _extract_symptoms_from_history(self):
-        """Scan conversation history for symptom descriptions"""
-        symptom_keywords = [
-        # General Symptoms
-        "pain", "discomfort", "weakness", "fatigue", "dizziness", "nausea", "vomiting", 
-        "fever", "chills", "sweating",
-
-        # Respiratory Symptoms
-        "cough", "shortness of breath", "wheezing", "chest pain", "congestion", "runny nose", 
-        "sneezing", "sore throat", "hoarseness", "difficulty breathing",
-
-        # Gastrointestinal Symptoms
-        "stomach pain", "bloating", "gas", "diarrhea", "constipation", "acid reflux", 
-        "heartburn", "loss of appetite", "nausea after eating", "vomiting blood",
-
-        # Head & Neurological Symptoms
-        "headache", "migraine", "dizziness", "lightheadedness", "confusion", "memory loss", 
-        "fainting", "numbness", "tingling sensation", "seizures",
-
-        # Muscle & Joint Symptoms
-        "muscle pain", "stiffness", "cramps", "joint pain", "swelling", "limited movement", 
-        "back pain", "neck pain", "weak grip", "muscle spasms",
-
-        # Skin & Allergy Symptoms
-        "rash", "itching", "redness", "swelling", "dry skin", "hives", "bruising", 
-        "peeling skin", "sensitivity to touch", "skin discoloration",
-
-        # Mental Health Symptoms
-        "anxiety", "depression", "mood swings", "brain fog", "irritability", "hallucinations", 
-        "insomnia", "feeling overwhelmed", "panic attacks", "hopelessness",
-
-        # Eye & Vision Symptoms
-        "blurry vision", "eye pain", "red eyes", "watery eyes", "sensitivity to light", 
-        "dry eyes", "double vision", "floaters", "blind spots", "swollen eyelids",
-
-        # Urinary & Reproductive Symptoms
-        "frequent urination", "burning sensation when urinating", "blood in urine", "pelvic pain", 
-        "irregular periods", "heavy bleeding", "erectile dysfunction", "low libido", 
-        "painful intercourse", "vaginal discharge",
-
-        # Other Symptoms
-        "swollen lymph nodes", "choking sensation", "difficulty swallowing", "unexplained weight loss", 
-        "unexplained weight gain", "hair loss", "chronic fatigue", "night sweats", 
-        "cold hands and feet", "clammy skin"
-        ]
-        
-        # Find all potential symptom messages (last 5 messages)
-        symptom_messages = []
-        for msg in reversed(self.conversation_history[-5:]):
+    def _extract_symptoms_from_history(self, turn: TurnContext):
+        """Scan conversation history for symptom descriptions (memoized per turn)"""
+        if turn.symptoms_resolved:
+            return turn.symptoms
+
+        # Most recent user message (of the last 5 messages) that mentions a symptom
+        for msg in reversed(turn.conversation.conversation_history[-5:]):
             if msg["role"] == "user":
-                text = msg["text"].lower()
-                if any(kw in text for kw in symptom_keywords):
-                    symptom_messages.append(msg["text"])
-        
-        return symptom_messages[0] if symptom_messages else None
+                matches = match_symptoms(msg["text"])
+                if matches:
+                    turn.symptoms = msg["text"]
+                    turn.symptom_matches = matches
+                    turn.symptom_phrases = symptom_phrases(msg["text"], matches)
+                    turn.conversation.last_symptoms = ", ".join(turn.symptom_phrases)
+                    break
 
-    def _clean_symptoms_input(self, symptoms: str) -> str:
-        """Extract key symptom phrases from conversation text"""
+        turn.symptoms_resolved = True
+        return turn.symptoms
+
+    def _extract_health_condition(self, turn: TurnContext):
+        """Extract medical conditions using symptom analysis (memoized per turn)"""
+        if turn.condition_resolved:
+            return turn.condition
+
+        condition = None
         try:
-            response = self.model.generate_content(
-                f"Extract ONLY medical symptoms from this text as comma-separated values: {symptoms}\n"
-                "Focus on anatomical terms and clinical descriptions. Exclude non-symptom phrases.\n"
-                "Example input: 'pain in my ass when pooping'\n"
-                "Example output: anal pain during defecation, rectal bleeding, hematochezia\n"
-                "Format: Strictly use commas to separate symptoms, no numbers or bullets."
-            )
-            cleaned = response.text.strip().lower()
-            # Additional validation to ensure commas
-            if ',' not in cleaned:
-                cleaned = re.sub(r'\band\b|\bwith\b', ',', cleaned)  # Split on 'and'/'with'
-            return cleaned
-        except Exception as e:
-            # Enhanced fallback cleaning: Split on conjunctions and punctuation
-            cleaned = re.sub(r'\b(okay|yes|no|maybe)\b', '', symptoms.lower())
-            cleaned = re.sub(r'[^a-zA-Z, ]', '', cleaned)
-            # Split on commas or conjunctions
-            cleaned = re.split(r',|\band\b|\bwith\b', cleaned)
-            cleaned = [s.strip() for s in cleaned if s.strip()]
-            return ', '.join(cleaned)
-        
-    def _extract_health_condition(self):
-        """Extract medical conditions using symptom analysis"""
+            symptoms = self._extract_symptoms_from_history(turn)
+            if symptoms:
+                # Same structured (and cached) analysis a symptom-analysis turn uses
+                condition = self.symptom_analyzer.analyze(", ".join(turn.symptom_phrases)).primary_condition
+        except:
+            condition = None
+
+        turn.condition = condition
+        turn.condition_resolved = True
+        return condition
+
+    async def _extract_health_condition_async(self, turn: TurnContext):
+        """Async variant of _extract_health_condition"""
+        if turn.condition_resolved:
+            return turn.condition
+
+        condition = None
         try:
-            symptoms = self._extract_symptoms_from_history()
-            if not symptoms: return None
-            
-            response = self.model.generate_content(
-                f"Based on these symptoms: {symptoms}\n"
-                "What are 2 most likely medical conditions? Respond ONLY with comma-separated condition names."
-            )
-            return response.text.split(",")[0].strip()  # Return first condition
+            symptoms = self._extract_symptoms_from_history(turn)
+            if symptoms:
+                analysis = await self.symptom_analyzer.analyze_async(", ".join(turn.symptom_phrases))
+                condition = analysis.primary_condition
         except:
-            return None
-    
-    def _get_dietary_advice(self, condition: str = None) -> str:
+            condition = None
+
+        turn.condition = condition
+        turn.condition_resolved = True
+        return condition
+
+    def _format_dietary_advice(self, condition: str, analysis: dict) -> str:
+        """Render the dietitian's structured analysis as a chat response"""
+        # Always include disclaimer
+        disclaimer = "\n[Note: These are general dietary suggestions. For personalized recommendations, please consult a healthcare provider for proper diagnosis.]\n"
+
+        meal_plan = analysis["meal_plan"]
+        if analysis.get("error"):
+            # On error the dietitian returns its default advice alongside the message
+            return "I couldn't generate specific dietary advice. Here are general recommendations:\n" + \
+                f"{disclaimer}\n" + \
+                f"Breakfast: {meal_plan['breakfast']}\n" + \
+                f"Lunch: {meal_plan['lunch']}\n" + \
+                f"Dinner: {meal_plan['dinner']}"
+
+        return (
+            f"{disclaimer}\n"
+            f"Dietary Recommendations for {condition.capitalize()}:\n"
+            f"Recommended Foods:\n" + self._bullets(analysis['recommended_foods']) + "\n\n"
+            f"Avoid:\n" + self._bullets(analysis['avoid_foods']) + "\n\n"
+            f"Sample Meal Plan:\n"
+            f"- Breakfast: {meal_plan['breakfast']}\n"
+            f"- Lunch: {meal_plan['lunch']}\n"
+            f"- Dinner: {meal_plan['dinner']}\n\n"
+            f"Special Considerations:\n{self._bullets(analysis['considerations'])}"
+        )
+
+    def _bullets(self, items: List[str]) -> str:
+        return "\n".join(f"• {item}" for item in items)
+
+    def _get_dietary_advice(self, turn: TurnContext, condition: str = None) -> str:
         """Get dietary advice with inferred condition fallback"""
         if not condition:
-            condition = self._extract_health_condition() or "your symptoms"
+            condition = self._extract_health_condition(turn) or "your symptoms"
         
         try:
-            dietitian = diet_agent()
-            analysis = dietitian.analyze_diet(condition)
-            
-            # Always include disclaimer
-            disclaimer = "\n[Note: These are general dietary suggestions. For personalized recommendations, please consult a healthcare provider for proper diagnosis.]\n"
-
-            if analysis.get("error"):
-                return "I couldn't generate specific dietary advice. Here are general recommendations:\n" + \
-                    f"{disclaimer}\n" + \
-                    f"Breakfast: {analysis['recommendations']['breakfast']}\n" + \
-                    f"Lunch: {analysis['recommendations']['lunch']}\n" + \
-                    f"Dinner: {analysis['recommendations']['dinner']}"
-
-            # Format special considerations with newlines
-            considerations = "\n".join(analysis['considerations']) if isinstance(analysis['considerations'], list) else analysis['considerations']
-            
-            return (
-                f"{disclaimer}\n"
-                f"Dietary Recommendations for {condition.capitalize()}:\n"
-                f"Recommended Foods:\n" + '\n'.join(analysis['recommended_foods']) + "\n\n"
-                f"Avoid:\n" + '\n'.join(analysis['avoid_foods']) + "\n\n"
-                f"Sample Meal Plan:\n"
-                f"- Breakfast: {analysis['meal_plan']['breakfast']}\n"
-                f"- Lunch: {analysis['meal_plan']['lunch']}\n"
-                f"- Dinner: {analysis['meal_plan']['dinner']}\n\n"
-                f"Special Considerations:\n{considerations}"
-            )
-        
+            analysis = self.dietitian.analyze_diet(condition)
+            return self._format_dietary_advice(condition, analysis)
         except Exception as e:
             return f"Could not generate diet plan: {str(e)}"
 
-    def _format_history(self):
-        return [
-            {
-                "role": "user" if msg["role"] == "user" else "model",
-                "parts": [msg["text"]]
-            }
-            for msg in self.conversation_history
-        ]
+    async def _get_dietary_advice_async(self, turn: TurnContext, condition: str = None) -> str:
+        """Async variant of _get_dietary_advice"""
+        if not condition:
+            condition = await self._extract_health_condition_async(turn) or "your symptoms"
+
+        try:
+            analysis = await self.dietitian.analyze_diet_async(condition)
+            return self._format_dietary_advice(condition, analysis)
+        except Exception as e:
+            return f"Could not generate diet plan: {str(e)}"
+
+    def _format_history(self, turn: TurnContext, user_input: str):
+        """Bounded history (rolling summary + recent turns) for the general chat model"""
+        history, turn.prompt_tokens = self.context_window.build_history(turn.conversation, user_input)
+        return history
+
+    def _suggestion_text(self, response: str) -> str:
+        return (f"{response}\n\n[Note: I can help with:"
+                "\n1. Symptom analysis"
+                "\n2. Dietary recommendations"
+                "\n3. Prescription scanning]")
 
-    def _add_suggestion(self, response: str, user_input: str) -> str:
+    def _add_suggestion(self, turn: TurnContext, response: str, user_input: str) -> str:
         """Modified suggestion system"""
-        if self.suggestion_count >= 2:
+        conversation = turn.conversation
+        if conversation.suggestion_count >= 2:
             return response
-            
-        has_medical_context = any([
-            self._extract_symptoms_from_history(),
-            self._extract_health_condition(),
-            any(kw in user_input.lower() for kw in ["report", "prescription"])
-        ])
-        
-        if has_medical_context and not any(kw in user_input.lower() for kw in ["diet", "symptom", "analysis", "scan"]):
-            self.suggestion_count += 1
-            return (f"{response}\n\n[Note: I can help with:"
-                    "\n1. Symptom analysis"
-                    "\n2. Dietary recommendations"
-                    "\n3. Prescription scanning]")
+
+        query = user_input.lower()
+        if any(kw in query for kw in ["diet", "symptom", "analysis", "scan"]):
+            return response
+
+        # A health condition can only be inferred from symptoms, so symptoms alone decide
+        # whether there is medical context; no model call is needed for the hint.
+        has_medical_context = (
+            any(kw in query for kw in ["report", "prescription"])
+            or bool(self._extract_symptoms_from_history(turn))
+        )
+
+        if has_medical_context:
+            conversation.suggestion_count += 1
+            return self._suggestion_text(response)
         
         return response
 
-    def _get_agent_response(self, query: str) -> str:
+    def _get_agent_response(self, turn: TurnContext, intent: Intent) -> str:
         """Route specific requests to appropriate agents"""
-        query = query.lower()
-        
-        if any(kw in query for kw in ["symptom", "analysis", "diagnos"]):
-            symptoms = self._extract_symptoms_from_history()
+        if intent is Intent.SYMPTOM:
+            symptoms = self._extract_symptoms_from_history(turn)
             if symptoms:
-                cleaned = self._clean_symptoms_input(symptoms)
-                analysis = symptom_agent().analyze_symptoms(cleaned)
+                # The matched clauses already isolate the symptoms, so no cleanup call is needed
+                cleaned = ", ".join(turn.symptom_phrases)
+                analysis = self.symptom_analyzer.analyze_symptoms(cleaned)
                 return f"Detailed Analysis:\n{analysis.get('info', 'Analysis unavailable')}"
             return "Could not find symptoms to analyze"
 
-        if any(kw in query for kw in ["diet", "nutrition", "meal"]):
-            condition = self._extract_health_condition()
+        if intent is Intent.DIET:
+            condition = self._extract_health_condition(turn)
             if not condition:
                 condition = "general symptoms"
-            return self._get_dietary_advice(condition)
+            return self._get_dietary_advice(turn, condition)
         
         return None
-    
+
+    async def _get_agent_response_async(self, turn: TurnContext, intent: Intent) -> str:
+        """Async variant of _get_agent_response"""
+        if intent is Intent.SYMPTOM:
+            symptoms = self._extract_symptoms_from_history(turn)
+            if symptoms:
+                cleaned = ", ".join(turn.symptom_phrases)
+                analysis = await self.symptom_analyzer.analyze_symptoms_async(cleaned)
+                return f"Detailed Analysis:\n{analysis.get('info', 'Analysis unavailable')}"
+            return "Could not find symptoms to analyze"
+
+        if intent is Intent.DIET:
+            condition = await self._extract_health_condition_async(turn)
+            if not condition:
+                condition = "general symptoms"
+            return await self._get_dietary_advice_async(turn, condition)
+
+        return None
+
+    def _prescription_prompt(self, prescription_data: str) -> str:
+        # Structure the summary
+        return (
+            f"Analyze this prescription data:\n{prescription_data}\n\n"
+            "Provide a patient-friendly summary including:\n"
+            "- Patient and doctor details\n"
+            "- Main diagnosis/condition\n"
+            "- Prescribed medications\n"
+            "- Key instructions\n"
+            "- Additional notes\n"
+            "- Suggested condition this prescription treats"
+        )
+
     def _process_prescription(self, prescription_data: str) -> str:
         """Handle prescription analysis using raw text data"""
         try:
-            # Structure the summary
-            summary_prompt = (
-                f"Analyze this prescription data:\n{prescription_data}\n\n"
-                "Provide a patient-friendly summary including:\n"
-                "- Patient and doctor details\n"
-                "- Main diagnosis/condition\n"
-                "- Prescribed medications\n"
-                "- Key instructions\n"
-                "- Additional notes\n"
-                "- Suggested condition this prescription treats"
-            )
-            
-            response = self.model.generate_content(summary_prompt)
+            record_model_call()
+            response = self.model.generate_content(self._prescription_prompt(prescription_data))
             return f"Prescription Summary:\n{response.text}\n\nRemember to consult your doctor about any medications!"
         
         except Exception as e:
             return f"Error processing prescription: {str(e)}"
-        
-    def process_message(self, user_input: str) -> str:
+
+    async def _process_prescription_async(self, prescription_data: str) -> str:
+        """Async variant of _process_prescription"""
+        try:
+            record_model_call()
+            response = await self.model.generate_content_async(self._prescription_prompt(prescription_data))
+            return f"Prescription Summary:\n{response.text}\n\nRemember to consult your doctor about any medications!"
+
+        except Exception as e:
+            return f"Error processing prescription: {str(e)}"
+
+    def process_message(self, user_input: str, conversation: Optional[ConversationState] = None) -> str:
         """Process user message and return appropriate response"""
+        turn = TurnContext(conversation if conversation is not None else ConversationState())
+        started = time.perf_counter()
+        with bind_turn(turn):
+            response = self._process_turn(turn, user_input)
+        self.intent_router.record_latency(turn.intent, time.perf_counter() - started)
+        logger.info(f"Turn completed with {turn.model_calls} model call(s), ~{turn.prompt_tokens} prompt tokens (intent: {turn.intent})")
+        self.context_window.refresh_summary(turn.conversation)
+        return response
+
+    def _process_turn(self, turn: TurnContext, user_input: str) -> str:
+        conversation = turn.conversation
         try:
             logger.debug(f"Processing message: {user_input[:50]}..." if len(user_input) > 50 else f"Processing message: {user_input}")
             
+            decision = self.intent_router.classify(user_input)
+            turn.intent = decision.intent
+
             # Handle prescription data or upload request
-            if "prescription" in user_input.lower():
+            if decision.intent is Intent.PRESCRIPTION:
                 try:
-                    if user_input.startswith("PRESCRIPTION_DATA:"):
-                        prescription_data = user_input[len("PRESCRIPTION_DATA:"):].strip()
+                    if user_input.startswith(PRESCRIPTION_DATA_PREFIX):
+                        prescription_data = user_input[len(PRESCRIPTION_DATA_PREFIX):].strip()
                         summary = self._process_prescription(prescription_data)
-                        self.conversation_history.append({"role": "assistant", "text": summary})
+                        conversation.conversation_history.append({"role": "assistant", "text": summary})
                         return summary
                     else:
                         response = "Please upload your prescription file using the upload button."
-                        self.conversation_history.append({"role": "assistant", "text": response})
+                        conversation.conversation_history.append({"role": "assistant", "text": response})
                         return response
                 except Exception as e:
                     error_msg = f"Error processing prescription request: {str(e)}"
@@ -281,13 +310,13 @@ class HealthcareChatAgent:
                     return f"I couldn't process your prescription information. {error_msg}"
 
             # Add user input to conversation history
-            self.conversation_history.append({"role": "user", "text": user_input})
+            conversation.conversation_history.append({"role": "user", "text": user_input})
 
             # Check for agent-specific requests (symptoms, diet, etc.)
             try:
-                agent_response = self._get_agent_response(user_input)
+                agent_response = self._get_agent_response(turn, decision.intent)
                 if agent_response:
-                    self.conversation_history.append({"role": "assistant", "text": agent_response})
+                    conversation.conversation_history.append({"role": "assistant", "text": agent_response})
                     return agent_response
             except Exception as e:
                 logger.error(f"Error in specialized agent response: {str(e)}")
@@ -295,7 +324,8 @@ class HealthcareChatAgent:
             
             # Normal chat flow with error handling
             try:
-                chat = self.model.start_chat(history=self._format_history())
+                chat = self.model.start_chat(history=self._format_history(turn, user_input))
+                record_model_call()
                 response = chat.send_message(user_input)
                 base_response = response.text if response.text else "I couldn't generate a response. Please rephrase."
             except Exception as e:
@@ -303,8 +333,8 @@ class HealthcareChatAgent:
                 base_response = "I'm having trouble generating a response right now. Could you please rephrase or try again later?"
 
             # Add suggestions if applicable
-            final_response = self._add_suggestion(base_response, user_input)
-            self.conversation_history.append({"role": "assistant", "text": final_response})
+            final_response = self._add_suggestion(turn, base_response, user_input)
+            conversation.conversation_history.append({"role": "assistant", "text": final_response})
             logger.debug("Successfully processed message and generated response")
             return final_response
 
@@ -312,9 +342,167 @@ class HealthcareChatAgent:
             error_msg = f"Unexpected error in message processing: {str(e)}"
             logger.error(error_msg)
             return f"I apologize, but I encountered an error: {error_msg}"
-        
+
+    async def process_message_async(
+        self,
+        user_input: str,
+        conversation: Optional[ConversationState] = None,
+        on_summary_refreshed: Optional[Callable[[ConversationState], Optional[Awaitable[None]]]] = None,
+    ) -> str:
+        """Async variant of process_message.
+
+        Every model call is awaited through the SDK's async API, so a slow
+        Gemini response does not block the event loop for other sessions.
+        The rolling conversation summary is refreshed in the background;
+        ``on_summary_refreshed`` is called once it has been updated.
+        """
+        turn = TurnContext(conversation if conversation is not None else ConversationState())
+        started = time.perf_counter()
+        with bind_turn(turn):
+            response = await self._process_turn_async(turn, user_input)
+        self.intent_router.record_latency(turn.intent, time.perf_counter() - started)
+        logger.info(f"Turn completed with {turn.model_calls} model call(s), ~{turn.prompt_tokens} prompt tokens (intent: {turn.intent})")
+        self.context_window.schedule_refresh(turn.conversation, on_summary_refreshed)
+        return response
+
+    async def _route_turn_async(self, turn: TurnContext, user_input: str) -> Optional[str]:
+        """Answer prescription and specialist-agent requests.
+
+        Returns the complete response, or None when the message should go to the
+        general chat model. The user message is added to the history unless it
+        was a prescription request.
+        """
+        conversation = turn.conversation
+        decision = await self.intent_router.classify_async(user_input)
+        turn.intent = decision.intent
+
+        # Handle prescription data or upload request
+        if decision.intent is Intent.PRESCRIPTION:
+            try:
+                if user_input.startswith(PRESCRIPTION_DATA_PREFIX):
+                    prescription_data = user_input[len(PRESCRIPTION_DATA_PREFIX):].strip()
+                    summary = await self._process_prescription_async(prescription_data)
+                    conversation.conversation_history.append({"role": "assistant", "text": summary})
+                    return summary
+                else:
+                    response = "Please upload your prescription file using the upload button."
+                    conversation.conversation_history.append({"role": "assistant", "text": response})
+                    return response
+            except Exception as e:
+                error_msg = f"Error processing prescription request: {str(e)}"
+                logger.error(error_msg)
+                return f"I couldn't process your prescription information. {error_msg}"
+
+        # Add user input to conversation history
+        conversation.conversation_history.append({"role": "user", "text": user_input})
+
+        # Check for agent-specific requests (symptoms, diet, etc.)
+        try:
+            agent_response = await self._get_agent_response_async(turn, decision.intent)
+            if agent_response:
+                conversation.conversation_history.append({"role": "assistant", "text": agent_response})
+                return agent_response
+        except Exception as e:
+            logger.error(f"Error in specialized agent response: {str(e)}")
+            # Continue to general model as fallback
+
+        return None
+
+    async def _process_turn_async(self, turn: TurnContext, user_input: str) -> str:
+        conversation = turn.conversation
+        try:
+            logger.debug(f"Processing message: {user_input[:50]}..." if len(user_input) > 50 else f"Processing message: {user_input}")
+
+            routed_response = await self._route_turn_async(turn, user_input)
+            if routed_response is not None:
+                return routed_response
+
+            # Normal chat flow with error handling
+            try:
+                chat = self.model.start_chat(history=self._format_history(turn, user_input))
+                record_model_call()
+                response = await chat.send_message_async(user_input)
+                base_response = response.text if response.text else "I couldn't generate a response. Please rephrase."
+            except Exception as e:
+                logger.error(f"Error in LLM response generation: {str(e)}")
+                base_response = "I'm having trouble generating a response right now. Could you please rephrase or try again later?"
+
+            # Add suggestions if applicable
+            final_response = self._add_suggestion(turn, base_response, user_input)
+            conversation.conversation_history.append({"role": "assistant", "text": final_response})
+            logger.debug("Successfully processed message and generated response")
+            return final_response
+
+        except Exception as e:
+            error_msg = f"Unexpected error in message processing: {str(e)}"
+            logger.error(error_msg)
+            return f"I apologize, but I encountered an error: {error_msg}"
+
+    async def stream_message_async(
+        self,
+        user_input: str,
+        conversation: Optional[ConversationState] = None,
+        on_summary_refreshed: Optional[Callable[[ConversationState], Optional[Awaitable[None]]]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream the reply to a user message as text chunks.
+
+        General chat replies are forwarded chunk by chunk as Gemini produces them.
+        Prescription and specialist-agent replies are yielded whole once ready.
+        """
+        turn = TurnContext(conversation if conversation is not None else ConversationState())
+        conversation = turn.conversation
+        started = time.perf_counter()
+        try:
+            logger.debug(f"Streaming message: {user_input[:50]}..." if len(user_input) > 50 else f"Streaming message: {user_input}")
+
+            # The turn is only bound around awaits that complete before the first yield
+            with bind_turn(turn):
+                routed_response = await self._route_turn_async(turn, user_input)
+            if routed_response is not None:
+                yield routed_response
+                return
+
+            chunks: List[str] = []
+            try:
+                with bind_turn(turn):
+                    chat = self.model.start_chat(history=self._format_history(turn, user_input))
+                    record_model_call()
+                    response = await chat.send_message_async(user_input, stream=True)
+                async for chunk in response:
+                    if chunk.text:
+                        chunks.append(chunk.text)
+                        yield chunk.text
+            except Exception as e:
+                logger.error(f"Error in LLM stream generation: {str(e)}")
+                if not chunks:
+                    chunks.append("I'm having trouble generating a response right now. Could you please rephrase or try again later?")
+                    yield chunks[-1]
+
+            if not chunks:
+                chunks.append("I couldn't generate a response. Please rephrase.")
+                yield chunks[-1]
+
+            # Add suggestions if applicable; only the appended hint still needs sending
+            base_response = "".join(chunks)
+            final_response = self._add_suggestion(turn, base_response, user_input)
+            if len(final_response) > len(base_response):
+                yield final_response[len(base_response):]
+            conversation.conversation_history.append({"role": "assistant", "text": final_response})
+
+        except Exception as e:
+            error_msg = f"Unexpected error in message processing: {str(e)}"
+            logger.error(error_msg)
+            yield f"I apologize, but I encountered an error: {error_msg}"
+        finally:
+            conversation.last_turn_model_calls = turn.model_calls
+            conversation.last_turn_prompt_tokens = turn.prompt_tokens
+            self.intent_router.record_latency(turn.intent, time.perf_counter() - started)
+            logger.info(f"Streamed turn completed with {turn.model_calls} model call(s), ~{turn.prompt_tokens} prompt tokens (intent: {turn.intent})")
+            self.context_window.schedule_refresh(conversation, on_summary_refreshed)
+
 if __name__ == "__main__":
     bot = HealthcareChatAgent()
+    conversation = ConversationState()
     print("Healthcare Assistant: Hello! How can I assist you today? (Type 'exit' to quit)")
     
     while True:
@@ -323,6 +511,6 @@ if __name__ == "__main__":
             print("Assistant: Stay healthy!")
             break
             
-        response = bot.process_message(user_input)
+        response = bot.process_message(user_input, conversation)
             
         print(f"\nAssistant: {response}\n")
\ No newline at end of file
@@ -0,0 +1,157 @@
+import asyncio
+import inspect
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from Backend.config.v1.constants import (
+    CONTEXT_MAX_RECENT_TURNS,
+    CONTEXT_SUMMARY_MAX_WORDS,
+    CONTEXT_TOKEN_BUDGET,
+)
+from Backend.core.v1.agents.conversation import ConversationState
+from Backend.core.v1.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+class ContextWindowManager:
+    """Keeps the history sent to the model bounded.
+
+    The last ``max_recent_turns`` turns are sent verbatim, trimmed further if
+    they would exceed ``token_budget``. Older turns are folded into a rolling
+    summary on the ConversationState, refreshed incrementally in the background
+    once at least ``refresh_threshold`` messages have fallen out of the window,
+    so a long conversation pays for a summary call every few turns, not every turn.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_recent_turns: int = CONTEXT_MAX_RECENT_TURNS,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        summary_max_words: int = CONTEXT_SUMMARY_MAX_WORDS,
+    ):
+        self.model = model
+        self.max_recent_messages = max_recent_turns * 2
+        self.token_budget = token_budget
+        self.summary_max_words = summary_max_words
+        # Hold references so background refreshes are not garbage collected mid-flight
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def refresh_threshold(self) -> int:
+        """Messages that must overflow the verbatim window before the summary is refreshed."""
+        return max(1, self.max_recent_messages // 2)
+
+    def build_history(self, conversation: ConversationState, pending_input: str) -> Tuple[List[Dict], int]:
+        """Build the chat history for the next model call.
+
+        The pending user message is excluded since it is sent separately.
+
+        Returns:
+            The Gemini-formatted history and the estimated prompt tokens
+            (summary + history + pending message).
+        """
+        messages = conversation.conversation_history
+        if messages and messages[-1]["role"] == "user" and messages[-1]["text"] == pending_input:
+            messages = messages[:-1]
+
+        tokens = estimate_tokens(pending_input) + estimate_tokens(conversation.summary)
+        selected = []
+        for msg in reversed(messages[-self.max_recent_messages:]):
+            msg_tokens = estimate_tokens(msg["text"])
+            if tokens + msg_tokens > self.token_budget:
+                break
+            selected.append(msg)
+            tokens += msg_tokens
+        selected.reverse()
+
+        history = []
+        if conversation.summary:
+            history.append({"role": "user", "parts": [f"Summary of our earlier conversation: {conversation.summary}"]})
+            history.append({"role": "model", "parts": ["Understood, I'll keep that in mind."]})
+        history.extend(
+            {"role": "user" if msg["role"] == "user" else "model", "parts": [msg["text"]]}
+            for msg in selected
+        )
+        return history, tokens
+
+    def needs_refresh(self, conversation: ConversationState) -> bool:
+        """Whether at least ``refresh_threshold`` messages have fallen out of the verbatim window unsummarized."""
+        return len(conversation.conversation_history) - self.max_recent_messages >= self.refresh_threshold
+
+    def _summary_prompt(self, summary: str, messages: List[Dict[str, str]]) -> str:
+        transcript = "\n".join(
+            f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['text']}" for msg in messages
+        )
+        return (
+            f"Current summary of a medical assistant conversation:\n{summary or '(none)'}\n\n"
+            f"New exchanges to fold into the summary:\n{transcript}\n\n"
+            f"Rewrite the summary in at most {self.summary_max_words} words. Keep symptoms, conditions, "
+            "medications, dietary needs and anything the user asked to remember. Plain text only."
+        )
+
+    def _fold(self, conversation: ConversationState, count: int, summary: str) -> None:
+        # Only appends happen while a refresh runs, so the first ``count`` messages are still the folded ones
+        del conversation.conversation_history[:count]
+        conversation.summary = summary.strip()
+
+    def refresh_summary(self, conversation: ConversationState) -> bool:
+        """Fold messages older than the verbatim window into the summary."""
+        if not self.needs_refresh(conversation) or conversation.summary_refreshing:
+            return False
+        older = conversation.conversation_history[:-self.max_recent_messages]
+        conversation.summary_refreshing = True
+        try:
+            response = self.model.generate_content(self._summary_prompt(conversation.summary, older))
+            self._fold(conversation, len(older), response.text)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to refresh conversation summary: {str(e)}")
+            return False
+        finally:
+            conversation.summary_refreshing = False
+
+    async def refresh_summary_async(self, conversation: ConversationState) -> bool:
+        """Async variant of refresh_summary"""
+        if not self.needs_refresh(conversation) or conversation.summary_refreshing:
+            return False
+        older = conversation.conversation_history[:-self.max_recent_messages]
+        conversation.summary_refreshing = True
+        try:
+            response = await self.model.generate_content_async(self._summary_prompt(conversation.summary, older))
+            self._fold(conversation, len(older), response.text)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to refresh conversation summary: {str(e)}")
+            return False
+        finally:
+            conversation.summary_refreshing = False
+
+    def schedule_refresh(
+        self,
+        conversation: ConversationState,
+        on_complete: Optional[Callable[[ConversationState], Optional[Awaitable[None]]]] = None,
+    ) -> Optional[asyncio.Task]:
+        """Refresh the summary in a background task if it is due.
+
+        ``on_complete`` is called with the conversation after a successful refresh
+        and awaited if it is a coroutine function.
+        """
+        if not self.needs_refresh(conversation) or conversation.summary_refreshing:
+            return None
+
+        async def _run():
+            if await self.refresh_summary_async(conversation) and on_complete:
+                result = on_complete(conversation)
+                if inspect.isawaitable(result):
+                    await result
+
+        task = asyncio.create_task(_run())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from .symptom_matcher import SymptomMatch
+
+# Bump when the compact layout changes; older payloads are then ignored and rebuilt
+COMPACT_STATE_VERSION = 1
+
+
+@dataclass
+class ConversationState:
+    """Per-conversation working state for the HealthcareChatAgent.
+
+    The agent itself is shared across requests, so everything that belongs to a
+    single conversation lives here and is passed into each call.
+    """
+
+    # Messages not yet folded into ``summary``; older messages are dropped once summarized
+    conversation_history: List[Dict[str, str]] = field(default_factory=list)
+    summary: str = ""
+    summary_refreshing: bool = False
+    last_symptoms: str = ""
+    suggestion_count: int = 0
+    last_turn_model_calls: int = 0
+    last_turn_prompt_tokens: int = 0
+
+    def to_compact(self) -> Dict[str, Any]:
+        """Serialize the state that must survive between turns into a small JSON-able dict."""
+        return {
+            "v": COMPACT_STATE_VERSION,
+            # Copied so later changes to the live state (e.g. a summary fold) don't leak into a queued write
+            "history": [dict(message) for message in self.conversation_history],
+            "summary": self.summary,
+            "last_symptoms": self.last_symptoms,
+            "suggestion_count": self.suggestion_count,
+        }
+
+    @classmethod
+    def from_compact(cls, data: Optional[Dict[str, Any]]) -> Optional["ConversationState"]:
+        """Rebuild a state from ``to_compact`` output, or None if it is missing or outdated."""
+        if not data or data.get("v") != COMPACT_STATE_VERSION:
+            return None
+        return cls(
+            conversation_history=list(data.get("history", [])),
+            summary=data.get("summary", ""),
+            last_symptoms=data.get("last_symptoms", ""),
+            suggestion_count=data.get("suggestion_count", 0),
+        )
+
+
+@dataclass
+class TurnContext:
+    """Memoized analysis for a single turn of a conversation.
+
+    Symptoms and the inferred health condition are computed lazily and at most
+    once per turn. ``symptom_matches`` holds the keyword matches (with spans)
+    found in ``symptoms`` and ``symptom_phrases`` the clauses they expand to.
+    Every model call made while the turn is bound (see ``bind_turn``) is
+    counted in ``model_calls``.
+    """
+
+    conversation: ConversationState
+    intent: Optional[str] = None
+    model_calls: int = 0
+    prompt_tokens: int = 0
+    symptoms: Optional[str] = None
+    symptom_matches: List[SymptomMatch] = field(default_factory=list)
+    symptom_phrases: List[str] = field(default_factory=list)
+    symptoms_resolved: bool = False
+    condition: Optional[str] = None
+    condition_resolved: bool = False
+
+
+_current_turn: ContextVar[Optional[TurnContext]] = ContextVar("current_turn", default=None)
+
+
+@contextmanager
+def bind_turn(turn: TurnContext) -> Iterator[TurnContext]:
+    """Make ``turn`` the current turn so model calls are counted against it."""
+    token = _current_turn.set(turn)
+    try:
+        yield turn
+    finally:
+        turn.conversation.last_turn_model_calls = turn.model_calls
+        turn.conversation.last_turn_prompt_tokens = turn.prompt_tokens
+        _current_turn.reset(token)
+
+
+def record_model_call(count: int = 1) -> None:
+    """Count a model call against the current turn, if one is bound."""
+    turn = _current_turn.get()
+    if turn is not None:
+        turn.model_calls += count
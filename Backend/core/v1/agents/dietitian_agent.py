@@ -1,11 +1,27 @@
 import google.generativeai as genai
 import os
-import re
 from dotenv import load_dotenv
-from typing import Dict, List, Union
+from typing import Any, Dict
+from Backend.core.v1.agents.structured_output import generate_structured, generate_structured_async
+from Backend.core.v1.common.cache import get_response_cache
+from Backend.core.v1.types.analysis import DietaryAdvice, MealPlan
 
 load_dotenv()
 
+# Bump whenever _diet_prompt or the DietaryAdvice schema changes so cached advice is invalidated
+DIET_PROMPT_VERSION = "2"
+
+DEFAULT_DIETARY_ADVICE = DietaryAdvice(
+    recommended_foods=["Vegetables", "Whole grains", "Lean proteins"],
+    avoid_foods=["Sugary drinks", "Processed snacks", "Trans fats"],
+    meal_plan=MealPlan(
+        breakfast="Oatmeal with nuts and berries",
+        lunch="Grilled chicken salad with olive oil dressing",
+        dinner="Baked salmon with quinoa and steamed vegetables",
+    ),
+    considerations=["Monitor carbohydrate intake", "Stay hydrated"],
+)
+
 class DietitianAgent:
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
@@ -20,135 +36,65 @@ class DietitianAgent:
             "HARM_CATEGORY_HATE_SPEECH": "BLOCK_NONE",
             "HARM_CATEGORY_SEXUALLY_EXPLICIT": "BLOCK_NONE"
         }
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
-        self.default_advice = {
-            "recommended_foods": ["Vegetables", "Whole grains", "Lean proteins"],
-            "avoid_foods": ["Sugary drinks", "Processed snacks", "Trans fats"],
-            "meal_plan": {
-                "breakfast": "Oatmeal with nuts and berries",
-                "lunch": "Grilled chicken salad with olive oil dressing",
-                "dinner": "Baked salmon with quinoa and steamed vegetables"
-            },
-            "considerations": ["Monitor carbohydrate intake", "Stay hydrated"]
-        }
+        self.model_name = 'gemini-2.0-flash'
+        self.model = genai.GenerativeModel(self.model_name)
+        self.cache = get_response_cache("diet")
+        self.diet_config = genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=DietaryAdvice,
+        )
+        self.default_advice = DEFAULT_DIETARY_ADVICE.model_dump()
+
+    def _diet_prompt(self, condition: str) -> str:
+        return (
+            f"Provide dietary recommendations for {condition}.\n"
+            "Give up to 6 recommended foods, up to 6 foods to avoid, a one-day sample meal plan "
+            "and up to 5 special considerations.\n"
+            "Use only food-related terms. No markdown or special formatting."
+        )
 
-    def analyze_diet(self, condition: str) -> Dict[str, Union[List[str], str]]:
-        """Generate dietary recommendations based on condition/symptoms"""
+    def analyze_diet(self, condition: str) -> Dict[str, Any]:
+        """Generate dietary recommendations based on condition/symptoms
+
+        Returns the DietaryAdvice fields plus an ``error`` key, which is set (and
+        the default advice returned) when no valid advice could be generated.
+        """
         try:
-            response = self.model.generate_content(
-                f"Provide detailed dietary recommendations for {condition} using this exact structure:\n\n"
-                "Recommended Foods: comma-separated list\n"
-                "Avoid Foods: comma-separated list\n"
-                "Sample Meal Plan:\n"
-                "Breakfast: description\n"
-                "Lunch: description\n"
-                "Dinner: description\n"
-                "Special Considerations: numbered list\n\n"
-                "Use only food-related terms. No markdown or special formatting.",
-                safety_settings=self.safety_settings
+            advice = self.cache.get_or_compute(
+                (condition,), self.model_name, DIET_PROMPT_VERSION,
+                lambda: self._generate_diet(condition)
             )
-            
-            return self._parse_response(response.text)
+            return {**advice, "error": None}
         except Exception as e:
             return {
                 "error": str(e),
                 **self.default_advice
             }
 
-    def _parse_response(self, text: str) -> Dict:
-        """Parse Gemini response into structured format"""
+    async def analyze_diet_async(self, condition: str) -> Dict[str, Any]:
+        """Async variant of analyze_diet built on the SDK's async generation API"""
         try:
-            # Normalize text and split into lines
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            
-            recommendations = {
-                "recommended_foods": [],
-                "avoid_foods": [],
-                "meal_plan": {
-                    "breakfast": "",
-                    "lunch": "",
-                    "dinner": ""
-                },
-                "considerations": [],
-                "error": None
-            }
-
-            current_section = None
-            
-            for line in lines:
-                if line.lower().startswith("recommended foods:"):
-                    current_section = "recommended"
-                    recommendations["recommended_foods"] = self._split_items(line.split(":", 1)[1])
-                elif line.lower().startswith("avoid foods:"):
-                    current_section = "avoid"
-                    recommendations["avoid_foods"] = self._split_items(line.split(":", 1)[1])
-                elif line.lower().startswith("breakfast:"):
-                    recommendations["meal_plan"]["breakfast"] = line.split(":", 1)[1].strip()
-                elif line.lower().startswith("lunch:"):
-                    recommendations["meal_plan"]["lunch"] = line.split(":", 1)[1].strip()
-                elif line.lower().startswith("dinner:"):
-                    recommendations["meal_plan"]["dinner"] = line.split(":", 1)[1].strip()
-                elif line.lower().startswith("special considerations:"):
-                    current_section = "considerations"
-                    recommendations["considerations"] = self._split_items(line.split(":", 1)[1])
-                elif current_section == "recommended":
-                    recommendations["recommended_foods"].extend(self._split_items(line))
-                elif current_section == "avoid":
-                    recommendations["avoid_foods"].extend(self._split_items(line))
-                elif current_section == "considerations":
-                    recommendations["considerations"].extend(self._split_items(line))
-
-            # Validate and fallback to default if empty
-            if not recommendations["recommended_foods"]:
-                recommendations["recommended_foods"] = self.default_advice["recommended_foods"]
-            if not recommendations["avoid_foods"]:
-                recommendations["avoid_foods"] = self.default_advice["avoid_foods"]
-
-        # Process special considerations with improved formatting
-            if isinstance(recommendations["considerations"], list):
-                # Clean and format considerations
-                clean_considerations = []
-                seen = set()
-                
-                for item in recommendations["considerations"]:
-                    # Remove any existing bullet points or numbers
-                    clean_item = re.sub(r'^(\d+\.?|•|\-)\s*', '', str(item)).strip()
-                    
-                    # Filter valid considerations
-                    if clean_item and len(clean_item) > 10:  # Minimum meaningful length
-                        # Fix common word breaks and typos
-                        clean_item = clean_item.replace("labelealth", "labels for heart health")
-                        
-                        # Capitalize first letter and add period
-                        clean_item = clean_item[0].upper() + clean_item[1:]
-                        if not clean_item.endswith(('.', '!', '?')):
-                            clean_item += '.'
-                            
-                        # Remove duplicates
-                        if clean_item not in seen:
-                            seen.add(clean_item)
-                            clean_considerations.append(f"• {clean_item}")
-
-                # Limit to 5 most important points
-                recommendations["considerations"] = clean_considerations[:5]
-
-            # Format food lists as bullet points
-            for category in ["recommended_foods", "avoid_foods"]:
-                if isinstance(recommendations[category], list):
-                    recommendations[category] = [
-                        f"• {item.strip()}" 
-                        for item in recommendations[category][:6]  # Limit to 6 items per category
-                        if item.strip()
-                    ]    
-            return recommendations
-            
+            advice = await self.cache.get_or_compute_async(
+                (condition,), self.model_name, DIET_PROMPT_VERSION,
+                lambda: self._generate_diet_async(condition)
+            )
+            return {**advice, "error": None}
         except Exception as e:
             return {
-                "error": f"Parse error: {str(e)}",
+                "error": str(e),
                 **self.default_advice
             }
 
-    def _split_items(self, text: str) -> List[str]:
-        """Split comma/period separated items with cleanup"""
-        items = re.split(r'[,•]|\d+\.', text)
-        return [item.strip() for item in items if item.strip()]
\ No newline at end of file
+    def _generate_diet(self, condition: str) -> Dict[str, Any]:
+        """Call the model for fresh advice, raising on failure so errors are never cached"""
+        return generate_structured(
+            self.model, self._diet_prompt(condition), DietaryAdvice,
+            generation_config=self.diet_config, safety_settings=self.safety_settings
+        ).model_dump()
+
+    async def _generate_diet_async(self, condition: str) -> Dict[str, Any]:
+        """Async variant of _generate_diet"""
+        return (await generate_structured_async(
+            self.model, self._diet_prompt(condition), DietaryAdvice,
+            generation_config=self.diet_config, safety_settings=self.safety_settings
+        )).model_dump()
@@ -0,0 +1,186 @@
+# This file contains the local intent classifier that routes chat messages to specialist agents.
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Pattern, Tuple
+
+from Backend.config.v1.constants import (
+    INTENT_CONFIDENCE_THRESHOLD,
+    INTENT_LATENCY_WINDOW,
+    INTENT_LLM_FALLBACK,
+)
+from Backend.core.v1.common.logger import get_logger
+
+from .conversation import record_model_call
+
+logger = get_logger(__name__)
+
+PRESCRIPTION_DATA_PREFIX = "PRESCRIPTION_DATA:"
+
+
+class Intent(str, Enum):
+    SYMPTOM = "symptom"
+    DIET = "diet"
+    PRESCRIPTION = "prescription"
+    GENERAL = "general"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+# Weighted cues per intent; a message's score for an intent is the sum of the cues it contains
+_INTENT_RULES: Dict[Intent, List[Tuple[Pattern, float]]] = {
+    Intent.SYMPTOM: [
+        (re.compile(r"\bsymptoms?\b", re.IGNORECASE), 2.0),
+        (re.compile(r"\bdiagnos\w*", re.IGNORECASE), 2.0),
+        (re.compile(r"\b(?:analy[sz]e|analysis)\b", re.IGNORECASE), 1.5),
+        (re.compile(r"\bwhat (?:could|might|can) (?:this|it|that) be\b", re.IGNORECASE), 1.5),
+    ],
+    Intent.DIET: [
+        (re.compile(r"\b(?:diet|dietary|nutrition\w*|meals?)\b", re.IGNORECASE), 2.0),
+        (re.compile(r"\bwhat (?:should|can|could) i (?:eat|drink)\b", re.IGNORECASE), 2.0),
+        (re.compile(r"\b(?:foods?|recipes?|calories?|eating)\b", re.IGNORECASE), 1.0),
+    ],
+    Intent.PRESCRIPTION: [
+        (re.compile(r"\bprescri(?:ption|bed|be)s?\b", re.IGNORECASE), 2.0),
+        (re.compile(r"\b(?:medications?|medicines?|tablets?|pills?|dosages?|doses?)\b", re.IGNORECASE), 1.0),
+    ],
+}
+
+# Score at which a single uncontested cue is fully trusted
+_SATURATION_SCORE = 2.0
+
+_CLASSIFY_PROMPT = (
+    "Classify the user's message for a health assistant into exactly one intent:\n"
+    "symptom - wants their symptoms analysed or a possible diagnosis\n"
+    "diet - wants dietary or nutrition advice\n"
+    "prescription - asks about a prescription they want summarised\n"
+    "general - anything else\n"
+    "Reply with the single intent word only.\n\nMessage: {message}"
+)
+_CLASSIFY_CONFIG = {"temperature": 0.0, "max_output_tokens": 5}
+
+
+@dataclass(frozen=True)
+class IntentDecision:
+    """Outcome of classifying one message."""
+
+    intent: Intent
+    confidence: float
+    source: str  # "rules" or "llm"
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+class IntentStats:
+    """Per-intent decision counts and a sliding window of turn latencies."""
+
+    def __init__(self, window: int = INTENT_LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies: Dict[Intent, Deque[float]] = {i: deque(maxlen=window) for i in Intent}
+        self._counts: Dict[Intent, Dict[str, int]] = {i: {"rules": 0, "llm": 0} for i in Intent}
+
+    def record_decision(self, decision: IntentDecision) -> None:
+        with self._lock:
+            self._counts[decision.intent][decision.source] += 1
+
+    def record_latency(self, intent: Intent, seconds: float) -> None:
+        with self._lock:
+            self._latencies[intent].append(seconds * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                intent.value: {
+                    "decisions": dict(self._counts[intent]),
+                    **self._latency_summary(sorted(self._latencies[intent])),
+                }
+                for intent in Intent
+            }
+
+    @staticmethod
+    def _latency_summary(samples: List[float]) -> Dict[str, Any]:
+        if not samples:
+            return {"turns": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+        return {
+            "turns": len(samples),
+            "p50_ms": round(samples[len(samples) // 2], 1),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 1),
+            "max_ms": round(samples[-1], 1),
+        }
+
+
+class IntentRouter:
+    """Classify chat messages into intents without a network call where possible.
+
+    Each intent is scored by summing weighted regex cues. Confidence combines
+    the margin over the runner-up with how strong the winning evidence is.
+    Only when confidence falls below ``threshold`` is the LLM asked to decide.
+    Messages with no cues at all are confidently general chat.
+    """
+
+    def __init__(self, model=None, threshold: float = INTENT_CONFIDENCE_THRESHOLD, llm_fallback: bool = INTENT_LLM_FALLBACK):
+        self.model = model
+        self.threshold = threshold
+        self.llm_fallback = llm_fallback and model is not None
+        self.stats = IntentStats()
+
+    def score(self, message: str) -> IntentDecision:
+        """Rule-based decision for ``message``; never calls the model."""
+        if message.startswith(PRESCRIPTION_DATA_PREFIX):
+            return IntentDecision(Intent.PRESCRIPTION, 1.0, "rules")
+
+        scores = {
+            intent: sum(weight for pattern, weight in rules if pattern.search(message))
+            for intent, rules in _INTENT_RULES.items()
+        }
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (top_intent, top), (_, runner_up) = ranked[0], ranked[1]
+        score_map = {intent.value: s for intent, s in scores.items()}
+        if top == 0:
+            return IntentDecision(Intent.GENERAL, 1.0, "rules", score_map)
+
+        confidence = (top - runner_up) / top * min(1.0, top / _SATURATION_SCORE)
+        return IntentDecision(top_intent, round(confidence, 3), "rules", score_map)
+
+    def classify(self, message: str) -> IntentDecision:
+        """Classify ``message``, asking the LLM only if the rules are not confident."""
+        decision = self.score(message)
+        if decision.confidence < self.threshold and self.llm_fallback:
+            try:
+                record_model_call()
+                response = self.model.generate_content(
+                    _CLASSIFY_PROMPT.format(message=message), generation_config=_CLASSIFY_CONFIG
+                )
+                decision = self._llm_decision(response.text, decision)
+            except Exception as e:
+                logger.warning(f"LLM intent classification failed, keeping rule decision: {str(e)}")
+        self.stats.record_decision(decision)
+        return decision
+
+    async def classify_async(self, message: str) -> IntentDecision:
+        """Async variant of classify"""
+        decision = self.score(message)
+        if decision.confidence < self.threshold and self.llm_fallback:
+            try:
+                record_model_call()
+                response = await self.model.generate_content_async(
+                    _CLASSIFY_PROMPT.format(message=message), generation_config=_CLASSIFY_CONFIG
+                )
+                decision = self._llm_decision(response.text, decision)
+            except Exception as e:
+                logger.warning(f"LLM intent classification failed, keeping rule decision: {str(e)}")
+        self.stats.record_decision(decision)
+        return decision
+
+    def _llm_decision(self, text: str, fallback: IntentDecision) -> IntentDecision:
+        label = re.sub(r"[^a-z]", "", text.strip().split()[0].lower()) if text.strip() else ""
+        try:
+            return IntentDecision(Intent(label), 1.0, "llm", fallback.scores)
+        except ValueError:
+            logger.warning(f"Unrecognised intent label from LLM: {text!r}")
+            return fallback
+
+    def record_latency(self, intent: Optional[Intent], seconds: float) -> None:
+        self.stats.record_latency(intent or Intent.GENERAL, seconds)
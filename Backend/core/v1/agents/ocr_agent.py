@@ -1,51 +1,199 @@
 import google.generativeai as genai
 # from PIL import Image
-import PyPDF2
-from pdf2image import convert_from_path
 import os
-import easyocr
-import io
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from typing import Any, Dict, List, Optional, Tuple
+from Backend.config.v1.constants import OCR_MAX_PAGES, OCR_PAGE_WORKERS, OCR_PDF_DPI, OCR_TEXT_LAYER_MIN_CHARS
+from Backend.core.v1.common.logger import get_logger
 
 load_dotenv()
-# Initialize EasyOCR reader
-reader = easyocr.Reader(['en'])
+logger = get_logger(__name__)
+
+# EasyOCR (and the torch stack behind it), pdf2image and PyPDF2 are imported on first use
+# so that importing this module is cheap; the OCR model is loaded once per process.
+_reader = None
+_model = None
+_init_lock = threading.Lock()
+
+
+def get_reader():
+    """Return the process-wide EasyOCR reader, loading it on first use"""
+    global _reader
+    if _reader is None:
+        with _init_lock:
+            if _reader is None:
+                started = time.perf_counter()
+                import easyocr
+
+                _reader = easyocr.Reader(['en'])
+                logger.info(f"Loaded EasyOCR reader in {time.perf_counter() - started:.1f}s")
+    return _reader
+
+
+def get_model():
+    """Return the Gemini model used for document summaries, configuring it on first use"""
+    global _model
+    if _model is None:
+        with _init_lock:
+            if _model is None:
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                _model = genai.GenerativeModel('gemini-2.0-flash')
+    return _model
+
+
+def preload_ocr_models():
+    """Load the OCR stack eagerly; used as the initializer of OCR worker processes"""
+    started = time.perf_counter()
+    import PyPDF2  # noqa: F401
+    import pdf2image  # noqa: F401
+
+    get_reader()
+    get_model()
+    logger.info(f"OCR worker {os.getpid()} ready in {time.perf_counter() - started:.1f}s")
 
-# Configure Gemini
-api_key1 = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=api_key1)
-model = genai.GenerativeModel('gemini-2.0-flash')
 
 def extract_text_from_image(image_path):
     """Extract text from image files using EasyOCR"""
     try:
-        result = reader.readtext(image_path, detail=0)
+        result = get_reader().readtext(image_path, detail=0)
         return " ".join(result)
     except Exception as e:
         return f"OCR Error: {str(e)}"
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF files using EasyOCR"""
-    text = ""
+def _rasterize_page(pdf_path, page_number, dpi=OCR_PDF_DPI):
+    """Render a single PDF page to a grayscale numpy array"""
+    import numpy as np
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True)
+    return np.asarray(images[0])
+
+
+def _ocr_page(pdf_path, page_number) -> Tuple[str, float]:
+    # Only this page's image is alive while it is read; EasyOCR accepts the array directly
+    started = time.perf_counter()
+    try:
+        image = _rasterize_page(pdf_path, page_number)
+        text = " ".join(get_reader().readtext(image, detail=0))
+    except Exception as e:
+        logger.error(f"OCR failed for page {page_number} of {pdf_path}: {str(e)}")
+        text = ""
+    return text, time.perf_counter() - started
+
+
+def _ocr_pdf_pages(pdf_path, page_numbers: List[int]) -> Dict[int, Tuple[str, float]]:
+    """OCR the given pages, rasterizing them one at a time across a small thread pool.
+
+    Threads share the process's single reader (torch and poppler release the GIL),
+    so at most OCR_PAGE_WORKERS page images are in memory at once.
+    Returns ``{page_number: (text, seconds)}``.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=OCR_PAGE_WORKERS, thread_name_prefix="ocr-page") as pool:
+        for page_number, result in zip(page_numbers, pool.map(lambda n: _ocr_page(pdf_path, n), page_numbers)):
+            results[page_number] = result
+    return results
+
+
+# Inline image operator sequence; a false positive only costs an OCR pass
+_INLINE_IMAGE = re.compile(rb"\bBI\b.*?\bID\b", re.DOTALL)
+
+
+def _has_text_layer(text: str) -> bool:
+    return sum(ch.isalnum() for ch in text) >= OCR_TEXT_LAYER_MIN_CHARS
+
+
+def _draws_inline_image(content) -> bool:
+    """Whether a content stream contains an inline image (``BI ... ID ... EI``)"""
+    return content is not None and _INLINE_IMAGE.search(content.get_data()) is not None
+
+
+def _resources_have_images(resources, seen: set) -> bool:
+    """Whether resources hold an image XObject, directly or inside a Form XObject"""
+    xobjects = resources.get_object().get("/XObject") if resources is not None else None
+    if xobjects is None:
+        return False
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            return True
+        # Forms are reusable drawings (scanner wrappers, stamps) that can hold the page image themselves
+        if subtype == "/Form" and id(xobject) not in seen:
+            seen.add(id(xobject))
+            if _draws_inline_image(xobject) or _resources_have_images(xobject.get("/Resources"), seen):
+                return True
+    return False
+
+
+def _page_has_images(page) -> bool:
+    """Whether a page draws any image, i.e. may contain scanned content
+
+    Looks at image XObjects, Form XObjects nested to any depth and inline
+    images in the page's content stream.
+    """
     try:
-        # Try text extraction first
+        return _resources_have_images(page.get("/Resources"), set()) or _draws_inline_image(page.get_contents())
+    except Exception:
+        # When in doubt, let OCR look at the page
+        return True
+
+
+def extract_text_from_pdf(pdf_path, page_stats: Optional[List[Dict[str, Any]]] = None):
+    """Extract text from a PDF, deciding per page between its text layer and EasyOCR
+
+    Pages with a usable text layer are read directly, image-only pages are OCRed
+    and pages with neither are skipped. If ``page_stats`` is given, one entry per
+    page with the method used and its timing is appended to it.
+    """
+    import PyPDF2
+
+    started = time.perf_counter()
+    texts: Dict[int, str] = {}
+    stats: Dict[int, Dict[str, Any]] = {}
+    try:
+        ocr_pages = []
         with open(pdf_path, 'rb') as file:
             reader_pdf = PyPDF2.PdfReader(file)
-            for page in reader_pdf.pages:
-                text += page.extract_text() or ""
-                
-        # If no text found, use OCR
-        if not text.strip():
-            images = convert_from_path(pdf_path)
-            for img in images:
-                img_byte_arr = io.BytesIO()
-                img.save(img_byte_arr, format='PNG')
-                result = reader.readtext(img_byte_arr.getvalue(), detail=0)
-                text += " ".join(result)
-                
+            page_count = len(reader_pdf.pages)
+            if page_count > OCR_MAX_PAGES:
+                logger.warning(f"PDF has {page_count} pages; only the first {OCR_MAX_PAGES} are processed")
+            for page_number, page in enumerate(reader_pdf.pages[:OCR_MAX_PAGES], start=1):
+                page_started = time.perf_counter()
+                text = page.extract_text() or ""
+                if _has_text_layer(text):
+                    method = "text"
+                    texts[page_number] = text
+                elif _page_has_images(page):
+                    method = "ocr"
+                    ocr_pages.append(page_number)
+                else:
+                    method = "blank"
+                    texts[page_number] = text
+                stats[page_number] = {"page": page_number, "method": method, "seconds": time.perf_counter() - page_started}
+
+        for page_number, (text, seconds) in _ocr_pdf_pages(pdf_path, ocr_pages).items():
+            texts[page_number] = text
+            stats[page_number]["seconds"] += seconds
+
     except Exception as e:
-        print(f"Error processing PDF: {e}")
-    return text
+        logger.error(f"Error processing PDF: {e}")
+
+    for page_number, stat in stats.items():
+        stat["seconds"] = round(stat["seconds"], 3)
+        stat["chars"] = len(texts.get(page_number, "").strip())
+    methods = [stat["method"] for stat in stats.values()]
+    logger.info(
+        f"Extracted {len(stats)} PDF page(s) in {time.perf_counter() - started:.1f}s "
+        f"({methods.count('text')} text layer, {methods.count('ocr')} OCR, {methods.count('blank')} blank)"
+    )
+    if page_stats is not None:
+        page_stats.extend(stats[n] for n in sorted(stats))
+    return "\n".join(texts[n] for n in sorted(texts) if texts[n].strip())
 
 def generate_summary(text):
     """Generate structured summary using Gemini"""
@@ -63,13 +211,16 @@ def generate_summary(text):
     Document: {text}"""
     
     try:
-        response = model.generate_content(prompt.format(text=text))
+        response = get_model().generate_content(prompt.format(text=text))
         return response.text
     except Exception as e:
         return f"Error generating summary: {e}"
 
-def process_document(file_path):
-    """Main processing function"""
+def process_document(file_path, page_stats: Optional[List[Dict[str, Any]]] = None):
+    """Main processing function
+
+    For PDFs, per-page extraction method and timings are appended to ``page_stats`` if given.
+    """
     if not os.path.exists(file_path):
         return "File not found"
     
@@ -77,7 +228,7 @@ def process_document(file_path):
     if file_path.lower().endswith(('.png', '.jpg', '.jpeg')):
         text = extract_text_from_image(file_path)
     elif file_path.lower().endswith('.pdf'):
-        text = extract_text_from_pdf(file_path)
+        text = extract_text_from_pdf(file_path, page_stats)
     else:
         return "Unsupported file format"
     
@@ -87,4 +238,4 @@ def process_document(file_path):
     return generate_summary(text)
 
 # result = process_document("Medi_Agent\Backend\core\pres1.jpg")
-# print(result)
\ No newline at end of file
+# print(result)
@@ -0,0 +1,111 @@
+# This file contains helpers for schema-constrained (JSON mode) model calls.
+import re
+from typing import Any, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from Backend.config.v1.constants import STRUCTURED_OUTPUT_MAX_ATTEMPTS
+from Backend.core.v1.common.logger import get_logger
+
+from .conversation import record_model_call
+
+logger = get_logger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def _repair_json(text: str) -> Optional[str]:
+    """Fix the common ways JSON output drifts: code fences, surrounding prose, trailing commas."""
+    repaired = _CODE_FENCE.sub("", text.strip())
+    start, end = repaired.find("{"), repaired.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    repaired = _TRAILING_COMMA.sub(r"\1", repaired[start:end + 1])
+    return repaired if repaired != text else None
+
+
+def parse_structured(text: str, schema: Type[T]) -> T:
+    """Validate model output against ``schema``, trying a local repair before giving up.
+
+    Raises:
+        ValidationError: If neither the raw nor the repaired text validates.
+    """
+    try:
+        return schema.model_validate_json(text)
+    except ValidationError:
+        repaired = _repair_json(text)
+        if repaired is None:
+            raise
+        return schema.model_validate_json(repaired)
+
+
+def _error_summary(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'response'}: {err['msg']}"
+        for err in error.errors()[:3]
+    )
+
+
+def _repair_prompt(prompt: str, error: ValidationError) -> str:
+    return (
+        f"{prompt}\n\nYour previous reply did not match the required JSON schema "
+        f"({_error_summary(error)}). Reply again with only the corrected JSON."
+    )
+
+
+def generate_structured(
+    model: Any,
+    prompt: str,
+    schema: Type[T],
+    generation_config: Any,
+    safety_settings: Any = None,
+    max_attempts: int = STRUCTURED_OUTPUT_MAX_ATTEMPTS,
+) -> T:
+    """Call ``model`` in JSON mode and validate the reply into ``schema``.
+
+    Malformed replies are first repaired locally; if that fails the model is
+    asked again with the validation errors, up to ``max_attempts`` calls.
+
+    Raises:
+        ValidationError: If no attempt produced valid output.
+    """
+    current_prompt = prompt
+    for attempt in range(1, max_attempts + 1):
+        record_model_call()
+        response = model.generate_content(
+            current_prompt, generation_config=generation_config, safety_settings=safety_settings
+        )
+        try:
+            return parse_structured(response.text, schema)
+        except ValidationError as e:
+            logger.warning(f"Invalid {schema.__name__} output (attempt {attempt}/{max_attempts}): {_error_summary(e)}")
+            if attempt == max_attempts:
+                raise
+            current_prompt = _repair_prompt(prompt, e)
+
+
+async def generate_structured_async(
+    model: Any,
+    prompt: str,
+    schema: Type[T],
+    generation_config: Any,
+    safety_settings: Any = None,
+    max_attempts: int = STRUCTURED_OUTPUT_MAX_ATTEMPTS,
+) -> T:
+    """Async variant of generate_structured"""
+    current_prompt = prompt
+    for attempt in range(1, max_attempts + 1):
+        record_model_call()
+        response = await model.generate_content_async(
+            current_prompt, generation_config=generation_config, safety_settings=safety_settings
+        )
+        try:
+            return parse_structured(response.text, schema)
+        except ValidationError as e:
+            logger.warning(f"Invalid {schema.__name__} output (attempt {attempt}/{max_attempts}): {_error_summary(e)}")
+            if attempt == max_attempts:
+                raise
+            current_prompt = _repair_prompt(prompt, e)
@@ -1,14 +1,34 @@
+import asyncio
+import contextvars
 import google.generativeai as genai
 import wikipedia
 import os
-import re
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Union
+from pydantic import ValidationError
+from Backend.config.v1.constants import (
+    DISEASE_CONTEXT_LIVE_FALLBACK,
+    SYMPTOM_CONTEXT_FALLBACK,
+    SYMPTOM_LOOKUP_TIMEOUT_SECONDS,
+)
+from Backend.core.v1.agents.structured_output import generate_structured, generate_structured_async
+from Backend.core.v1.common.cache import get_response_cache
 from Backend.core.v1.common.logger import get_logger
+from Backend.core.v1.knowledge.disease_index import get_disease_index
+from Backend.core.v1.types.analysis import SymptomAnalysis
 
 load_dotenv()
 logger = get_logger(__name__)
 
+# Bump whenever the matching prompt or schema changes so cached responses are invalidated
+SYMPTOM_ANALYSIS_PROMPT_VERSION = "1"
+DISEASE_CONTEXT_VERSION = "1"
+WIKIPEDIA_SOURCE = "wikipedia"
+
+# Shared pool so the synchronous path can bound the context lookup with a timeout
+_lookup_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="symptom-lookup")
+
 class SymptomAnalyzerAgent:
     def __init__(self):
         try:
@@ -32,80 +52,160 @@ class SymptomAnalyzerAgent:
                 "HARM_CATEGORY_HATE_SPEECH": "BLOCK_NONE",
                 "HARM_CATEGORY_SEXUALLY_EXPLICIT": "BLOCK_NONE"
             }
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            self.model_name = 'gemini-2.0-flash'
+            self.model = genai.GenerativeModel(self.model_name)
+            self.analysis_config = genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=SymptomAnalysis,
+            )
+            self.analysis_cache = get_response_cache("symptom_analysis")
+            self.context_cache = get_response_cache("disease_context")
+            self.disease_index = get_disease_index()
             logger.debug("Gemini model configured successfully")
         except Exception as e:
             logger.error(f"Failed to configure Gemini model: {str(e)}")
             raise
 
-    def _clean_disease_list(self, text: str) -> List[str]:
-        """Clean and format the disease list response"""
-        return [disease.strip() for disease in re.split(r'\d+\.|,', text) if disease.strip()]
+    def _analysis_prompt(self, symptoms: str) -> str:
+        return (
+            f"A patient describes: {symptoms}\n\n"
+            "1. Extract ONLY the medical symptoms, in clinical terms.\n"
+            "2. Rank the 3 most likely MEDICAL CONDITIONS using standard medical terms.\n"
+            "3. For the most likely condition give concise main symptoms, common treatments, "
+            "prevention tips and when to see a doctor.\n"
+            "Exclude non-disease answers such as 'normal' or 'okay'."
+        )
+
+    def analyze(self, symptoms: str) -> SymptomAnalysis:
+        """Clean symptoms, rank conditions and describe the top one in a single model call.
+
+        Raises:
+            ValidationError: If the model output does not match the SymptomAnalysis schema.
+        """
+        data = self.analysis_cache.get_or_compute(
+            (symptoms,), self.model_name, SYMPTOM_ANALYSIS_PROMPT_VERSION,
+            lambda: self._generate_analysis(symptoms)
+        )
+        return SymptomAnalysis.model_validate(data)
+
+    async def analyze_async(self, symptoms: str) -> SymptomAnalysis:
+        """Async variant of analyze"""
+        data = await self.analysis_cache.get_or_compute_async(
+            (symptoms,), self.model_name, SYMPTOM_ANALYSIS_PROMPT_VERSION,
+            lambda: self._generate_analysis_async(symptoms)
+        )
+        return SymptomAnalysis.model_validate(data)
+
+    def _generate_analysis(self, symptoms: str) -> Dict[str, Any]:
+        return generate_structured(
+            self.model, self._analysis_prompt(symptoms), SymptomAnalysis,
+            generation_config=self.analysis_config, safety_settings=self.safety_settings
+        ).model_dump()
+
+    async def _generate_analysis_async(self, symptoms: str) -> Dict[str, Any]:
+        return (await generate_structured_async(
+            self.model, self._analysis_prompt(symptoms), SymptomAnalysis,
+            generation_config=self.analysis_config, safety_settings=self.safety_settings
+        )).model_dump()
+
+    def _result(self, analysis: SymptomAnalysis, context: str, context_ok: bool) -> Dict[str, Union[List[str], str]]:
+        return {
+            "symptoms": analysis.cleaned_symptoms,
+            "diseases": [c.name for c in analysis.conditions],
+            "context": context,
+            "info": analysis.primary_condition_info.render(),
+            "partial": not context_ok,
+            "error": None
+        }
 
     def analyze_symptoms(self, symptoms: str) -> Dict[str, Union[List[str], str]]:
         """Process symptoms and return disease information"""
         try:
-            response = self.model.generate_content(
-                f"List 3 most likely MEDICAL CONDITIONS matching: {symptoms}\n"
-                "Format as numbered list using ONLY standard medical terms.\n"
-                "Example:\n1. Hemorrhoids\n2. Anal fissure\n3. Colorectal cancer\n\n"
-                "Rules:\n- Exclude non-disease responses\n- No markdown formatting\n- Only list conditions"
+            analysis = self.analyze(symptoms)
+            # Copy the context so any model calls in the pool are counted against the current turn
+            context_future = _lookup_executor.submit(
+                contextvars.copy_context().run, self._get_disease_context, analysis.primary_condition
             )
-            # Add additional validation
-            diseases = [d for d in self._clean_disease_list(response.text) if d.lower() not in ["okay", "normal"]]
-            
-            if not diseases:
-                return {"error": "No valid conditions identified"}
-            
-            # Add this missing section to return proper analysis
-            primary_disease = diseases[0]
-            return {
-                "diseases": diseases,
-                "context": self._get_disease_context(primary_disease),
-                "info": self._get_disease_info(primary_disease),
-                "error": None
-            }
-        
+            context, context_ok = self._future_result(context_future, "context", SYMPTOM_CONTEXT_FALLBACK)
+            return self._result(analysis, context, context_ok)
+
+        except ValidationError as e:
+            logger.error(f"Symptom analysis did not match the expected schema: {str(e)}")
+            return {"error": "No valid conditions identified"}
         except Exception as e:
             logger.error(f"Failed to analyze symptoms: {str(e)}")
             return {"error": str(e)}
-        
+
+    async def analyze_symptoms_async(self, symptoms: str) -> Dict[str, Union[List[str], str]]:
+        """Async variant of analyze_symptoms built on the SDK's async generation API"""
+        try:
+            analysis = await self.analyze_async(symptoms)
+            context, context_ok = await self._await_with_timeout(
+                self._get_disease_context_async(analysis.primary_condition), "context", SYMPTOM_CONTEXT_FALLBACK
+            )
+            return self._result(analysis, context, context_ok)
+
+        except ValidationError as e:
+            logger.error(f"Symptom analysis did not match the expected schema: {str(e)}")
+            return {"error": "No valid conditions identified"}
+        except Exception as e:
+            logger.error(f"Failed to analyze symptoms: {str(e)}")
+            return {"error": str(e)}
+
+    def _future_result(self, future, label: str, fallback: str):
+        """Wait for a lookup future, returning (result, completed) with a fallback on timeout"""
+        try:
+            return future.result(timeout=SYMPTOM_LOOKUP_TIMEOUT_SECONDS), True
+        except FutureTimeoutError:
+            logger.warning(f"Disease {label} lookup timed out after {SYMPTOM_LOOKUP_TIMEOUT_SECONDS}s")
+            return fallback, False
+        except Exception as e:
+            logger.error(f"Disease {label} lookup failed: {str(e)}")
+            return fallback, False
+
+    async def _await_with_timeout(self, coro, label: str, fallback: str):
+        """Await a lookup coroutine, returning (result, completed) with a fallback on timeout"""
+        try:
+            return await asyncio.wait_for(coro, timeout=SYMPTOM_LOOKUP_TIMEOUT_SECONDS), True
+        except asyncio.TimeoutError:
+            logger.warning(f"Disease {label} lookup timed out after {SYMPTOM_LOOKUP_TIMEOUT_SECONDS}s")
+            return fallback, False
+        except Exception as e:
+            logger.error(f"Disease {label} lookup failed: {str(e)}")
+            return fallback, False
+
     def _get_disease_context(self, disease_name: str) -> str:
-        """Fetch disease info from Wikipedia"""
+        """Fetch disease info from the local index, falling back to Wikipedia"""
+        indexed = self._indexed_disease_context(disease_name)
+        if indexed is not None:
+            return indexed
+        if not DISEASE_CONTEXT_LIVE_FALLBACK:
+            return SYMPTOM_CONTEXT_FALLBACK
         try:
-            return wikipedia.summary(disease_name, sentences=3)
+            return self.context_cache.get_or_compute(
+                (disease_name,), WIKIPEDIA_SOURCE, DISEASE_CONTEXT_VERSION,
+                lambda: wikipedia.summary(disease_name, sentences=3)
+            )
         except Exception as e:
             logger.error(f"Failed to fetch disease context from Wikipedia: {str(e)}")
-            return "No additional context available"
+            return SYMPTOM_CONTEXT_FALLBACK
 
-    def _get_disease_info(self, disease_name: str) -> str:
-        """Get structured disease information"""
+    async def _get_disease_context_async(self, disease_name: str) -> str:
+        """Fetch disease info without blocking the event loop"""
+        indexed = self._indexed_disease_context(disease_name)
+        if indexed is not None:
+            return indexed
+        # The wikipedia client is synchronous, so run it on the default executor
+        return await asyncio.to_thread(self._get_disease_context, disease_name)
+
+    def _indexed_disease_context(self, disease_name: str):
+        if self.disease_index is None:
+            return None
         try:
-            response = self.model.generate_content(
-                f"Explain {disease_name} in this concise structure:\n"
-                "1. Main Symptoms\n2. Common Treatments\n3. Prevention Tips\n4. When to See a Doctor",
-                safety_settings=self.safety_settings
-            )
-            return response.text
+            return self.disease_index.lookup(disease_name)
         except Exception as e:
-            logger.error(f"Failed to fetch disease information: {str(e)}")
-            return f"Information unavailable: {str(e)}"
-        
-    def _clean_disease_list(self, text: str) -> List[str]:
-        """Clean and validate disease list response"""
-        forbidden_terms = ["okay", "normal", "unknown", "healthy", "possible", "conditions", "include"]
-        # Split on various delimiters and numbering formats
-        diseases = re.split(r'\d+[\.\)]|,|\n|-|•|\*', text)
-        cleaned_diseases = []
-        for d in diseases:
-            d = d.strip()
-            # Filter invalid entries
-            if d and not any(term in d.lower() for term in forbidden_terms):
-                # Remove trailing punctuation
-                d = re.sub(r'[^a-zA-Z\s]', '', d)
-                if d:
-                    cleaned_diseases.append(d)
-        return cleaned_diseases[:3]
+            logger.error(f"Disease index lookup failed: {str(e)}")
+            return None
 
 # Example usage in a multi-agent system
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+# This file contains the compiled symptom keyword matcher shared by the chat agents.
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+SYMPTOM_KEYWORDS = (
+    # General Symptoms
+    "pain", "discomfort", "weakness", "fatigue", "dizziness", "nausea", "vomiting",
+    "fever", "chills", "sweating",
+
+    # Respiratory Symptoms
+    "cough", "shortness of breath", "wheezing", "chest pain", "congestion", "runny nose",
+    "sneezing", "sore throat", "hoarseness", "difficulty breathing",
+
+    # Gastrointestinal Symptoms
+    "stomach pain", "bloating", "gas", "diarrhea", "constipation", "acid reflux",
+    "heartburn", "loss of appetite", "nausea after eating", "vomiting blood",
+
+    # Head & Neurological Symptoms
+    "headache", "migraine", "lightheadedness", "confusion", "memory loss",
+    "fainting", "numbness", "tingling sensation", "seizures",
+
+    # Muscle & Joint Symptoms
+    "muscle pain", "stiffness", "cramps", "joint pain", "swelling", "limited movement",
+    "back pain", "neck pain", "weak grip", "muscle spasms",
+
+    # Skin & Allergy Symptoms
+    "rash", "itching", "redness", "dry skin", "hives", "bruising",
+    "peeling skin", "sensitivity to touch", "skin discoloration",
+
+    # Mental Health Symptoms
+    "anxiety", "depression", "mood swings", "brain fog", "irritability", "hallucinations",
+    "insomnia", "feeling overwhelmed", "panic attacks", "hopelessness",
+
+    # Eye & Vision Symptoms
+    "blurry vision", "eye pain", "red eyes", "watery eyes", "sensitivity to light",
+    "dry eyes", "double vision", "floaters", "blind spots", "swollen eyelids",
+
+    # Urinary & Reproductive Symptoms
+    "frequent urination", "burning sensation when urinating", "blood in urine", "pelvic pain",
+    "irregular periods", "heavy bleeding", "erectile dysfunction", "low libido",
+    "painful intercourse", "vaginal discharge",
+
+    # Other Symptoms
+    "swollen lymph nodes", "choking sensation", "difficulty swallowing", "unexplained weight loss",
+    "unexplained weight gain", "hair loss", "chronic fatigue", "night sweats",
+    "cold hands and feet", "clammy skin",
+)
+
+# A symptom phrase runs from the matched term to the next clause boundary
+_CLAUSE_BOUNDARY = re.compile(r"[,.;:!?\n]|\b(?:and|but|also|plus)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class SymptomMatch:
+    """A symptom keyword found in text, with its character span."""
+
+    term: str
+    start: int
+    end: int
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a prefix-factored regex so alternatives sharing a prefix are scanned once.
+
+    Longer completions are tried before shorter ones, so "chest pain" wins over
+    "chest" and "nausea after eating" over "nausea".
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+# Common inflections of a keyword: "coughs", "coughing", "painful", "feverish", "achy"
+_SUFFIXES = r"(?:e?s|ed|ing|ish|ful(?:ly)?|y)?"
+
+# Built once at import: a single pass over the text finds every keyword and its inflected forms
+_SYMPTOM_PATTERN = re.compile(
+    r"\b(" + _trie_pattern(sorted(set(SYMPTOM_KEYWORDS))) + r")" + _SUFFIXES + r"\b", re.IGNORECASE
+)
+
+
+def match_symptoms(text: str) -> List[SymptomMatch]:
+    """Return every symptom keyword in ``text`` with its span, in order of appearance."""
+    return [
+        SymptomMatch(term=m.group(1).lower(), start=m.start(), end=m.end())
+        for m in _SYMPTOM_PATTERN.finditer(text)
+    ]
+
+
+def symptom_phrases(text: str, matches: List[SymptomMatch]) -> List[str]:
+    """Expand each match to the rest of its clause, e.g. "pain in my lower back".
+
+    Keeps qualifiers such as location and timing that a bare keyword loses,
+    without a model call. Matches inside an already-taken phrase are skipped.
+    """
+    phrases = []
+    covered_until = -1
+    for match in matches:
+        if match.start < covered_until:
+            continue
+        boundary = _CLAUSE_BOUNDARY.search(text, match.end)
+        end = boundary.start() if boundary else len(text)
+        phrase = text[match.start:end].strip().lower()
+        if phrase and phrase not in phrases:
+            phrases.append(phrase)
+        covered_until = end
+    return phrases
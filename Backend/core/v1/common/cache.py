@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from Backend.config.v1.constants import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_SQLITE_PATH,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from Backend.core.v1.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheBackend(ABC):
+    """Storage tier for cached responses. Values must be JSON-serializable."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expiry."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+
+
+class TTLLRUCache(CacheBackend):
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Shared cache tier backed by a local SQLite file, usable across worker processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + ttl),
+            )
+
+
+class CacheMetrics:
+    """Hit/miss counters for one cache namespace."""
+
+    def __init__(self):
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        hits = self.local_hits + self.shared_hits
+        return {
+            "hits": hits,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def normalize_cache_input(value: str) -> str:
+    """Normalize free-text input so trivially different spellings share an entry."""
+    return re.sub(r"\s+", " ", str(value)).strip().lower()
+
+
+class ResponseCache:
+    """Two-tier cache for deterministic agent calls.
+
+    Keys combine the namespace, model name, prompt version and normalized
+    inputs, so changing a prompt or model invalidates old entries. Lookups go
+    to the in-process LRU first, then the optional shared backend. Only
+    successful results are stored: ``compute`` should raise on failure.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        local: TTLLRUCache,
+        shared: Optional[CacheBackend] = None,
+        ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+    ):
+        self.namespace = namespace
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+        self.enabled = enabled
+        self.metrics = CacheMetrics()
+
+    def make_key(self, inputs: Sequence[str], model: str, prompt_version: str) -> str:
+        payload = json.dumps([model, prompt_version, [normalize_cache_input(i) for i in inputs]])
+        return f"{self.namespace}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            self.metrics.local_hits += 1
+            return value
+        return self._record_shared(key, self._shared_get(key))
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """Like get, but the shared tier is read in a worker thread so the event loop never waits on it."""
+        value = self.local.get(key)
+        if value is not None:
+            self.metrics.local_hits += 1
+            return value
+        if self.shared is not None:
+            value = await asyncio.to_thread(self._shared_get, key)
+        return self._record_shared(key, value)
+
+    def set(self, key: str, value: Any) -> None:
+        self.local.set(key, value, self.ttl)
+        self._shared_set(key, value)
+
+    async def set_async(self, key: str, value: Any) -> None:
+        """Like set, with the shared tier written in a worker thread."""
+        self.local.set(key, value, self.ttl)
+        if self.shared is not None:
+            await asyncio.to_thread(self._shared_set, key, value)
+
+    def _shared_get(self, key: str) -> Optional[Any]:
+        if self.shared is None:
+            return None
+        try:
+            return self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared cache lookup failed: {str(e)}")
+            return None
+
+    def _shared_set(self, key: str, value: Any) -> None:
+        if self.shared is None:
+            return
+        try:
+            self.shared.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed: {str(e)}")
+
+    def _record_shared(self, key: str, value: Optional[Any]) -> Optional[Any]:
+        """Count a lookup that missed the local tier; a shared hit is copied into it."""
+        if value is None:
+            self.metrics.misses += 1
+            return None
+        self.metrics.shared_hits += 1
+        self.local.set(key, value, self.ttl)
+        return value
+
+    def get_or_compute(
+        self, inputs: Sequence[str], model: str, prompt_version: str, compute: Callable[[], Any]
+    ) -> Any:
+        """Return the cached value for ``inputs`` or compute and store it."""
+        if not self.enabled:
+            return compute()
+        key = self.make_key(inputs, model, prompt_version)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    async def get_or_compute_async(
+        self, inputs: Sequence[str], model: str, prompt_version: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Async variant of get_or_compute; the shared tier is never accessed on the event loop."""
+        if not self.enabled:
+            return await compute()
+        key = self.make_key(inputs, model, prompt_version)
+        value = await self.get_async(key)
+        if value is None:
+            value = await compute()
+            await self.set_async(key, value)
+        return value
+
+
+_local_cache: Optional[TTLLRUCache] = None
+_shared_cache: Optional[CacheBackend] = None
+_caches: Dict[str, ResponseCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_response_cache(namespace: str) -> ResponseCache:
+    """Return the process-wide cache for a namespace, creating the tiers on first use."""
+    global _local_cache, _shared_cache
+    with _registry_lock:
+        if namespace not in _caches:
+            if _local_cache is None:
+                _local_cache = TTLLRUCache()
+                if RESPONSE_CACHE_SQLITE_PATH:
+                    _shared_cache = SQLiteCacheBackend(RESPONSE_CACHE_SQLITE_PATH)
+            _caches[namespace] = ResponseCache(namespace, _local_cache, _shared_cache)
+        return _caches[namespace]
+
+
+def get_cache_metrics() -> Dict[str, Any]:
+    """Hit/miss metrics for every cache namespace plus tier sizes."""
+    return {
+        "enabled": RESPONSE_CACHE_ENABLED,
+        "local_entries": len(_local_cache) if _local_cache is not None else 0,
+        "shared_backend": type(_shared_cache).__name__ if _shared_cache is not None else None,
+        "namespaces": {name: cache.metrics.snapshot() for name, cache in _caches.items()},
+    }
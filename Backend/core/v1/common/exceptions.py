@@ -22,6 +22,14 @@ class AgentProcessingException(Exception):
         super().__init__(self.message)
 
 
+class InvalidCursorException(Exception):
+    """Exception raised when a pagination cursor cannot be decoded"""
+
+    def __init__(self, message="Invalid pagination cursor"):
+        self.message = message
+        super().__init__(self.message)
+
+
 class DatabaseOperationException(Exception):
     """Exception raised for database operation failures"""
     
@@ -30,4 +38,11 @@ class DatabaseOperationException(Exception):
             self.message = f"{message}: {operation}"
         else:
             self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class QueueFullException(Exception):
+    """Exception raised when a bounded work queue cannot accept more jobs"""
+
+    def __init__(self, message="Work queue is full, please retry later"):
+        self.message = message
+        super().__init__(self.message)
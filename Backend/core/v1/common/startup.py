@@ -0,0 +1,60 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from Backend.core.v1.common.logger import get_logger
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = get_logger(__name__)
+
+
+class StartupReport:
+    """Wall-clock timings of the application's cold-start phases.
+
+    The clock starts when this module is first imported, which ``Backend.main``
+    does before any other application import.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._last_mark = self._origin
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """Record the time since the previous mark (or module import) as phase ``name``."""
+        now = time.perf_counter()
+        self.phases[name] = now - self._last_mark
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as phase ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+            self._last_mark = time.perf_counter()
+
+    def summary(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "total_ms": round((self._last_mark - self._origin) * 1000, 1),
+        }
+        if resource is not None:
+            # ru_maxrss is reported in kilobytes on Linux
+            report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        return report
+
+    def log(self) -> None:
+        summary = self.summary()
+        phases = ", ".join(f"{name} {ms:.0f}ms" for name, ms in summary["phases_ms"].items())
+        rss = f", peak RSS {summary['peak_rss_mb']}MB" if "peak_rss_mb" in summary else ""
+        logger.info(f"Startup completed in {summary['total_ms']:.0f}ms ({phases}{rss})")
+
+
+startup_report = StartupReport()
@@ -1,25 +1,83 @@
-from sqlalchemy import inspect
+from pathlib import Path
+from typing import Optional
 
-from Backend.core.v1.db.base import Base
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+from Backend.config.v1.constants import DB_MIGRATE_ON_STARTUP
 from Backend.core.v1.db.session import engine
 from Backend.core.v1.common.logger import get_logger
 
-# Import all models to ensure they're registered with the Base metadata
-# This ensures create_all() includes all your model tables
-from Backend.core.v1.models.chat import ChatSessionModel
-
 logger = get_logger(__name__)
 
-def create_tables():
-    """Create all tables defined in the models."""
-    inspector = inspect(engine)
-    if not inspector.has_table("chat_sessions"):
-        logger.info("Creating database tables...")
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
-    else:
-        logger.info("Database tables already exist")
-
-def initialize_db():
-    """Initialize the database."""
-    create_tables()
+ALEMBIC_INI_PATH = Path(__file__).resolve().parents[3] / "alembic.ini"
+# Postgres advisory lock key held while migrating, so workers starting together upgrade one at a time
+MIGRATION_LOCK_KEY = 728_461_903
+
+
+def get_alembic_config() -> Config:
+    """Build the Alembic configuration for the backend migrations."""
+    config = Config(str(ALEMBIC_INI_PATH))
+    # Keep the application's logging configuration intact
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def upgrade_schema() -> None:
+    """Apply all pending migrations up to the latest revision.
+
+    On Postgres the upgrade holds a transaction-level advisory lock: other
+    workers wait for it and then find the schema already at head. SQLite
+    serializes the writes on its own database lock.
+    """
+    config = get_alembic_config()
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
+def current_revision() -> Optional[str]:
+    """Revision the database is stamped with, or None for an unmigrated database."""
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def head_revision() -> Optional[str]:
+    """Latest revision shipped with the code."""
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def initialize_db(migrate: bool = DB_MIGRATE_ON_STARTUP) -> bool:
+    """Bring the schema up to date (or just check it) once, at worker startup.
+
+    Databases created by the old ``create_all`` bootstrap are picked up by the
+    initial migration, which skips tables that already exist.
+
+    Args:
+        migrate: Apply pending migrations. When False the schema is only
+            compared against the latest revision.
+
+    Returns:
+        True if the database is at the latest revision.
+    """
+    if migrate:
+        upgrade_schema()
+    current, head = current_revision(), head_revision()
+    if current != head:
+        logger.warning(
+            f"Database schema is at revision {current}, expected {head}. "
+            "Run `alembic -c Backend/alembic.ini upgrade head` to migrate it."
+        )
+        return False
+    logger.info(f"Database schema is at revision {head}")
+    return True
+
+
+if __name__ == "__main__":
+    # Explicit migrate step for deployments that set DB_MIGRATE_ON_STARTUP=false
+    initialize_db(migrate=True)
@@ -1,6 +1,13 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
 import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from Backend.config.v1.constants import DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_SIZE, DB_POOL_TIMEOUT
 
 # Load database URL from environment variable with no default value containing credentials
 DATABASE_URL = os.getenv("DATABASE_URL", "")
@@ -9,26 +16,94 @@ DATABASE_URL = os.getenv("DATABASE_URL", "")
 if not DATABASE_URL:
     raise ValueError("Database connection information missing. Please set the DATABASE_URL environment variable.")
 
-# Create the database engine
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Async drivers used by the request path, keyed by backend name
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+# Drivers for URLs that name none; SQLAlchemy's own default for postgresql changes between releases
+SYNC_DRIVERS = {"postgresql": "psycopg2"}
+
+
+def _sync_url(url: str) -> URL:
+    """Pin the declared synchronous driver when the URL does not name one."""
+    parsed = make_url(url)
+    driver = SYNC_DRIVERS.get(parsed.drivername)
+    return parsed.set(drivername=f"{parsed.drivername}+{driver}") if driver else parsed
+
+
+def _async_url(url: str) -> URL:
+    """Swap the driver of a database URL for its asyncio counterpart."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}") if driver else parsed
+
+
+_pool_options: Dict[str, Any] = {}
+if make_url(DATABASE_URL).get_backend_name() != "sqlite":
+    _pool_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+# Synchronous engine, used only for schema setup and migrations at startup
+engine = create_engine(_sync_url(DATABASE_URL), pool_pre_ping=True)
+
+# Async engine serving all request-time queries
+async_engine = create_async_engine(_async_url(DATABASE_URL), pool_pre_ping=True, **_pool_options)
 
-# Create a session factory
-SessionFactory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Sessions are short-lived and never shared between requests. Objects stay usable
+# after commit, since refreshing them lazily would need a round trip the caller can't await.
+AsyncSessionFactory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
-# Scoped session to ensure thread safety
-SessionLocal = scoped_session(SessionFactory)
+_pool_stats = {"checkouts": 0, "peak_checked_out": 0}
+_pool_stats_lock = threading.Lock()
 
 
-def get_db_session():
-    """Dependency function to provide a database session."""
-    # Import here to avoid circular imports
-    from Backend.core.v1.db.init_db import initialize_db
-    
-    # Ensure tables exist before creating a session
-    initialize_db()
-    
-    db = SessionLocal()
-    try:
+@event.listens_for(async_engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    with _pool_stats_lock:
+        _pool_stats["checkouts"] += 1
+        checked_out = async_engine.pool.checkedout()
+        if checked_out > _pool_stats["peak_checked_out"]:
+            _pool_stats["peak_checked_out"] = checked_out
+
+
+if async_engine.dialect.name == "sqlite":
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        # SQLite leaves foreign keys off by default; chat_messages relies on ON DELETE CASCADE
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Provide a session for work outside a request, e.g. background tasks or streaming bodies."""
+    async with AsyncSessionFactory() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """Dependency function to provide a database session scoped to one request."""
+    async with session_scope() as db:
+        yield db
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Current connection pool usage for this worker."""
+    pool = async_engine.pool
+    metrics: Dict[str, Any] = {"pool": type(pool).__name__, **_pool_stats}
+    if hasattr(pool, "size") and _pool_options:
+        capacity = DB_POOL_SIZE + DB_MAX_OVERFLOW
+        metrics.update(
+            size=pool.size(),
+            max_overflow=DB_MAX_OVERFLOW,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            utilization=round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+        )
+    else:
+        metrics["checked_out"] = pool.checkedout() if hasattr(pool, "checkedout") else None
+    return metrics
@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """``timestamp without time zone`` column holding UTC.
+
+    The application produces timezone-aware datetimes (see ``get_utc_now``), but
+    asyncpg refuses to bind those to a naive timestamp column, so they are
+    converted to naive UTC on the way in.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
@@ -1,85 +1,335 @@
-from typing import Optional, TypeVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
 from Backend.core.v1.common.logger import get_logger
-from Backend.core.v1.db.session import get_db_session
-from Backend.core.v1.models.chat import ChatSessionModel
-from Backend.core.v1.types.chat import ChatSession, ChatMessage
+from Backend.core.v1.models.chat import ChatMessageModel, ChatSessionModel
+from Backend.core.v1.types.utils import get_utc_now
+from Backend.core.v1.types.chat import ChatSession, ChatMessage, ChatSessionSummary
 
 logger = get_logger(__name__)
 T = TypeVar("T")
 
-class ChatDBManager:
+class AsyncChatDBManager:
     """
     PostgreSQL-based Data Access Object for managing chat sessions and messages.
+
+    All queries run on an asyncio driver, so a request waiting on the database
+    does not block the event loop for other requests.
     """
-    def __init__(self, db_session: Session = None):
-        """Initialize the DAO with a database session."""
-        if db_session:
-            self.db_session = db_session
-        else:
-            # Get the actual session from the generator
-            self.db_session = next(get_db_session())
-    
-    def create(self, chat_session: ChatSession) -> ChatSession:
+    def __init__(self, db_session: AsyncSession):
+        """Initialize the DAO with a database session.
+
+        The session is owned by the caller (normally one per request, see
+        ``Backend.api.v1.dependencies.services``), which is responsible for closing it.
+        """
+        self.db_session = db_session
+
+    async def create(self, chat_session: ChatSession) -> ChatSession:
         """Create a new chat session."""
         try:
             db_chat_session = ChatSessionModel(
                 id=chat_session.id,
                 user_id=chat_session.user_id,
                 title=chat_session.title,
-                messages=[msg.model_dump() for msg in chat_session.messages],
+                message_count=len(chat_session.messages),
             )
+            chat_session.message_count = len(chat_session.messages)
             self.db_session.add(db_chat_session)
-            self.db_session.commit()
+            # Flush the session row first so the message foreign keys resolve
+            await self.db_session.flush()
+            self.db_session.add_all(self._message_rows(chat_session.id, 0, chat_session.messages))
+            await self.db_session.commit()
             return chat_session
         except SQLAlchemyError as e:
-            self.db_session.rollback()
+            await self.db_session.rollback()
             logger.error(f"Failed to create chat session: {e}")
             raise
-    
-    def get_session(self, user_id: str, session_id: str) -> Optional[ChatSession]:
-        """Retrieve a chat session by user_id and session_id."""
+
+    async def get_session(
+        self, user_id: str, session_id: str, limit: Optional[int] = None, before: Optional[int] = None
+    ) -> Optional[ChatSession]:
+        """Retrieve a chat session by user_id and session_id.
+
+        Args:
+            limit: If given, load only the latest ``limit`` messages (0 loads none).
+            before: If given, only load messages with a sequence number below it.
+        """
         try:
-            session = self.db_session.query(ChatSessionModel).filter_by(id=session_id, user_id=user_id).first()
+            session = await self.db_session.scalar(
+                select(ChatSessionModel).filter_by(id=session_id, user_id=user_id)
+            )
             if session:
+                rows = []
+                if limit != 0:
+                    query = select(ChatMessageModel).filter_by(session_id=session.id)
+                    if before is not None:
+                        query = query.where(ChatMessageModel.seq < before)
+                    # Walk the (session_id, seq) key backwards so only the requested page is read
+                    query = query.order_by(ChatMessageModel.seq.desc())
+                    if limit is not None:
+                        query = query.limit(limit)
+                    rows = list(reversed((await self.db_session.scalars(query)).all()))
                 return ChatSession(
                     id=session.id,
                     user_id=session.user_id,
+                    created_at=session.created_at,
+                    updated_at=session.updated_at,
                     title=session.title,
-                    messages=[ChatMessage(**msg) for msg in session.messages],
+                    message_count=session.message_count,
+                    messages=[
+                        ChatMessage(role=row.role, content=row.content, timestamp=row.timestamp)
+                        for row in rows
+                    ],
                 )
             return None
         except SQLAlchemyError as e:
             logger.error(f"Failed to get chat session: {e}")
             return None
-    
-    def update_session_messages(self, chat_session: ChatSession) -> Optional[ChatSession]:
-        """Update messages in an existing chat session."""
+
+    async def get_session_state(
+        self, user_id: str, session_id: str
+    ) -> Optional[Tuple[ChatSession, Optional[Dict[str, Any]]]]:
+        """Retrieve session metadata and the stored agent state in a single query.
+
+        Returns:
+            (session without messages, agent_state or None), or None if not found.
+        """
         try:
-            session = self.db_session.query(ChatSessionModel).filter_by(id=chat_session.id).first()
-            if session:
-                session.messages = [msg.model_dump() for msg in chat_session.messages]
-                self.db_session.commit()
-                return chat_session
+            result = await self.db_session.execute(
+                select(
+                    ChatSessionModel.id,
+                    ChatSessionModel.user_id,
+                    ChatSessionModel.title,
+                    ChatSessionModel.created_at,
+                    ChatSessionModel.updated_at,
+                    ChatSessionModel.message_count,
+                    ChatSessionModel.agent_state,
+                )
+                .filter_by(id=session_id, user_id=user_id)
+            )
+            row = result.first()
+            if row:
+                session = ChatSession(
+                    id=row.id,
+                    user_id=row.user_id,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                    title=row.title,
+                    message_count=row.message_count,
+                )
+                return session, row.agent_state
             return None
         except SQLAlchemyError as e:
-            self.db_session.rollback()
-            logger.error(f"Failed to update chat session messages: {e}")
+            logger.error(f"Failed to get chat session state: {e}")
             return None
-    
-    def delete(self, session_id: str) -> bool:
-        """Delete a chat session by its ID."""
+
+    async def update_agent_state(self, session_id: str, agent_state: Dict[str, Any], message_count: int) -> bool:
+        """Store agent state if no messages were appended since it was loaded.
+
+        Returns:
+            True if the state was written, False if the session moved on or the write failed.
+        """
         try:
-            session = self.db_session.query(ChatSessionModel).filter_by(id=session_id).first()
-            if session:
-                self.db_session.delete(session)
-                self.db_session.commit()
-                return True
+            result = await self.db_session.execute(
+                update(ChatSessionModel)
+                .where(
+                    ChatSessionModel.id == session_id,
+                    ChatSessionModel.message_count == message_count,
+                )
+                .values(agent_state=agent_state)
+            )
+            await self.db_session.commit()
+            return result.rowcount > 0
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            logger.error(f"Failed to update agent state: {e}")
             return False
+
+    async def list_sessions(
+        self, user_id: str, limit: int, after: Optional[Tuple[datetime, str]] = None
+    ) -> List[ChatSessionSummary]:
+        """List session metadata for a user, most recently updated first.
+
+        Uses keyset pagination on (updated_at, id): ``after`` is the position of
+        the last session of the previous page. Messages are never loaded.
+        """
+        try:
+            query = (
+                select(
+                    ChatSessionModel.id,
+                    ChatSessionModel.title,
+                    ChatSessionModel.updated_at,
+                    ChatSessionModel.message_count,
+                )
+                .where(ChatSessionModel.user_id == user_id)
+            )
+            if after:
+                query = query.where(
+                    tuple_(ChatSessionModel.updated_at, ChatSessionModel.id) < tuple_(*after)
+                )
+            result = await self.db_session.execute(
+                query.order_by(ChatSessionModel.updated_at.desc(), ChatSessionModel.id.desc())
+                .limit(limit)
+            )
+            return [
+                ChatSessionSummary(
+                    id=row.id,
+                    title=row.title,
+                    updated_at=row.updated_at,
+                    message_count=row.message_count,
+                )
+                for row in result
+            ]
         except SQLAlchemyError as e:
-            self.db_session.rollback()
+            logger.error(f"Failed to list chat sessions: {e}")
+            return []
+
+    async def append_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        messages: List[ChatMessage],
+        agent_state: Optional[Dict[str, Any]] = None,
+    ) -> Optional[ChatSession]:
+        """Append messages to a chat session owned by ``user_id``.
+
+        A single ownership-scoped ``UPDATE ... RETURNING`` reserves the sequence
+        numbers, bumps ``updated_at`` and stores ``agent_state`` if given. It also
+        holds the session row lock until commit, so concurrent turns cannot
+        collide. The messages then go in with one multi-row INSERT; earlier
+        messages are never read or rewritten.
+
+        Returns:
+            The session metadata (without messages) if it exists, otherwise None.
+        """
+        try:
+            row = await self._reserve_seqs(user_id, session_id, len(messages), agent_state)
+            if row:
+                if messages:
+                    start_seq = row.message_count - len(messages)
+                    await self.db_session.execute(
+                        insert(ChatMessageModel).values(self._message_values(row.id, start_seq, messages))
+                    )
+                await self.db_session.commit()
+                return ChatSession(
+                    id=row.id,
+                    user_id=row.user_id,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                    title=row.title,
+                    message_count=row.message_count,
+                )
+            await self.db_session.rollback()
+            return None
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            logger.error(f"Failed to append chat session messages: {e}")
+            return None
+
+    async def append_batch(
+        self, appends: List[Tuple[str, str, List[ChatMessage], Optional[Dict[str, Any]]]]
+    ) -> List[str]:
+        """Append messages to many sessions in one transaction.
+
+        ``appends`` holds (user_id, session_id, messages, agent_state) entries,
+        at most one per session. Each session gets its sequence numbers from one
+        ``UPDATE ... RETURNING`` as in ``append_messages``. All messages are then
+        written with a single multi-row INSERT and one commit. Entries whose
+        session no longer exists (or is not owned by the user) are skipped.
+
+        Returns:
+            IDs of the sessions that were written.
+
+        Raises:
+            SQLAlchemyError: If the batch could not be written; nothing is stored.
+        """
+        try:
+            written: List[str] = []
+            rows: List[Dict[str, Any]] = []
+            for user_id, session_id, messages, agent_state in appends:
+                row = await self._reserve_seqs(user_id, session_id, len(messages), agent_state)
+                if row:
+                    written.append(row.id)
+                    rows.extend(self._message_values(row.id, row.message_count - len(messages), messages))
+            if rows:
+                await self.db_session.execute(insert(ChatMessageModel).values(rows))
+            await self.db_session.commit()
+            return written
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            logger.error(f"Failed to append chat message batch: {e}")
+            raise
+
+    async def _reserve_seqs(
+        self, user_id: str, session_id: str, count: int, agent_state: Optional[Dict[str, Any]]
+    ) -> Optional[Row]:
+        """Reserve ``count`` sequence numbers on a session owned by ``user_id``.
+
+        One ownership-scoped ``UPDATE ... RETURNING`` statement; the returned
+        row's message_count is the end of the reserved range, or None if no
+        session matched.
+        """
+        values: Dict[str, Any] = {
+            "message_count": ChatSessionModel.message_count + count,
+            "updated_at": get_utc_now(),
+        }
+        if agent_state is not None:
+            values["agent_state"] = agent_state
+        result = await self.db_session.execute(
+            update(ChatSessionModel)
+            .where(ChatSessionModel.id == session_id, ChatSessionModel.user_id == user_id)
+            .values(**values)
+            .returning(
+                ChatSessionModel.id,
+                ChatSessionModel.user_id,
+                ChatSessionModel.created_at,
+                ChatSessionModel.updated_at,
+                ChatSessionModel.title,
+                ChatSessionModel.message_count,
+            )
+        )
+        return result.first()
+
+    def _message_rows(self, session_id: str, start_seq: int, messages: List[ChatMessage]) -> List[ChatMessageModel]:
+        """Build chat_messages rows numbered from start_seq."""
+        return [ChatMessageModel(**values) for values in self._message_values(session_id, start_seq, messages)]
+
+    def _message_values(self, session_id: str, start_seq: int, messages: List[ChatMessage]) -> List[Dict[str, Any]]:
+        """Build chat_messages column values numbered from start_seq."""
+        return [
+            {
+                "session_id": session_id,
+                "seq": start_seq + offset,
+                "role": msg.role,
+                "content": msg.content,
+                "timestamp": msg.timestamp,
+            }
+            for offset, msg in enumerate(messages)
+        ]
+
+    async def delete(self, user_id: str, session_id: str) -> bool:
+        """Delete a chat session owned by ``user_id`` in a single statement.
+
+        Nothing is loaded first; its messages go with it through the
+        ``ON DELETE CASCADE`` foreign key.
+
+        Returns:
+            True if a session was deleted, False if none matched the id and user.
+        """
+        try:
+            result = await self.db_session.execute(
+                delete(ChatSessionModel)
+                .where(ChatSessionModel.id == session_id, ChatSessionModel.user_id == user_id)
+                .returning(ChatSessionModel.id)
+            )
+            deleted = result.first() is not None
+            await self.db_session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
             logger.error(f"Failed to delete chat session: {e}")
-            return False
+            raise
@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from Backend.core.v1.common.logger import get_logger
+from Backend.core.v1.models.document import DocumentJobModel
+
+logger = get_logger(__name__)
+
+_FINISHED = ("succeeded", "failed")
+
+
+class AsyncDocumentJobDBManager:
+    """
+    Data Access Object for document-processing job state.
+
+    Jobs are passed as column values (see ``DocumentJobModel``) so the job
+    queue keeps its own in-memory representation.
+    """
+    def __init__(self, db_session: AsyncSession):
+        """Initialize the DAO with a database session owned by the caller."""
+        self.db_session = db_session
+
+    async def create(self, values: Dict[str, Any]) -> None:
+        """Insert a new job."""
+        try:
+            await self.db_session.execute(insert(DocumentJobModel).values(**values))
+            await self.db_session.commit()
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            logger.error(f"Failed to create document job: {e}")
+            raise
+
+    async def update(self, job_id: str, values: Dict[str, Any]) -> None:
+        """Store new values (status, result, timings) for a job."""
+        try:
+            await self.db_session.execute(
+                update(DocumentJobModel).where(DocumentJobModel.id == job_id).values(**values)
+            )
+            await self.db_session.commit()
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            logger.error(f"Failed to update document job: {e}")
+            raise
+
+    async def get(self, user_id: str, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the column values of a job owned by ``user_id``, or None if there is none."""
+        try:
+            result = await self.db_session.execute(
+                select(DocumentJobModel.__table__).filter_by(id=job_id, user_id=user_id)
+            )
+            row = result.first()
+            return row._asdict() if row else None
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get document job: {e}")
+            raise
+
+    async def delete_expired(self, cutoff: datetime) -> int:
+        """Delete jobs that finished before ``cutoff``, or were created before it and never finished.
+
+        Returns:
+            Number of jobs deleted.
+        """
+        try:
+            result = await self.db_session.execute(
+                delete(DocumentJobModel).where(
+                    or_(
+                        and_(DocumentJobModel.status.in_(_FINISHED), DocumentJobModel.finished_at < cutoff),
+                        # Left behind by a worker that stopped without finishing the job
+                        and_(DocumentJobModel.status.not_in(_FINISHED), DocumentJobModel.created_at < cutoff),
+                    )
+                )
+            )
+            await self.db_session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.db_session.rollback()
+            logger.error(f"Failed to delete expired document jobs: {e}")
+            raise
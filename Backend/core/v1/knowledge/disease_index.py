@@ -0,0 +1,281 @@
+# This file contains the offline disease knowledge index used in place of live Wikipedia lookups.
+"""Precomputed disease summaries stored in a compact SQLite file.
+
+Build the index ahead of deployment (requires network access)::
+
+    python -m Backend.core.v1.knowledge.disease_index build
+    python -m Backend.core.v1.knowledge.disease_index build --conditions my_conditions.txt
+
+A conditions file holds one condition per line, optionally followed by
+``|``-separated aliases, e.g. ``Hypertension|high blood pressure``.
+"""
+import argparse
+import difflib
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from Backend.config.v1.constants import DISEASE_INDEX_MATCH_CUTOFF, DISEASE_INDEX_PATH
+from Backend.core.v1.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Conditions most often produced by the symptom analyzer, with common lay aliases
+CURATED_CONDITIONS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Hypertension", ("high blood pressure",)),
+    ("Hypotension", ("low blood pressure",)),
+    ("Type 2 diabetes", ("diabetes", "diabetes mellitus", "type ii diabetes")),
+    ("Type 1 diabetes", ("type i diabetes", "juvenile diabetes")),
+    ("Hypoglycemia", ("low blood sugar",)),
+    ("Hypercholesterolemia", ("high cholesterol",)),
+    ("Coronary artery disease", ("coronary heart disease", "ischemic heart disease")),
+    ("Heart failure", ("congestive heart failure",)),
+    ("Atrial fibrillation", ("afib",)),
+    ("Myocardial infarction", ("heart attack",)),
+    ("Stroke", ("cerebrovascular accident",)),
+    ("Anemia", ("anaemia", "iron deficiency anemia")),
+    ("Asthma", ()),
+    ("Chronic obstructive pulmonary disease", ("copd",)),
+    ("Pneumonia", ()),
+    ("Bronchitis", ("acute bronchitis",)),
+    ("Common cold", ("cold", "upper respiratory tract infection")),
+    ("Influenza", ("flu",)),
+    ("COVID-19", ("covid", "coronavirus disease 2019")),
+    ("Sinusitis", ("sinus infection",)),
+    ("Allergic rhinitis", ("hay fever", "seasonal allergies")),
+    ("Pharyngitis", ("sore throat", "strep throat")),
+    ("Tonsillitis", ()),
+    ("Otitis media", ("ear infection",)),
+    ("Conjunctivitis", ("pink eye",)),
+    ("Tuberculosis", ("tb",)),
+    ("Migraine", ()),
+    ("Tension headache", ("tension-type headache",)),
+    ("Epilepsy", ("seizure disorder",)),
+    ("Meningitis", ()),
+    ("Gastroenteritis", ("stomach flu",)),
+    ("Gastroesophageal reflux disease", ("gerd", "acid reflux")),
+    ("Peptic ulcer disease", ("stomach ulcer", "peptic ulcer")),
+    ("Gastritis", ()),
+    ("Irritable bowel syndrome", ("ibs",)),
+    ("Inflammatory bowel disease", ("ibd",)),
+    ("Crohn's disease", ("crohn disease",)),
+    ("Ulcerative colitis", ()),
+    ("Celiac disease", ("coeliac disease",)),
+    ("Lactose intolerance", ()),
+    ("Constipation", ()),
+    ("Hemorrhoids", ("haemorrhoids", "piles")),
+    ("Anal fissure", ()),
+    ("Colorectal cancer", ("colon cancer", "bowel cancer")),
+    ("Appendicitis", ()),
+    ("Gallstones", ("cholelithiasis",)),
+    ("Hepatitis", ()),
+    ("Fatty liver disease", ("non-alcoholic fatty liver disease", "nafld")),
+    ("Cirrhosis", ("liver cirrhosis",)),
+    ("Pancreatitis", ()),
+    ("Chronic kidney disease", ("ckd", "chronic renal failure")),
+    ("Kidney stone disease", ("kidney stones", "nephrolithiasis")),
+    ("Urinary tract infection", ("uti", "bladder infection")),
+    ("Gout", ()),
+    ("Osteoarthritis", ()),
+    ("Rheumatoid arthritis", ()),
+    ("Osteoporosis", ()),
+    ("Low back pain", ("back pain",)),
+    ("Hypothyroidism", ("underactive thyroid",)),
+    ("Hyperthyroidism", ("overactive thyroid",)),
+    ("Polycystic ovary syndrome", ("pcos",)),
+    ("Obesity", ()),
+    ("Malnutrition", ()),
+    ("Vitamin D deficiency", ()),
+    ("Dehydration", ()),
+    ("Depression", ("major depressive disorder", "clinical depression")),
+    ("Anxiety disorder", ("anxiety", "generalized anxiety disorder")),
+    ("Insomnia", ()),
+    ("Chronic fatigue syndrome", ()),
+    ("Eczema", ("atopic dermatitis",)),
+    ("Psoriasis", ()),
+    ("Acne", ("acne vulgaris",)),
+    ("Urticaria", ("hives",)),
+    ("Dengue fever", ("dengue",)),
+    ("Malaria", ()),
+    ("Typhoid fever", ("typhoid",)),
+    ("Chickenpox", ("varicella",)),
+    ("Measles", ()),
+    ("Food allergy", ()),
+    ("Food poisoning", ("foodborne illness",)),
+)
+
+
+def normalize_condition_name(name: str) -> str:
+    """Lowercase a condition name and strip punctuation and extra whitespace."""
+    name = re.sub(r"[^a-z0-9\s]", " ", name.lower())
+    return re.sub(r"\s+", " ", name).strip()
+
+
+class DiseaseIndex:
+    """Read-only view over a built disease index.
+
+    Aliases are held in memory for exact and fuzzy matching; summaries stay on
+    disk and are read on demand.
+    """
+
+    def __init__(self, path: str, match_cutoff: float = DISEASE_INDEX_MATCH_CUTOFF):
+        self.path = path
+        self.match_cutoff = match_cutoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._aliases: Dict[str, int] = dict(self._conn.execute("SELECT alias, condition_id FROM aliases"))
+        self._alias_keys: List[str] = list(self._aliases)
+
+    def __len__(self) -> int:
+        return len(set(self._aliases.values()))
+
+    def match(self, name: str) -> Optional[int]:
+        """Resolve a condition name to its index id by exact or fuzzy alias match."""
+        key = normalize_condition_name(name)
+        if not key:
+            return None
+        if key in self._aliases:
+            return self._aliases[key]
+        close = difflib.get_close_matches(key, self._alias_keys, n=1, cutoff=self.match_cutoff)
+        return self._aliases[close[0]] if close else None
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Return the stored summary for ``name``, or None if it is not indexed."""
+        condition_id = self.match(name)
+        if condition_id is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM conditions WHERE id = ?", (condition_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_index: Optional[DiseaseIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def get_disease_index() -> Optional[DiseaseIndex]:
+    """Return the process-wide disease index, or None if no index has been built."""
+    global _index, _index_loaded
+    if _index_loaded:
+        return _index
+    with _index_lock:
+        if not _index_loaded:
+            if os.path.exists(DISEASE_INDEX_PATH):
+                try:
+                    _index = DiseaseIndex(DISEASE_INDEX_PATH)
+                    logger.info(f"Loaded disease index with {len(_index)} conditions from {DISEASE_INDEX_PATH}")
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to open disease index {DISEASE_INDEX_PATH}: {str(e)}")
+            else:
+                logger.warning(f"Disease index not found at {DISEASE_INDEX_PATH}; using live lookups only")
+            _index_loaded = True
+    return _index
+
+
+def _fetch_wikipedia_summary(name: str) -> str:
+    import wikipedia
+
+    return wikipedia.summary(name, sentences=3)
+
+
+def build_index(
+    path: str,
+    conditions: Iterable[Tuple[str, Sequence[str]]] = CURATED_CONDITIONS,
+    fetch: Callable[[str], str] = _fetch_wikipedia_summary,
+) -> int:
+    """Snapshot summaries for ``conditions`` into a fresh index at ``path``.
+
+    The index is written to a temporary file and swapped in atomically, so a
+    running service never observes a partial index.
+
+    Args:
+        path: Destination of the SQLite index file.
+        conditions: ``(name, aliases)`` pairs to snapshot.
+        fetch: Function returning the summary text for a condition name.
+
+    Returns:
+        int: Number of conditions written. Conditions whose fetch fails are skipped.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    written = 0
+    try:
+        conn.execute(
+            "CREATE TABLE conditions (id INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+            "summary TEXT NOT NULL, fetched_at TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE aliases (alias TEXT PRIMARY KEY, condition_id INTEGER NOT NULL "
+            "REFERENCES conditions(id))"
+        )
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        for name, aliases in conditions:
+            try:
+                summary = fetch(name)
+            except Exception as e:
+                logger.warning(f"Skipping {name}: {str(e)}")
+                continue
+            condition_id = conn.execute(
+                "INSERT INTO conditions (name, summary, fetched_at) VALUES (?, ?, ?)",
+                (name, summary, fetched_at),
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO aliases (alias, condition_id) VALUES (?, ?)",
+                [(normalize_condition_name(a), condition_id) for a in (name, *aliases)],
+            )
+            written += 1
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote {written} conditions to {path}")
+    return written
+
+
+def _read_conditions_file(path: str) -> List[Tuple[str, Tuple[str, ...]]]:
+    conditions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = [p.strip() for p in line.split("|") if p.strip()]
+            if parts and not parts[0].startswith("#"):
+                conditions.append((parts[0], tuple(parts[1:])))
+    return conditions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the offline disease knowledge index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Snapshot condition summaries into the index")
+    build.add_argument("--output", default=DISEASE_INDEX_PATH, help="Index file to write")
+    build.add_argument("--conditions", help="Conditions file (name|alias|... per line); defaults to the curated list")
+
+    lookup = subparsers.add_parser("lookup", help="Look up a condition in an existing index")
+    lookup.add_argument("name")
+    lookup.add_argument("--index", default=DISEASE_INDEX_PATH, help="Index file to read")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        conditions = _read_conditions_file(args.conditions) if args.conditions else CURATED_CONDITIONS
+        build_index(args.output, conditions)
+    else:
+        summary = DiseaseIndex(args.index).lookup(args.name)
+        print(summary if summary is not None else f"No indexed condition matches {args.name!r}")
+
+
+if __name__ == "__main__":
+    main()
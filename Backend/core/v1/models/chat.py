@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Index, JSON
 from Backend.core.v1.db.base import Base
+from Backend.core.v1.db.types import UTCDateTime
 from Backend.core.v1.types.utils import generate_uuid, get_utc_now
 
 class ChatSessionModel(Base):
@@ -7,13 +8,40 @@ class ChatSessionModel(Base):
     SQLAlchemy model for storing chat sessions in the database.
     """
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        # Serves the per-user session listing ordered by updated_at (keyset pagination)
+        Index("ix_chat_sessions_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, nullable=False, index=True)
+    user_id = Column(String, nullable=False)
     title = Column(String, nullable=False)
-    created_at = Column(DateTime, default=get_utc_now, nullable=False)
-    updated_at = Column(DateTime, default=get_utc_now, nullable=False, onupdate=get_utc_now)
-    messages = Column(JSON, default=list)
+    created_at = Column(UTCDateTime, default=get_utc_now, nullable=False)
+    updated_at = Column(UTCDateTime, default=get_utc_now, nullable=False, onupdate=get_utc_now)
+    # Number of rows in chat_messages for this session; also the next message sequence number
+    message_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Compact agent working state (recent turns, rolling summary, counters); see ConversationState.to_compact
+    agent_state = Column(JSON, nullable=True)
 
     def __repr__(self):
         return f"<ChatSessionModel(id={self.id}, user_id={self.user_id}, title={self.title})>"
+
+
+class ChatMessageModel(Base):
+    """
+    SQLAlchemy model for storing individual chat messages in the database.
+
+    Messages are append-only; the (session_id, seq) primary key keeps them ordered per session.
+    """
+    __tablename__ = "chat_messages"
+
+    session_id = Column(
+        String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    role = Column(String, nullable=False)
+    content = Column(Text, nullable=True)
+    timestamp = Column(UTCDateTime, default=get_utc_now, nullable=False)
+
+    def __repr__(self):
+        return f"<ChatMessageModel(session_id={self.session_id}, seq={self.seq}, role={self.role})>"
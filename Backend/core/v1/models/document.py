@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Text, JSON
+from Backend.core.v1.db.base import Base
+from Backend.core.v1.db.types import UTCDateTime
+from Backend.core.v1.types.utils import get_utc_now
+
+class DocumentJobModel(Base):
+    """
+    SQLAlchemy model for document-processing job state.
+
+    Shared by all API workers, so a job can be polled from any worker, not only the one running it.
+    """
+    __tablename__ = "document_jobs"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    filename = Column(String, nullable=False)
+    # queued, running, succeeded or failed
+    status = Column(String, nullable=False)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    # Per-page extraction method and timing, see ocr_agent.process_document
+    page_stats = Column(JSON, nullable=True)
+    created_at = Column(UTCDateTime, default=get_utc_now, nullable=False)
+    started_at = Column(UTCDateTime, nullable=True)
+    finished_at = Column(UTCDateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<DocumentJobModel(id={self.id}, user_id={self.user_id}, status={self.status})>"
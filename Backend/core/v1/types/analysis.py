@@ -0,0 +1,138 @@
+import re
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator
+
+# Placeholder answers the model sometimes returns instead of a condition name
+_NON_CONDITIONS = {"okay", "normal", "unknown", "healthy", "none", "n/a"}
+
+
+def _clean_items(items: List[str]) -> List[str]:
+    cleaned = []
+    for item in items:
+        item = " ".join(str(item).split()).strip(" .,-•*")
+        if item and item.lower() not in (c.lower() for c in cleaned):
+            cleaned.append(item)
+    return cleaned
+
+
+class ConditionInfo(BaseModel):
+    """Patient-facing overview of a single condition."""
+
+    main_symptoms: List[str] = Field(..., description="Main symptoms of the condition")
+    common_treatments: List[str] = Field(..., description="Common treatments")
+    prevention_tips: List[str] = Field(..., description="Prevention tips")
+    when_to_see_doctor: List[str] = Field(..., description="Signs that warrant seeing a doctor")
+
+    @field_validator("main_symptoms", "common_treatments", "prevention_tips", "when_to_see_doctor")
+    @classmethod
+    def clean_lists(cls, value: List[str]) -> List[str]:
+        return _clean_items(value)
+
+    def render(self) -> str:
+        """Render as the numbered plain-text overview shown in chat."""
+        sections = [
+            ("Main Symptoms", self.main_symptoms),
+            ("Common Treatments", self.common_treatments),
+            ("Prevention Tips", self.prevention_tips),
+            ("When to See a Doctor", self.when_to_see_doctor),
+        ]
+        return "\n\n".join(
+            f"{number}. {title}\n" + "\n".join(f"- {item}" for item in items)
+            for number, (title, items) in enumerate(sections, start=1)
+            if items
+        )
+
+
+class RankedCondition(BaseModel):
+    """A candidate condition with the model's relative likelihood."""
+
+    name: str = Field(..., description="Standard medical term for the condition")
+    likelihood: float = Field(..., description="Relative likelihood from 0 to 1")
+
+    @field_validator("likelihood")
+    @classmethod
+    def clamp_likelihood(cls, value: float) -> float:
+        return min(1.0, max(0.0, value))
+
+
+class SymptomAnalysis(BaseModel):
+    """Structured result of one symptom-analysis model call.
+
+    Also used as the ``response_schema`` for Gemini's JSON mode, so fields stay
+    required and free of constraints the schema converter cannot express.
+    """
+
+    cleaned_symptoms: List[str] = Field(..., description="Medical symptoms only, in clinical terms")
+    conditions: List[RankedCondition] = Field(
+        ..., description="Up to 3 most likely medical conditions, most likely first"
+    )
+    primary_condition_info: ConditionInfo = Field(
+        ..., description="Overview of the most likely condition"
+    )
+
+    @field_validator("cleaned_symptoms")
+    @classmethod
+    def clean_symptoms(cls, value: List[str]) -> List[str]:
+        return _clean_items(value)
+
+    @field_validator("conditions")
+    @classmethod
+    def rank_conditions(cls, value: List[RankedCondition]) -> List[RankedCondition]:
+        seen = set()
+        ranked = []
+        for condition in sorted(value, key=lambda c: c.likelihood, reverse=True):
+            name = " ".join(condition.name.split()).strip(" .,-•*")
+            if name and name.lower() not in _NON_CONDITIONS and name.lower() not in seen:
+                seen.add(name.lower())
+                ranked.append(RankedCondition(name=name, likelihood=condition.likelihood))
+        if not ranked:
+            raise ValueError("No valid conditions identified")
+        return ranked[:3]
+
+    @property
+    def primary_condition(self) -> str:
+        return self.conditions[0].name
+
+
+def _clean_consideration(item: str) -> str:
+    item = re.sub(r"^(\d+[.)]?|•|-|\*)\s*", "", " ".join(str(item).split())).strip()
+    if not item:
+        return item
+    item = item[0].upper() + item[1:]
+    return item if item.endswith((".", "!", "?")) else item + "."
+
+
+class MealPlan(BaseModel):
+    """A one-day sample meal plan."""
+
+    breakfast: str = Field(..., description="Breakfast suggestion")
+    lunch: str = Field(..., description="Lunch suggestion")
+    dinner: str = Field(..., description="Dinner suggestion")
+
+
+class DietaryAdvice(BaseModel):
+    """Dietary recommendations for a condition, as plain items without formatting."""
+
+    recommended_foods: List[str] = Field(..., description="Up to 6 foods to favour")
+    avoid_foods: List[str] = Field(..., description="Up to 6 foods to avoid")
+    meal_plan: MealPlan = Field(..., description="Sample meal plan for one day")
+    considerations: List[str] = Field(..., description="Up to 5 special dietary considerations")
+
+    @field_validator("recommended_foods", "avoid_foods")
+    @classmethod
+    def clean_foods(cls, value: List[str]) -> List[str]:
+        foods = _clean_items(value)[:6]
+        if not foods:
+            raise ValueError("At least one food is required")
+        return foods
+
+    @field_validator("considerations")
+    @classmethod
+    def clean_considerations(cls, value: List[str]) -> List[str]:
+        considerations = []
+        for item in value:
+            item = _clean_consideration(item)
+            if item and item not in considerations:
+                considerations.append(item)
+        return considerations[:5]
@@ -35,6 +35,9 @@ class ChatSession(BaseModel):
     updated_at: datetime = Field(default_factory=get_utc_now)
     title: str
     messages: List[ChatMessage] = Field(default_factory=list)
+    message_count: int = Field(
+        0, description="Total number of messages stored in the session"
+    )
 
     def add_message(self, message: ChatMessage) -> None:
         """Add a new message to the chat session and update the timestamp."""
@@ -42,5 +45,18 @@ class ChatSession(BaseModel):
         self.updated_at = get_utc_now()
 
     @field_serializer("created_at", "updated_at")
+    def serialize_datetime(self, dt: datetime) -> str:
+        return dt.isoformat()
+
+
+class ChatSessionSummary(BaseModel):
+    """Lightweight chat session metadata used for listings, without messages."""
+
+    id: str = Field(..., description="Unique identifier for the chat session")
+    title: str
+    updated_at: datetime
+    message_count: int = Field(0, description="Number of messages in the session")
+
+    @field_serializer("updated_at")
     def serialize_datetime(self, dt: datetime) -> str:
         return dt.isoformat()
\ No newline at end of file
@@ -1,3 +1,5 @@
+# Start the cold-start clock before any other application import
+from Backend.core.v1.common.startup import startup_report
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -7,11 +9,30 @@ from Backend.core.v1.utils.env_config import load_environment
 load_environment()
 
 # FastAPI App 
-from fastapi import FastAPI 
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from Backend.api.v1.routes.chat import router as chat_router
+from Backend.api.v1.routes.metrics import router as metrics_router
+from Backend.services.v1.container import ServiceContainer
 
-app = FastAPI()
+startup_report.mark("imports")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build agents and model clients once per worker
+    with startup_report.phase("service_container"):
+        app.state.container = ServiceContainer()
+    startup_report.log()
+    try:
+        yield
+    finally:
+        await app.state.container.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add Middlewares 
 app.add_middleware(
@@ -24,12 +45,21 @@ app.add_middleware(
 
 # Add Routes 
 app.include_router(chat_router, prefix="/api/v1/chat", tags=["chat"])
+app.include_router(metrics_router, prefix="/api/v1/metrics", tags=["metrics"])
 
 # Root Route 
 @app.get("/")
 def read_root():
     return {"status": "OK"}
 
+# Readiness Route; answered from a flag set at startup, without touching the database
+@app.get("/health/ready")
+def read_ready(request: Request):
+    container = getattr(request.app.state, "container", None)
+    if container is None or not container.schema_ready:
+        return JSONResponse(status_code=503, content={"status": "not ready"})
+    return {"status": "ready"}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("Backend.main:app", host="0.0.0.0", port=8000)
@@ -0,0 +1,40 @@
+"""Initial chat_sessions table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by the old create_all() bootstrap already have this table
+    if sa.inspect(op.get_bind()).has_table("chat_sessions"):
+        return
+
+    op.create_table(
+        "chat_sessions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("messages", sa.JSON(), nullable=True),
+    )
+    op.create_index("ix_chat_sessions_user_id", "chat_sessions", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_sessions_user_id", table_name="chat_sessions")
+    op.drop_table("chat_sessions")
@@ -0,0 +1,147 @@
+"""Move chat messages into an append-only chat_messages table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+import json
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+chat_sessions = sa.table(
+    "chat_sessions",
+    sa.column("id", sa.String),
+    sa.column("created_at", sa.DateTime),
+    sa.column("messages", sa.JSON),
+    sa.column("message_count", sa.Integer),
+)
+
+chat_messages = sa.table(
+    "chat_messages",
+    sa.column("session_id", sa.String),
+    sa.column("seq", sa.Integer),
+    sa.column("role", sa.String),
+    sa.column("content", sa.Text),
+    sa.column("timestamp", sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_messages",
+        sa.Column(
+            "session_id",
+            sa.String(),
+            sa.ForeignKey("chat_sessions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("seq", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+    )
+    op.add_column(
+        "chat_sessions",
+        sa.Column("message_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        _backfill_postgresql()
+    else:
+        _backfill_generic(bind)
+
+    op.drop_column("chat_sessions", "messages")
+
+
+def _backfill_postgresql() -> None:
+    """Explode every session's JSON array into rows in a single pass on the server."""
+    op.execute(
+        """
+        INSERT INTO chat_messages (session_id, seq, role, content, timestamp)
+        SELECT s.id,
+               m.ordinality - 1,
+               m.value ->> 'role',
+               m.value ->> 'content',
+               COALESCE((m.value ->> 'timestamp')::timestamp, s.created_at)
+        FROM chat_sessions s
+        CROSS JOIN LATERAL json_array_elements(COALESCE(s.messages::json, '[]'::json))
+            WITH ORDINALITY AS m(value, ordinality)
+        """
+    )
+    op.execute(
+        """
+        UPDATE chat_sessions
+        SET message_count = json_array_length(COALESCE(messages::json, '[]'::json))
+        """
+    )
+
+
+def _backfill_generic(bind) -> None:
+    """Portable row-by-row backfill for non-PostgreSQL databases."""
+    result = bind.execute(sa.select(chat_sessions.c.id, chat_sessions.c.created_at, chat_sessions.c.messages))
+    rows = []
+    for session_id, created_at, messages in result.fetchall():
+        if isinstance(messages, str):
+            messages = json.loads(messages)
+        messages = messages or []
+        for seq, msg in enumerate(messages):
+            timestamp = msg.get("timestamp")
+            rows.append({
+                "session_id": session_id,
+                "seq": seq,
+                "role": msg.get("role"),
+                "content": msg.get("content"),
+                "timestamp": datetime.fromisoformat(timestamp) if timestamp else created_at,
+            })
+        bind.execute(
+            chat_sessions.update()
+            .where(chat_sessions.c.id == session_id)
+            .values(message_count=len(messages))
+        )
+        if len(rows) >= BATCH_SIZE:
+            bind.execute(chat_messages.insert(), rows)
+            rows = []
+    if rows:
+        bind.execute(chat_messages.insert(), rows)
+
+
+def downgrade() -> None:
+    op.add_column("chat_sessions", sa.Column("messages", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    result = bind.execute(
+        sa.select(
+            chat_messages.c.session_id,
+            chat_messages.c.role,
+            chat_messages.c.content,
+            chat_messages.c.timestamp,
+        ).order_by(chat_messages.c.session_id, chat_messages.c.seq)
+    )
+    grouped = {}
+    for session_id, role, content, timestamp in result.fetchall():
+        grouped.setdefault(session_id, []).append(
+            {"role": role, "content": content, "timestamp": timestamp.isoformat()}
+        )
+    for session_id, messages in grouped.items():
+        bind.execute(
+            chat_sessions.update()
+            .where(chat_sessions.c.id == session_id)
+            .values(messages=messages)
+        )
+
+    op.drop_column("chat_sessions", "message_count")
+    op.drop_table("chat_messages")
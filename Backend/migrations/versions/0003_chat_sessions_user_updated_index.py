@@ -0,0 +1,33 @@
+"""Composite (user_id, updated_at) index for session listing
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_chat_sessions_user_id_updated_at", "chat_sessions", ["user_id", "updated_at"]
+    )
+    # The composite index covers lookups by user_id alone
+    existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("chat_sessions")}
+    if "ix_chat_sessions_user_id" in existing:
+        op.drop_index("ix_chat_sessions_user_id", table_name="chat_sessions")
+
+
+def downgrade() -> None:
+    op.create_index("ix_chat_sessions_user_id", "chat_sessions", ["user_id"])
+    op.drop_index("ix_chat_sessions_user_id_updated_at", table_name="chat_sessions")
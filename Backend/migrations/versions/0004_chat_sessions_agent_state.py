@@ -0,0 +1,27 @@
+"""Store compact agent state on chat_sessions
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing sessions; the service rebuilds it from recent messages on first use
+    op.add_column("chat_sessions", sa.Column("agent_state", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("chat_sessions", "agent_state")
@@ -1,31 +1,86 @@
 # this file contains the ChatService class which is responsible for handling chat interactions and managing chat sessions using PostgreSQL.
-from Backend.api.v1.schema.chat.response import ChatResponse
+import base64
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Optional, Tuple, Union
+
+from Backend.api.v1.schema.chat.response import ChatHistoryPage, ChatResponse, ChatSessionList, ChatStreamChunk
 from Backend.config.v1.constants import CHAT_DEFAULT_TITLE
 from Backend.core.v1.agents.chat_bot_agent import HealthcareChatAgent
-from Backend.core.v1.common.exceptions import NotFoundOrAccessException, AgentProcessingException
+from Backend.core.v1.agents.conversation import ConversationState
+from Backend.core.v1.common.exceptions import (
+    AgentProcessingException,
+    DatabaseOperationException,
+    InvalidCursorException,
+    NotFoundOrAccessException,
+)
 from Backend.core.v1.common.logger import get_logger
-from Backend.core.v1.db_manager.postgresql.chat_db_manager import ChatDBManager
+from Backend.core.v1.db_manager.postgresql.chat_db_manager import AsyncChatDBManager
 from Backend.core.v1.types.chat import ChatMessage, ChatSession
-from Backend.core.v1.db.init_db import initialize_db
+from Backend.core.v1.db.session import session_scope
+from Backend.services.v1.chat.turn_writer import ChatTurnWriter
 
 logger = get_logger(__name__)
 
 
+def _encode_session_cursor(updated_at: datetime, session_id: str) -> str:
+    """Encode a session's (updated_at, id) keyset position as an opaque cursor."""
+    payload = json.dumps({"updated_at": updated_at.isoformat(), "id": session_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_session_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by _encode_session_cursor."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["updated_at"]), payload["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorException(f"Invalid session cursor: {str(e)}")
+
+
 class ChatService:
     """Service for handling chat interactions and managing chat sessions using PostgreSQL."""
 
-    def __init__(self, chat_db_manager: ChatDBManager = None):
+    def __init__(
+        self,
+        chat_db_manager: AsyncChatDBManager,
+        agent: HealthcareChatAgent = None,
+        turn_writer: Optional[ChatTurnWriter] = None,
+    ):
         """Initialize the ChatService.
 
+        A service is built per request around that request's database session
+        (see ``get_chat_service``); the agent is shared across requests, so it
+        must not hold any per-conversation state.
+
         Args:
-            chat_dao: Data access object for chat persistence.
+            chat_db_manager: Data access object bound to the request's session.
+            agent: Shared healthcare agent used to answer messages.
+            turn_writer: Shared write-behind queue; if given, turns are queued
+                instead of committed before the response is returned.
         """
-        # Initialize database tables before creating the chat manager
-        initialize_db()
-        
-        self.chat_db_manager = chat_db_manager or ChatDBManager()
-        self.agent = HealthcareChatAgent()
-        logger.info("ChatService initialized with database manager and agent")
+        self.chat_db_manager = chat_db_manager
+        self.agent = agent or HealthcareChatAgent()
+        self.turn_writer = turn_writer
+
+    @asynccontextmanager
+    async def _detached_db_manager(self) -> AsyncIterator[AsyncChatDBManager]:
+        """Data access object with its own short-lived session.
+
+        Everything around a model call goes through one of these: the turn is
+        loaded and persisted in separate short sessions, so no connection is
+        held (idle in a transaction) while the agent waits on Gemini. It also
+        serves writes made after the request's session has been closed, such as
+        the end of a streamed response and background summary refreshes.
+        """
+        async with session_scope() as db:
+            yield AsyncChatDBManager(db)
+
+    async def _flush_pending(self, session_id: str) -> None:
+        """Write queued turns of a session before reading it (write-behind mode only)."""
+        if self.turn_writer:
+            await self.turn_writer.flush_session(session_id)
 
     async def handle_new_chat_message(self, user_id: str, message: str) -> ChatResponse:
         """Create a new chat session and handle the first message.
@@ -39,8 +94,9 @@ class ChatService:
         """
         try:
             logger.info(f"Creating new chat session for user {user_id}")
-            session = self._create_new_session(user_id)
-            return await self.handle_message(user_id, session.id, message)
+            session = await self._create_new_session(user_id)
+            # A brand-new session has no state to load
+            return await self._handle_turn(session, ConversationState(), message)
         except Exception as e:
             logger.error(f"Failed to create new chat session: {str(e)}")
             raise
@@ -63,38 +119,8 @@ class ChatService:
         logger.debug(f"Handling message for session {session_id} from user {user_id}")
         
         try:
-            session = self.chat_db_manager.get_session(user_id, session_id)
-            if not session:
-                logger.warning(f"Session {session_id} not found for user {user_id}")
-                raise NotFoundOrAccessException("Session")
-            
-            try:
-                response_text = self.agent.process_message(user_message)
-            except Exception as e:
-                logger.error(f"Agent failed to process message: {str(e)}")
-                raise AgentProcessingException(f"Failed to process message: {str(e)}")
-                
-            user_message_obj = ChatMessage(role="user", content=user_message)
-            assistant_message_obj = ChatMessage(role="assistant", content=response_text)
-            
-            session.messages.append(user_message_obj)
-            session.messages.append(assistant_message_obj)
-            
-            try:
-                updated_session = self.chat_db_manager.update_session_messages(session)
-                if not updated_session:
-                    logger.error(f"Failed to update messages for session {session_id}")
-                    raise Exception("Failed to update session messages")
-                
-                logger.info(f"Successfully processed message for session {session_id}")
-                return ChatResponse(
-                    response=assistant_message_obj,
-                    session_id=session_id,
-                    session_title=updated_session.title,
-                )
-            except Exception as e:
-                logger.error(f"Database error while updating session messages: {str(e)}")
-                raise
+            session, conversation = await self.load_conversation(user_id, session_id)
+            return await self._handle_turn(session, conversation, user_message)
                 
         except NotFoundOrAccessException:
             # Re-raise the exception since we've already logged it
@@ -103,7 +129,146 @@ class ChatService:
             logger.error(f"Unexpected error in handle_message: {str(e)}")
             raise
 
-    def _create_new_session(self, user_id: str) -> ChatSession:
+    async def _handle_turn(
+        self, session: ChatSession, conversation: ConversationState, user_message: str
+    ) -> ChatResponse:
+        """Run one turn through the agent and persist it."""
+        try:
+            response_text = await self.agent.process_message_async(
+                user_message, conversation, on_summary_refreshed=self._summary_saver(session)
+            )
+        except Exception as e:
+            logger.error(f"Agent failed to process message: {str(e)}")
+            raise AgentProcessingException(f"Failed to process message: {str(e)}")
+
+        return await self._persist_turn(session, conversation, user_message, response_text)
+
+    async def stream_message(
+        self, session: ChatSession, conversation: ConversationState, user_message: str
+    ) -> AsyncIterator[Union[ChatStreamChunk, ChatResponse]]:
+        """Stream the assistant's reply to a message in an existing chat session.
+
+        Yields a ChatStreamChunk for every piece of text produced by the agent,
+        followed by the final ChatResponse. The turn is persisted only after the
+        stream completes, so an abandoned stream leaves the session unchanged.
+
+        Args:
+            session: Chat session returned by load_conversation.
+            conversation: Agent state returned by load_conversation.
+            user_message: Content of the user's message.
+        """
+        chunks = []
+        async for text in self.agent.stream_message_async(
+            user_message, conversation, on_summary_refreshed=self._summary_saver(session)
+        ):
+            chunks.append(text)
+            yield ChatStreamChunk(text=text)
+
+        yield await self._persist_turn(session, conversation, user_message, "".join(chunks))
+
+    async def load_conversation(self, user_id: str, session_id: str) -> Tuple[ChatSession, ConversationState]:
+        """Load a chat session and the agent's working state for it.
+
+        The compact state stored with the session is read in the same query as the
+        ownership check. Sessions without stored state (created before it existed)
+        are rebuilt once from their most recent messages.
+
+        Raises:
+            NotFoundOrAccessException: If session is not found or user doesn't have access.
+        """
+        await self._flush_pending(session_id)
+        # The caller goes on to await the model, so the connection is released before returning
+        async with self._detached_db_manager() as chat_db_manager:
+            result = await chat_db_manager.get_session_state(user_id, session_id)
+            if not result:
+                logger.warning(f"Session {session_id} not found for user {user_id}")
+                raise NotFoundOrAccessException("Session")
+
+            session, agent_state = result
+            conversation = ConversationState.from_compact(agent_state)
+            if conversation is None:
+                conversation = await self._rebuild_conversation(chat_db_manager, user_id, session)
+        return session, conversation
+
+    async def _rebuild_conversation(
+        self, chat_db_manager: AsyncChatDBManager, user_id: str, session: ChatSession
+    ) -> ConversationState:
+        """Rebuild agent state from the latest messages of a session."""
+        if not session.message_count:
+            return ConversationState()
+        recent = await chat_db_manager.get_session(
+            user_id, session.id, limit=self.agent.context_window.max_recent_messages
+        )
+        messages = recent.messages if recent else []
+        return ConversationState(
+            conversation_history=[{"role": msg.role, "text": msg.content or ""} for msg in messages]
+        )
+
+    def _summary_saver(self, session: ChatSession):
+        """Build the callback that stores state after a background summary refresh."""
+        async def _save(conversation: ConversationState) -> None:
+            # The turn that triggered the refresh has been persisted by now, adding two messages
+            try:
+                await self._flush_pending(session.id)
+            except DatabaseOperationException as e:
+                logger.warning(f"Skipped summary update for session {session.id}: {e.message}")
+                return
+            async with self._detached_db_manager() as chat_db_manager:
+                updated = await chat_db_manager.update_agent_state(
+                    session.id, conversation.to_compact(), session.message_count + 2
+                )
+            if not updated:
+                logger.debug(f"Skipped stale summary update for session {session.id}")
+        return _save
+
+    async def _persist_turn(
+        self,
+        session: ChatSession,
+        conversation: ConversationState,
+        user_message: str,
+        response_text: str,
+    ) -> ChatResponse:
+        """Store a user/assistant exchange as two new messages in the session.
+
+        The agent's compact state is saved in the same transaction, which runs in
+        a short session of its own (the request's may be closed by now).
+
+        Returns:
+            ChatResponse containing the assistant's response and session info.
+        """
+        user_message_obj = ChatMessage(role="user", content=user_message)
+        assistant_message_obj = ChatMessage(role="assistant", content=response_text)
+
+        if self.turn_writer:
+            # Write-behind: respond now, the turn is committed with the next batch
+            await self.turn_writer.enqueue(
+                session.user_id, session.id, [user_message_obj, assistant_message_obj], conversation.to_compact()
+            )
+            return ChatResponse(response=assistant_message_obj, session_id=session.id, session_title=session.title)
+
+        try:
+            async with self._detached_db_manager() as chat_db_manager:
+                updated_session = await chat_db_manager.append_messages(
+                    session.user_id,
+                    session.id,
+                    [user_message_obj, assistant_message_obj],
+                    agent_state=conversation.to_compact(),
+                )
+            if not updated_session:
+                logger.error(f"Failed to update messages for session {session.id}")
+                raise Exception("Failed to update session messages")
+
+            logger.info(f"Successfully processed message for session {session.id}")
+            return ChatResponse(
+                response=assistant_message_obj,
+                session_id=session.id,
+                session_title=updated_session.title,
+            )
+        except Exception as e:
+            logger.error(f"Database error while updating session messages: {str(e)}")
+            raise
+
+    async def _create_new_session(self, user_id: str) -> ChatSession:
         """Create a new chat session for a user.
 
         Args:
@@ -112,21 +277,74 @@ class ChatService:
         Returns:
             Newly created ChatSession object.
         """
-        return self.chat_db_manager.create(ChatSession(user_id=user_id, title=CHAT_DEFAULT_TITLE, messages=[]))
+        return await self.chat_db_manager.create(ChatSession(user_id=user_id, title=CHAT_DEFAULT_TITLE, messages=[]))
+
+    async def check_session_access(self, user_id: str, session_id: str) -> None:
+        """Ensure a chat session exists and belongs to ``user_id``.
+
+        Raises:
+            NotFoundOrAccessException: If session is not found or user doesn't have access.
+        """
+        if not await self.chat_db_manager.get_session_state(user_id, session_id):
+            raise NotFoundOrAccessException("Session")
 
-    def get_chat_history(self, user_id: str, session_id: str) -> ChatSession:
-        """Get a chat session by its ID.
+    async def get_chat_history(
+        self, user_id: str, session_id: str, limit: int, before: Optional[int] = None
+    ) -> ChatHistoryPage:
+        """Get a page of a chat session's messages, newest page first.
 
         Args:
             user_id: ID of the user.
             session_id: ID of the chat session to retrieve.
+            limit: Maximum number of messages to return.
+            before: Only return messages older than this sequence number
+                (the next_before value of the previous page).
 
         Returns:
-            ChatSession object if found.
+            ChatHistoryPage with the messages in chronological order.
+
+        Raises:
+            NotFoundOrAccessException: If session is not found or user doesn't have access.
         """
-        return self.chat_db_manager.get_session(user_id, session_id)
+        await self._flush_pending(session_id)
+        session = await self.chat_db_manager.get_session(user_id, session_id, limit=limit, before=before)
+        if not session:
+            raise NotFoundOrAccessException("Session")
+
+        # Messages are append-only, so sequence numbers are contiguous and the
+        # first message of this page has seq = end - len(page)
+        end = session.message_count if before is None else min(before, session.message_count)
+        first_seq = end - len(session.messages)
+        return ChatHistoryPage(
+            **session.model_dump(exclude={"messages"}),
+            messages=session.messages,
+            next_before=first_seq if first_seq > 0 else None,
+        )
+
+    async def list_sessions(self, user_id: str, limit: int, cursor: Optional[str] = None) -> ChatSessionList:
+        """List a user's chat sessions as metadata, most recently updated first.
 
-    def delete_session(self, user_id: str, session_id: str) -> bool:
+        Args:
+            user_id: ID of the user.
+            limit: Maximum number of sessions to return.
+            cursor: Opaque cursor from a previous page's next_cursor.
+
+        Returns:
+            ChatSessionList with one page of session summaries and the next cursor.
+
+        Raises:
+            InvalidCursorException: If the cursor cannot be decoded.
+        """
+        after = _decode_session_cursor(cursor) if cursor else None
+        # Fetch one extra row to find out whether another page exists
+        sessions = await self.chat_db_manager.list_sessions(user_id, limit + 1, after)
+        next_cursor = None
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            next_cursor = _encode_session_cursor(sessions[-1].updated_at, sessions[-1].id)
+        return ChatSessionList(sessions=sessions, next_cursor=next_cursor)
+
+    async def delete_session(self, user_id: str, session_id: str) -> bool:
         """Delete a chat session.
 
         Args:
@@ -134,8 +352,12 @@ class ChatService:
             session_id: ID of the chat session to delete.
 
         Returns:
-            True if the session was deleted successfully, False otherwise.
+            True once the session has been deleted.
+
+        Raises:
+            NotFoundOrAccessException: If session is not found or user doesn't have access.
         """
-        if not self.chat_db_manager.get_session(user_id, session_id):
-            raise NotFoundOrAccessException("Session not found")
-        return self.chat_db_manager.delete(session_id)
+        # The ownership check is part of the DELETE itself, so the session is never loaded
+        if not await self.chat_db_manager.delete(user_id, session_id):
+            raise NotFoundOrAccessException("Session")
+        return True
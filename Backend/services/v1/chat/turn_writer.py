@@ -0,0 +1,275 @@
+# this file contains the ChatTurnWriter which batches chat turn persistence in write-behind mode.
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+
+from Backend.config.v1.constants import (
+    CHAT_WRITE_BEHIND_FLUSH_MS,
+    CHAT_WRITE_BEHIND_MAX_ATTEMPTS,
+    CHAT_WRITE_BEHIND_MAX_BATCH,
+    CHAT_WRITE_BEHIND_MAX_PENDING,
+)
+from Backend.core.v1.common.exceptions import DatabaseOperationException, QueueFullException
+from Backend.core.v1.common.logger import get_logger
+from Backend.core.v1.db.session import session_scope
+from Backend.core.v1.db_manager.postgresql.chat_db_manager import AsyncChatDBManager
+from Backend.core.v1.types.chat import ChatMessage
+
+logger = get_logger(__name__)
+
+# Dropped sessions remembered so their next read can report the loss
+_MAX_REPORTED_ERRORS = 1000
+# Errors that mean the database is unreachable rather than that an entry is bad; they don't use up attempts
+_TRANSIENT_ERRORS = (DisconnectionError, InterfaceError, OperationalError, OSError)
+
+
+@dataclass
+class PendingAppend:
+    """Messages queued for one session, with the agent state of its latest turn."""
+
+    user_id: str
+    session_id: str
+    messages: List[ChatMessage] = field(default_factory=list)
+    agent_state: Optional[Dict[str, Any]] = None
+    turns: int = 0
+    # Failed flushes so far; the turns are dropped once this reaches max_attempts
+    attempts: int = 0
+
+
+class ChatTurnWriter:
+    """In-process write-behind buffer for chat turns.
+
+    Turns are acknowledged as soon as they are queued and written by a
+    background task every ``flush_interval`` seconds, or sooner once
+    ``max_batch`` messages are waiting. A flush stores every queued turn in one
+    transaction (see ``AsyncChatDBManager.append_batch``), so a burst of turns
+    costs one commit instead of one each. Turns of the same session are merged
+    and keep their order.
+
+    If the batch fails, each session is retried in a transaction of its own so
+    one bad entry cannot hold back the rest. A session that keeps failing is
+    requeued up to ``max_attempts`` times and then dropped; connection errors
+    don't count as attempts. Readers of that session get the error from
+    ``flush_session`` instead of stale state. At most ``max_pending`` messages
+    are queued; beyond that ``enqueue`` waits for a flush, and raises
+    QueueFullException if the queue is still full.
+
+    The queue lives in this worker's memory: reads of a session with queued
+    turns flush first (``flush_session``), and ``close`` flushes on shutdown,
+    but a crash loses whatever has not been flushed yet.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = CHAT_WRITE_BEHIND_FLUSH_MS / 1000,
+        max_batch: int = CHAT_WRITE_BEHIND_MAX_BATCH,
+        max_pending: int = CHAT_WRITE_BEHIND_MAX_PENDING,
+        max_attempts: int = CHAT_WRITE_BEHIND_MAX_ATTEMPTS,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._pending: Dict[str, PendingAppend] = {}
+        self._pending_messages = 0
+        # Batch currently being written; still counts as queued for flush_session
+        self._inflight: Dict[str, PendingAppend] = {}
+        # Last write error per session, reported to the next flush_session for it
+        self._errors: "OrderedDict[str, str]" = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._stats = {
+            "flushes": 0,
+            "failed_flushes": 0,
+            "turns_written": 0,
+            "messages_written": 0,
+            "dropped_sessions": 0,
+            "dead_lettered_sessions": 0,
+            "last_flush_ms": None,
+        }
+
+    async def enqueue(
+        self, user_id: str, session_id: str, messages: List[ChatMessage], agent_state: Optional[Dict[str, Any]]
+    ) -> None:
+        """Queue messages for a session; they are written by the next flush.
+
+        Raises:
+            QueueFullException: If the queue stays full after flushing.
+        """
+        if self._closed:
+            raise RuntimeError("ChatTurnWriter is closed")
+        if self._pending_messages + len(messages) > self.max_pending:
+            # Backpressure: this turn waits for the queue to drain instead of growing it
+            await self.flush()
+            if self._pending_messages + len(messages) > self.max_pending:
+                raise QueueFullException("Chat history cannot be saved right now, please retry later")
+
+        pending = self._pending.get(session_id)
+        if pending is None:
+            pending = self._pending[session_id] = PendingAppend(user_id=user_id, session_id=session_id)
+        pending.messages.extend(messages)
+        pending.turns += 1
+        if agent_state is not None:
+            pending.agent_state = agent_state
+        self._pending_messages += len(messages)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if self._pending_messages >= self.max_batch:
+            self._wake.set()
+
+    def has_pending(self, session_id: str) -> bool:
+        """Whether turns of this session are queued or being written."""
+        return session_id in self._pending or session_id in self._inflight
+
+    async def flush_session(self, session_id: str) -> None:
+        """Flush if this session has queued turns, so a following read sees them.
+
+        Raises:
+            DatabaseOperationException: If turns of this session could not be
+                written, either still awaiting a retry or dropped. A dropped
+                session reports its error once.
+        """
+        if self.has_pending(session_id):
+            await self.flush()
+        error = self._errors.get(session_id)
+        if error is None:
+            return
+        if session_id not in self._pending:
+            del self._errors[session_id]
+        raise DatabaseOperationException(f"saving queued messages for session {session_id}: {error}")
+
+    async def flush(self) -> int:
+        """Write all queued turns, in one transaction unless an entry fails.
+
+        Returns:
+            Number of messages written.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending, self._pending_messages = self._pending, {}, 0
+            self._inflight = batch
+            started = time.perf_counter()
+            failed: Dict[str, PendingAppend] = {}
+            dead_lettered: Set[str] = set()
+            try:
+                written = await self._write(list(batch.values()))
+            except Exception as e:
+                self._stats["failed_flushes"] += 1
+                logger.warning(f"Batched flush of {len(batch)} chat session(s) failed, retrying one by one: {str(e)}")
+                written = set()
+                for append in batch.values():
+                    try:
+                        written |= await self._write([append])
+                    except Exception as session_error:
+                        if not self._fail(append, session_error, failed):
+                            dead_lettered.add(append.session_id)
+            finally:
+                self._inflight = {}
+            if failed:
+                self._requeue(failed)
+
+            dropped = [
+                session_id for session_id in batch
+                if session_id not in written and session_id not in failed and session_id not in dead_lettered
+            ]
+            if dropped:
+                # The session was deleted (or never owned by the user) before its turns were written
+                logger.warning(f"Dropped queued messages for {len(dropped)} missing chat session(s)")
+            for session_id in written:
+                self._errors.pop(session_id, None)
+            messages = sum(len(batch[session_id].messages) for session_id in written)
+            self._stats["flushes"] += 1
+            self._stats["turns_written"] += sum(batch[session_id].turns for session_id in written)
+            self._stats["messages_written"] += messages
+            self._stats["dropped_sessions"] += len(dropped)
+            self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return messages
+
+    async def _write(self, appends: List[PendingAppend]) -> Set[str]:
+        """Write appends in one transaction; returns the IDs of the sessions written."""
+        async with session_scope() as db:
+            return set(await AsyncChatDBManager(db).append_batch([
+                (append.user_id, append.session_id, append.messages, append.agent_state)
+                for append in appends
+            ]))
+
+    def _fail(self, append: PendingAppend, error: Exception, failed: Dict[str, PendingAppend]) -> bool:
+        """Record a failed session write; requeue it or drop it after max_attempts.
+
+        Returns:
+            True if the append was added to ``failed`` for another attempt.
+        """
+        if not isinstance(error, _TRANSIENT_ERRORS):
+            append.attempts += 1
+        self._errors[append.session_id] = str(error)
+        self._errors.move_to_end(append.session_id)
+        while len(self._errors) > _MAX_REPORTED_ERRORS:
+            self._errors.popitem(last=False)
+        if append.attempts < self.max_attempts:
+            failed[append.session_id] = append
+            return True
+        self._stats["dead_lettered_sessions"] += 1
+        logger.error(
+            f"Dropping {len(append.messages)} queued message(s) for chat session {append.session_id} "
+            f"after {append.attempts} failed attempts: {str(error)}"
+        )
+        return False
+
+    def _requeue(self, batch: Dict[str, PendingAppend]) -> None:
+        """Put failed appends back in front of turns queued while they were being written."""
+        for session_id, newer in self._pending.items():
+            if session_id in batch:
+                batch[session_id].messages.extend(newer.messages)
+                batch[session_id].turns += newer.turns
+                if newer.agent_state is not None:
+                    batch[session_id].agent_state = newer.agent_state
+            else:
+                batch[session_id] = newer
+        self._pending = batch
+        self._pending_messages = sum(len(append.messages) for append in batch.values())
+
+    async def _run(self) -> None:
+        """Background loop flushing on the interval or when woken by a full batch."""
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # Keep the loop alive so turns queued later are still written
+                logger.error(f"Chat write-behind flush failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Stop the background loop and flush everything still queued."""
+        self._closed = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+        for _ in range(self.max_attempts):
+            if not self._pending:
+                break
+            await self.flush()
+        if self._pending:
+            logger.error(f"Lost {self._pending_messages} queued chat message(s) on shutdown")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and flush counters for this worker."""
+        return {
+            "pending_sessions": len(self._pending),
+            "pending_messages": self._pending_messages,
+            "flush_interval_ms": round(self.flush_interval * 1000),
+            "max_batch": self.max_batch,
+            "max_pending": self.max_pending,
+            **self._stats,
+        }
@@ -0,0 +1,50 @@
+# this file contains the ServiceContainer which builds the long-lived agents and model clients once per worker.
+from Backend.config.v1.constants import CHAT_DURABILITY_MODE
+from Backend.core.v1.agents.chat_bot_agent import HealthcareChatAgent
+from Backend.core.v1.agents.dietitian_agent import DietitianAgent
+from Backend.core.v1.agents.symptom_agent import SymptomAnalyzerAgent
+from Backend.core.v1.common.logger import get_logger
+from Backend.core.v1.db.init_db import initialize_db
+from Backend.core.v1.db.session import async_engine, engine
+from Backend.core.v1.utils.env_config import configure_google_api
+from Backend.services.v1.chat.turn_writer import ChatTurnWriter
+from Backend.services.v1.documents.job_queue import DocumentJobQueue
+
+logger = get_logger(__name__)
+
+
+class ServiceContainer:
+    """Application-lifespan container for expensive, shareable objects.
+
+    Built once in the FastAPI lifespan handler and exposed to routes through
+    dependencies in ``Backend.api.v1.dependencies.services``. Database sessions
+    are not held here; they are opened per request.
+    """
+
+    def __init__(self):
+        configure_google_api()
+        # Schema checks and migrations run once per worker, never on the request path
+        self.schema_ready = initialize_db()
+
+        self.symptom_agent = SymptomAnalyzerAgent()
+        self.diet_agent = DietitianAgent()
+        self.chat_agent = HealthcareChatAgent(
+            symptom_analyzer=self.symptom_agent, dietitian=self.diet_agent
+        )
+        self.document_jobs = DocumentJobQueue()
+
+        if CHAT_DURABILITY_MODE not in ("sync", "write_behind"):
+            raise ValueError(f"Unknown CHAT_DURABILITY_MODE {CHAT_DURABILITY_MODE!r}; use 'sync' or 'write_behind'")
+        # Write-behind queues chat turns in this worker and commits them in batches
+        self.turn_writer = ChatTurnWriter() if CHAT_DURABILITY_MODE == "write_behind" else None
+        logger.info("ServiceContainer initialized")
+
+    async def close(self) -> None:
+        """Release resources held by the container."""
+        await self.document_jobs.close()
+        if self.turn_writer:
+            # Flush queued turns while the engine is still open
+            await self.turn_writer.close()
+        await async_engine.dispose()
+        engine.dispose()
+        logger.info("ServiceContainer closed")
@@ -0,0 +1,281 @@
+# this file contains the DocumentJobQueue which runs OCR/document processing in a bounded process pool.
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from Backend.config.v1.constants import (
+    OCR_JOB_TTL_SECONDS,
+    OCR_MAX_QUEUE_DEPTH,
+    OCR_MAX_WORKERS,
+    OCR_PRELOAD_IN_WORKERS,
+)
+from Backend.core.v1.common.exceptions import NotFoundOrAccessException, QueueFullException
+from Backend.core.v1.common.logger import get_logger
+from Backend.core.v1.db.session import session_scope
+from Backend.core.v1.db_manager.postgresql.document_job_db_manager import AsyncDocumentJobDBManager
+from Backend.core.v1.types.utils import generate_uuid
+
+logger = get_logger(__name__)
+
+# process_document reports failures as text rather than raising
+_FAILURE_PREFIXES = ("Error", "File not found", "No text", "Unsupported")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# How often a worker waiting on a job run by another worker re-reads its state
+_REMOTE_POLL_SECONDS = 1.0
+
+
+def _init_document_worker() -> None:
+    """Pool initializer: load the OCR model before the worker takes its first job."""
+    from Backend.core.v1.agents.ocr_agent import preload_ocr_models
+
+    try:
+        preload_ocr_models()
+    except Exception as e:
+        # The model is loaded lazily on first use instead
+        logger.error(f"Failed to preload OCR models: {str(e)}")
+
+
+def _run_document_job(file_path: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """Entry point executed inside a pool worker process; returns the result and per-page stats."""
+    # Imported here so the OCR stack is only loaded in worker processes, never in the API process
+    from Backend.core.v1.agents.ocr_agent import process_document
+
+    page_stats: List[Dict[str, Any]] = []
+    return process_document(file_path, page_stats), page_stats
+
+
+@dataclass
+class DocumentJob:
+    """State of one document-processing job."""
+
+    id: str
+    user_id: str
+    session_id: str
+    filename: str
+    file_path: str
+    status: str = QUEUED
+    result: Optional[str] = None
+    error: Optional[str] = None
+    page_stats: List[Dict[str, Any]] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_values(self) -> Dict[str, Any]:
+        """Column values for ``DocumentJobModel``."""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "session_id": self.session_id,
+            "filename": self.filename,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "page_stats": self.page_stats,
+            "created_at": _to_datetime(self.created_at),
+            "started_at": _to_datetime(self.started_at),
+            "finished_at": _to_datetime(self.finished_at),
+        }
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> "DocumentJob":
+        """Rebuild a job stored by another worker; its file path is not shared."""
+        return cls(
+            id=values["id"],
+            user_id=values["user_id"],
+            session_id=values["session_id"],
+            filename=values["filename"],
+            file_path="",
+            status=values["status"],
+            result=values["result"],
+            error=values["error"],
+            page_stats=values["page_stats"] or [],
+            created_at=_to_timestamp(values["created_at"]),
+            started_at=_to_timestamp(values["started_at"]),
+            finished_at=_to_timestamp(values["finished_at"]),
+        )
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None
+
+
+def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    # Stored as naive UTC, see UTCDateTime
+    return value.replace(tzinfo=timezone.utc).timestamp() if value is not None else None
+
+
+class DocumentJobQueue:
+    """Bounded queue that runs document processing in a separate process pool.
+
+    OCR is CPU-bound and holds the GIL for seconds per page, so it runs in
+    worker processes and never on the event loop. At most ``max_workers`` jobs
+    run at once; at most ``max_queue_depth`` jobs may be queued or running,
+    beyond which ``submit`` raises QueueFullException. Both limits apply per
+    API worker, as each worker owns its pool.
+
+    The worker that accepts a job runs it and writes every status change to the
+    ``document_jobs`` table, so any API worker can answer a poll for it. Jobs
+    are deleted ``job_ttl`` seconds after they finish; a job whose worker died
+    before finishing is deleted ``job_ttl`` seconds after it was created.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = OCR_MAX_WORKERS,
+        max_queue_depth: int = OCR_MAX_QUEUE_DEPTH,
+        job_ttl: float = OCR_JOB_TTL_SECONDS,
+    ):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.job_ttl = job_ttl
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            # Forking a process that runs an event loop and database pools is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_document_worker if OCR_PRELOAD_IN_WORKERS else None,
+        )
+        self._slots = asyncio.Semaphore(max_workers)
+        self._jobs: Dict[str, DocumentJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs queued or running."""
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    async def submit(self, user_id: str, session_id: str, filename: str, file_path: str) -> DocumentJob:
+        """Queue ``file_path`` for processing; the file is deleted once the job finishes.
+
+        Raises:
+            QueueFullException: If ``max_queue_depth`` jobs are already pending.
+            SQLAlchemyError: If the job could not be stored.
+        """
+        await self._evict_expired()
+        if self.depth >= self.max_queue_depth:
+            raise QueueFullException(f"Document queue is full ({self.max_queue_depth} jobs), please retry later")
+
+        job = DocumentJob(
+            id=generate_uuid(), user_id=user_id, session_id=session_id, filename=filename, file_path=file_path
+        )
+        async with session_scope() as db:
+            await AsyncDocumentJobDBManager(db).create(job.to_values())
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Queued document job {job.id} ({filename}); depth {self.depth}/{self.max_queue_depth}")
+        return job
+
+    async def get(self, user_id: str, job_id: str) -> DocumentJob:
+        """Return a job owned by ``user_id``, whichever worker runs it.
+
+        Raises:
+            NotFoundOrAccessException: If the job does not exist, expired, or belongs to another user.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            if job.user_id != user_id:
+                raise NotFoundOrAccessException("Document job")
+            return job
+        async with session_scope() as db:
+            values = await AsyncDocumentJobDBManager(db).get(user_id, job_id)
+        if values is None:
+            raise NotFoundOrAccessException("Document job")
+        return DocumentJob.from_values(values)
+
+    async def wait(self, job: DocumentJob, timeout: float) -> DocumentJob:
+        """Wait up to ``timeout`` seconds for ``job`` to finish, then return it.
+
+        Jobs run by this worker are awaited directly; jobs of other workers are
+        re-read from the database every ``_REMOTE_POLL_SECONDS``.
+        """
+        if timeout <= 0 or job.finished:
+            return job
+        if job.id in self._jobs:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            return job
+
+        deadline = time.monotonic() + timeout
+        while not job.finished:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(_REMOTE_POLL_SECONDS, remaining))
+            try:
+                job = await self.get(job.user_id, job.id)
+            except NotFoundOrAccessException:
+                break
+        return job
+
+    async def _run(self, job: DocumentJob) -> None:
+        try:
+            async with self._slots:
+                job.status = RUNNING
+                job.started_at = time.time()
+                await self._store(job)
+                loop = asyncio.get_running_loop()
+                result, job.page_stats = await loop.run_in_executor(self._executor, _run_document_job, job.file_path)
+            if result.startswith(_FAILURE_PREFIXES):
+                job.status, job.error = FAILED, result
+            else:
+                job.status, job.result = SUCCEEDED, result
+        except asyncio.CancelledError:
+            job.status, job.error = FAILED, "Document processing was cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Document job {job.id} failed: {str(e)}")
+            job.status, job.error = FAILED, f"Error processing file: {str(e)}"
+        finally:
+            job.finished_at = time.time()
+            await self._store(job)
+            job.done.set()
+            if os.path.exists(job.file_path):
+                os.remove(job.file_path)
+            if job.started_at:
+                logger.info(f"Document job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+    async def _store(self, job: DocumentJob) -> None:
+        """Write the job's current state for other workers; failures only affect remote polls."""
+        values = job.to_values()
+        del values["id"]
+        try:
+            async with session_scope() as db:
+                await AsyncDocumentJobDBManager(db).update(job.id, values)
+        except Exception as e:
+            logger.error(f"Failed to store state of document job {job.id}: {str(e)}")
+
+    async def _evict_expired(self) -> None:
+        cutoff = time.time() - self.job_ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+        try:
+            async with session_scope() as db:
+                await AsyncDocumentJobDBManager(db).delete_expired(_to_datetime(cutoff))
+        except Exception as e:
+            logger.warning(f"Failed to delete expired document jobs: {str(e)}")
+
+    async def close(self) -> None:
+        """Cancel pending jobs, recording them as failed, and stop the worker processes."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
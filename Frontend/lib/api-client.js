@@ -1,4 +1,8 @@
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1';
+// Messages loaded per chat history request (the route serves at most 200)
+const HISTORY_PAGE_SIZE = 50;
+// Longest time to wait for an uploaded document to be processed
+const PROCESS_FILE_TIMEOUT_MS = 5 * 60 * 1000;
 
 export class ApiClient {
   constructor() {
@@ -49,9 +53,14 @@ export class ApiClient {
     }
   }
 
-  async getChatHistory(sessionId) {
+  // Returns the latest `limit` messages and `next_before`; pass that as
+  // `before` (e.g. when the user scrolls up) to load the page before it.
+  async getChatHistory(sessionId, { limit = HISTORY_PAGE_SIZE, before } = {}) {
     try {
-      const response = await fetch(`${this.baseUrl}/chat/${sessionId}`, {
+      const params = new URLSearchParams({ limit });
+      if (before !== undefined && before !== null) params.set('before', before);
+
+      const response = await fetch(`${this.baseUrl}/chat/${sessionId}?${params}`, {
         headers: {
           'X-API-Key': 'test-user-key'
         }
@@ -148,12 +157,43 @@ export class ApiClient {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      return await response.json();
+      // Processing runs as a background job; long-poll until it finishes or the deadline passes
+      let job = await response.json();
+      const deadline = Date.now() + PROCESS_FILE_TIMEOUT_MS;
+      while (job.status === 'queued' || job.status === 'running') {
+        const remainingSeconds = Math.floor((deadline - Date.now()) / 1000);
+        if (remainingSeconds <= 0) {
+          throw new Error(`Processing ${job.filename} did not finish in time, please try again`);
+        }
+        job = await this.getProcessFileJob(job.job_id, Math.min(25, remainingSeconds));
+      }
+
+      return {
+        status: job.status === 'succeeded' ? 'success' : 'error',
+        filename: job.filename,
+        extracted_data: job.extracted_data,
+        message: job.message
+      };
     } catch (error) {
       console.error('Error processing file:', error);
       throw error;
     }
   }
+
+  async getProcessFileJob(jobId, wait = 0) {
+    const response = await fetch(`${this.baseUrl}/chat/process-file/jobs/${jobId}?wait=${wait}`, {
+      method: 'GET',
+      headers: {
+        'X-API-Key': 'test-user-key'
+      }
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    return await response.json();
+  }
 }
 
 export const apiClient = new ApiClient();
\ No newline at end of file
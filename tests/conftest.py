@@ -0,0 +1,35 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+# Tests run against a throwaway SQLite database, never the one configured for the app
+_DB_DIR = tempfile.mkdtemp(prefix="medi-agent-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Migrate the test database once per test run."""
+    from Backend.core.v1.db.init_db import initialize_db
+
+    assert initialize_db(migrate=True)
+
+
+@pytest.fixture
+def run(database):
+    """Run a coroutine on a fresh event loop, closing pooled connections before the loop ends."""
+    from Backend.core.v1.db.session import async_engine
+
+    def _run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await async_engine.dispose()
+
+        return asyncio.run(main())
+
+    return _run
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+from Backend.core.v1.common.exceptions import NotFoundOrAccessException
+from Backend.core.v1.db.session import session_scope
+from Backend.core.v1.db_manager.postgresql.chat_db_manager import AsyncChatDBManager
+from Backend.core.v1.types.chat import ChatMessage, ChatSession
+from Backend.services.v1.chat.service import ChatService
+
+OWNER = "owner"
+OTHER = "intruder"
+
+
+def messages(*texts):
+    return [ChatMessage(role="user", content=text) for text in texts]
+
+
+async def create_session(user_id=OWNER, title="t", texts=("hello",)):
+    async with session_scope() as db:
+        return await AsyncChatDBManager(db).create(ChatSession(user_id=user_id, title=title, messages=messages(*texts)))
+
+
+async def load(session_id, user_id=OWNER):
+    async with session_scope() as db:
+        manager = AsyncChatDBManager(db)
+        session = await manager.get_session(user_id, session_id)
+        state = await manager.get_session_state(user_id, session_id)
+    return session, state[1] if state else None
+
+
+def test_delete_only_removes_the_callers_session(run):
+    async def scenario():
+        session = await create_session()
+        async with session_scope() as db:
+            deleted_by_other = await AsyncChatDBManager(db).delete(OTHER, session.id)
+        survived, _ = await load(session.id)
+        async with session_scope() as db:
+            deleted_by_owner = await AsyncChatDBManager(db).delete(OWNER, session.id)
+        gone, _ = await load(session.id)
+        return deleted_by_other, survived, deleted_by_owner, gone
+
+    deleted_by_other, survived, deleted_by_owner, gone = run(scenario())
+    assert deleted_by_other is False
+    assert [m.content for m in survived.messages] == ["hello"]
+    assert deleted_by_owner is True
+    assert gone is None
+
+
+def test_append_does_not_touch_another_users_session(run):
+    async def scenario():
+        session = await create_session()
+        async with session_scope() as db:
+            result = await AsyncChatDBManager(db).append_messages(
+                OTHER, session.id, messages("injected"), agent_state={"summary": "forged"}
+            )
+        return result, *await load(session.id)
+
+    result, session, agent_state = run(scenario())
+    assert result is None
+    assert session.message_count == 1
+    assert [m.content for m in session.messages] == ["hello"]
+    assert agent_state is None
+
+
+def test_batch_append_skips_sessions_of_other_users(run):
+    async def scenario():
+        mine, theirs = await create_session(), await create_session(user_id="someone-else")
+        async with session_scope() as db:
+            written = await AsyncChatDBManager(db).append_batch([
+                (OWNER, mine.id, messages("mine"), None),
+                (OWNER, theirs.id, messages("not mine"), {"summary": "forged"}),
+            ])
+        return written, mine.id, (await load(mine.id))[0], await load(theirs.id, "someone-else")
+
+    written, mine_id, mine, (theirs, theirs_state) = run(scenario())
+    assert written == [mine_id]
+    assert [m.content for m in mine.messages] == ["hello", "mine"]
+    assert theirs.message_count == 1
+    assert [m.content for m in theirs.messages] == ["hello"]
+    assert theirs_state is None
+
+
+def test_deleting_another_users_session_reports_not_found(run):
+    async def scenario():
+        session = await create_session()
+        async with session_scope() as db:
+            service = ChatService(AsyncChatDBManager(db), agent=SimpleNamespace())
+            with pytest.raises(NotFoundOrAccessException) as error:
+                await service.delete_session(OTHER, session.id)
+        return error.value.message
+
+    assert run(scenario()) == "Session not found or user does not have access"
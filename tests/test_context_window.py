@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from Backend.core.v1.agents.context_window import ContextWindowManager
+from Backend.core.v1.agents.conversation import ConversationState
+
+
+class SummaryModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        return SimpleNamespace(text=f"summary {self.calls}")
+
+
+def add_turn(conversation, i):
+    conversation.conversation_history.append({"role": "user", "text": f"question {i}"})
+    conversation.conversation_history.append({"role": "assistant", "text": f"answer {i}"})
+
+
+def test_refresh_waits_for_half_a_window_of_overflow():
+    window = ContextWindowManager(SummaryModel(), max_recent_turns=6)
+    conversation = ConversationState()
+    for i in range(6):
+        add_turn(conversation, i)
+    assert window.refresh_threshold == 6
+    assert not window.needs_refresh(conversation)
+
+    add_turn(conversation, 6)
+    add_turn(conversation, 7)
+    assert not window.needs_refresh(conversation)
+
+    add_turn(conversation, 8)
+    assert window.needs_refresh(conversation)
+
+
+def test_summary_refreshes_every_few_turns_not_every_turn():
+    model = SummaryModel()
+    window = ContextWindowManager(model, max_recent_turns=6)
+    conversation = ConversationState()
+    for i in range(30):
+        add_turn(conversation, i)
+        window.refresh_summary(conversation)
+        assert len(conversation.conversation_history) < window.max_recent_messages + window.refresh_threshold
+
+    # 24 turns overflow the 6-turn window; each refresh folds 3 of them
+    assert model.calls == 8
+    assert conversation.summary == "summary 8"
+    assert conversation.conversation_history[-1]["text"] == "answer 29"
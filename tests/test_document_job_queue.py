@@ -0,0 +1,206 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from Backend.core.v1.common.exceptions import NotFoundOrAccessException, QueueFullException
+from Backend.core.v1.db.session import session_scope
+from Backend.core.v1.db_manager.postgresql.chat_db_manager import AsyncChatDBManager
+from Backend.core.v1.types.chat import ChatSession
+from Backend.services.v1.documents import job_queue
+from Backend.services.v1.documents.job_queue import DocumentJob, DocumentJobQueue
+
+PAGE_STATS = [{"page": 1, "method": "ocr", "seconds": 0.1, "chars": 7}]
+
+
+@pytest.fixture
+def release(monkeypatch):
+    """Replace OCR with a stub that holds every job until the returned event is set."""
+    event = threading.Event()
+
+    def run_document_job(file_path):
+        with open(file_path) as f:
+            content = f.read()
+        if content == "crash":
+            raise RuntimeError("worker died")
+        if content == "unreadable":
+            return "No text could be extracted from the document", []
+        event.wait(timeout=10)
+        return f"summary of {content}", PAGE_STATS
+
+    monkeypatch.setattr(job_queue, "_run_document_job", run_document_job)
+    yield event
+    event.set()
+
+
+def make_queue(**kwargs):
+    """A queue running jobs in threads, so the stubbed OCR entry point is used."""
+    queue = DocumentJobQueue(**kwargs)
+    queue._executor.shutdown()
+    queue._executor = ThreadPoolExecutor(max_workers=queue.max_workers)
+    return queue
+
+
+def upload(tmp_path, name, content="scan"):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+def test_full_queue_rejects_uploads(run, release, tmp_path):
+    async def scenario():
+        queue = make_queue(max_workers=1, max_queue_depth=2)
+        jobs = [await queue.submit("u", "s", f"{i}.png", upload(tmp_path, f"{i}.png")) for i in range(2)]
+        with pytest.raises(QueueFullException):
+            await queue.submit("u", "s", "2.png", upload(tmp_path, "2.png"))
+
+        release.set()
+        for job in jobs:
+            await queue.wait(job, 5)
+        accepted = await queue.submit("u", "s", "3.png", upload(tmp_path, "3.png"))
+        await queue.wait(accepted, 5)
+        await queue.close()
+        return [job.status for job in jobs], accepted.status
+
+    assert run(scenario()) == (["succeeded", "succeeded"], "succeeded")
+
+
+def test_job_moves_through_its_states(run, release, tmp_path):
+    async def scenario():
+        queue = make_queue(max_workers=1)
+        first = await queue.submit("u", "s", "a.png", upload(tmp_path, "a.png", "a"))
+        second = await queue.submit("u", "s", "b.png", upload(tmp_path, "b.png", "b"))
+        await asyncio.sleep(0.05)
+        states = [first.status, second.status]
+
+        release.set()
+        await queue.wait(second, 5)
+        # Another worker sees the stored state
+        stored = await make_queue(max_workers=1).get("u", first.id)
+        await queue.close()
+        return states, first, stored
+
+    states, first, stored = run(scenario())
+    assert states == ["running", "queued"]
+    assert first.status == "succeeded" and first.result == "summary of a"
+    assert first.page_stats == PAGE_STATS
+    assert first.started_at <= first.finished_at
+    assert not os.path.exists(first.file_path)
+    assert (stored.status, stored.result, stored.page_stats) == ("succeeded", "summary of a", PAGE_STATS)
+
+
+@pytest.mark.parametrize(
+    "content, error",
+    [
+        ("unreadable", "No text could be extracted from the document"),
+        ("crash", "Error processing file: worker died"),
+    ],
+)
+def test_failed_jobs_report_why(run, release, tmp_path, content, error):
+    async def scenario():
+        queue = make_queue(max_workers=1)
+        job = await queue.wait(await queue.submit("u", "s", "x.pdf", upload(tmp_path, "x.pdf", content)), 5)
+        await queue.close()
+        return job
+
+    job = run(scenario())
+    assert (job.status, job.error, job.result) == ("failed", error, None)
+
+
+def test_wait_long_polls_until_the_job_finishes(run, release, tmp_path):
+    async def scenario():
+        queue = make_queue(max_workers=1)
+        job = await queue.submit("u", "s", "a.png", upload(tmp_path, "a.png"))
+        timed_out = (await queue.wait(job, 0.05)).status
+
+        asyncio.get_running_loop().call_later(0.1, release.set)
+        started = asyncio.get_running_loop().time()
+        finished = (await queue.wait(job, 5)).status
+        elapsed = asyncio.get_running_loop().time() - started
+        await queue.close()
+        return timed_out, finished, elapsed
+
+    timed_out, finished, elapsed = run(scenario())
+    assert timed_out == "running"
+    assert finished == "succeeded"
+    assert elapsed < 2
+
+
+def test_wait_on_another_workers_job_polls_the_database(run, release, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "_REMOTE_POLL_SECONDS", 0.02)
+
+    async def scenario():
+        owner, other = make_queue(max_workers=1), make_queue(max_workers=1)
+        job = await owner.submit("u", "s", "a.png", upload(tmp_path, "a.png", "a"))
+        remote = await other.get("u", job.id)
+        still_running = (await other.wait(remote, 0.1)).status
+
+        asyncio.get_running_loop().call_later(0.1, release.set)
+        finished = await other.wait(remote, 5)
+        await owner.close()
+        return still_running, finished
+
+    still_running, finished = run(scenario())
+    assert still_running in ("queued", "running")
+    assert (finished.status, finished.result) == ("succeeded", "summary of a")
+
+
+def test_jobs_are_only_visible_to_their_owner(run, release, tmp_path):
+    async def scenario():
+        queue, other_worker = make_queue(max_workers=1), make_queue(max_workers=1)
+        job = await queue.submit("u", "s", "a.png", upload(tmp_path, "a.png"))
+        errors = []
+        for worker in (queue, other_worker):
+            try:
+                await worker.get("someone-else", job.id)
+            except NotFoundOrAccessException:
+                errors.append(worker)
+        release.set()
+        await queue.wait(job, 5)
+        await queue.close()
+        return len(errors)
+
+    assert run(scenario()) == 2
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.submitted = []
+
+    async def submit(self, user_id, session_id, filename, file_path):
+        self.submitted.append(session_id)
+        os.remove(file_path)
+        return DocumentJob(id="job-1", user_id=user_id, session_id=session_id, filename=filename, file_path=file_path)
+
+
+def test_upload_requires_the_session_owner(run):
+    from Backend.api.v1.dependencies.services import get_document_jobs
+    from Backend.main import app
+
+    async def create_sessions():
+        async with session_scope() as db:
+            manager = AsyncChatDBManager(db)
+            mine = await manager.create(ChatSession(user_id="user123", title="mine"))
+            theirs = await manager.create(ChatSession(user_id="someone-else", title="theirs"))
+        return mine.id, theirs.id
+
+    mine, theirs = run(create_sessions())
+    queue = RecordingQueue()
+    app.dependency_overrides[get_document_jobs] = lambda: queue
+    try:
+        with TestClient(app) as client:
+            headers = {"X-API-Key": "test-user-key"}
+            upload_file = {"file": ("scan.png", b"\x89PNG", "image/png")}
+            denied = client.post(f"/api/v1/chat/process-file/{theirs}", files=upload_file, headers=headers)
+            missing = client.post("/api/v1/chat/process-file/no-such-session", files=upload_file, headers=headers)
+            accepted = client.post(f"/api/v1/chat/process-file/{mine}", files=upload_file, headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_document_jobs, None)
+
+    assert denied.status_code == 403
+    assert missing.status_code == 403
+    assert accepted.status_code == 202 and accepted.json()["job_id"] == "job-1"
+    assert queue.submitted == [mine]
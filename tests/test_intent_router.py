@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from Backend.core.v1.agents.conversation import ConversationState, TurnContext, bind_turn
+from Backend.core.v1.agents.intent_router import Intent, IntentRouter
+
+THRESHOLD = 0.6
+
+
+class StubModel:
+    """Stands in for Gemini, replying to every classification prompt with ``reply``."""
+
+    def __init__(self, reply="general"):
+        self.reply = reply
+        self.prompts = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return SimpleNamespace(text=self.reply)
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        return self.generate_content(prompt, generation_config)
+
+
+# Messages with clear, uncontested cues that the rules settle without the model
+RULE_MESSAGES = [
+    ("Can you analyze my symptoms?", Intent.SYMPTOM),
+    ("I need a diagnosis for this rash", Intent.SYMPTOM),
+    ("Please analyse this, what could it be", Intent.SYMPTOM),
+    ("What should I eat after a workout?", Intent.DIET),
+    ("Can you plan a diet for me?", Intent.DIET),
+    ("Suggest nutritional meals for diabetics", Intent.DIET),
+    ("Can you explain my prescription?", Intent.PRESCRIPTION),
+    ("What dosage of these tablets was prescribed?", Intent.PRESCRIPTION),
+    ("PRESCRIPTION_DATA: amoxicillin 500mg twice daily", Intent.PRESCRIPTION),
+    ("Hello there", Intent.GENERAL),
+    ("Thanks, that helps", Intent.GENERAL),
+    ("I have a headache", Intent.GENERAL),
+]
+
+# Weak or competing cues, which are left to the model
+FALLBACK_MESSAGES = [
+    "Give me some healthy recipes",
+    "How many calories are in rice?",
+    "I take two pills a day",
+    "Which foods help with my symptoms?",
+    "What should I eat while on these pills?",
+    "Is this medicine safe with food?",
+    "my symptoms and my diet",
+    "Analyze my medication list",
+]
+
+
+@pytest.mark.parametrize(
+    "message, intent, confidence",
+    [
+        # A single full-weight cue saturates
+        ("Can you plan a diet for me?", Intent.DIET, 1.0),
+        # A single weak cue is only half trusted
+        ("Give me some healthy recipes", Intent.DIET, 0.5),
+        ("What could it be?", Intent.SYMPTOM, 0.75),
+        # The runner-up's score eats into the margin
+        ("Which foods help with my symptoms?", Intent.SYMPTOM, 0.5),
+        ("Analyze my medication list", Intent.SYMPTOM, 0.25),
+        ("my symptoms and my diet", Intent.SYMPTOM, 0.0),
+        # No cues at all is confidently general chat
+        ("How are you today?", Intent.GENERAL, 1.0),
+    ],
+)
+def test_rule_scores(message, intent, confidence):
+    decision = IntentRouter().score(message)
+    assert (decision.intent, decision.confidence, decision.source) == (intent, confidence, "rules")
+
+
+@pytest.mark.parametrize("message, intent", RULE_MESSAGES)
+def test_confident_messages_are_routed_by_rules(message, intent):
+    model = StubModel(reply="general")
+    decision = IntentRouter(model, threshold=THRESHOLD).classify(message)
+    assert (decision.intent, decision.source) == (intent, "rules")
+    assert decision.confidence >= THRESHOLD
+    assert model.prompts == []
+
+
+@pytest.mark.parametrize("message", FALLBACK_MESSAGES)
+def test_uncertain_messages_fall_back_to_the_model(message):
+    model = StubModel(reply="Prescription.")
+    decision = IntentRouter(model, threshold=THRESHOLD).classify(message)
+    assert IntentRouter().score(message).confidence < THRESHOLD
+    assert (decision.intent, decision.confidence, decision.source) == (Intent.PRESCRIPTION, 1.0, "llm")
+    assert len(model.prompts) == 1 and message in model.prompts[0]
+
+
+@pytest.mark.parametrize("threshold, source", [(0.7, "rules"), (0.75, "rules"), (0.8, "llm")])
+def test_threshold_decides_when_to_ask_the_model(threshold, source):
+    # Scores 0.75 by rules
+    decision = IntentRouter(StubModel(reply="diet"), threshold=threshold).classify("What could it be?")
+    assert decision.source == source
+
+
+@pytest.mark.parametrize(
+    "router",
+    [
+        IntentRouter(None, threshold=THRESHOLD),
+        IntentRouter(StubModel(reply="diet"), threshold=THRESHOLD, llm_fallback=False),
+        IntentRouter(StubModel(reply=RuntimeError("quota exceeded")), threshold=THRESHOLD),
+        IntentRouter(StubModel(reply="cardiology"), threshold=THRESHOLD),
+        IntentRouter(StubModel(reply=""), threshold=THRESHOLD),
+    ],
+    ids=["no-model", "fallback-disabled", "model-error", "unknown-label", "empty-reply"],
+)
+def test_rule_decision_is_kept_when_the_model_cannot_help(router):
+    decision = router.classify("Which foods help with my symptoms?")
+    assert (decision.intent, decision.confidence, decision.source) == (Intent.SYMPTOM, 0.5, "rules")
+
+
+def test_async_fallback_matches_sync():
+    model = StubModel(reply="diet")
+    router = IntentRouter(model, threshold=THRESHOLD)
+    confident = asyncio.run(router.classify_async("Can you explain my prescription?"))
+    uncertain = asyncio.run(router.classify_async("Is this medicine safe with food?"))
+    assert (confident.intent, confident.source) == (Intent.PRESCRIPTION, "rules")
+    assert (uncertain.intent, uncertain.source) == (Intent.DIET, "llm")
+    assert len(model.prompts) == 1
+
+
+def test_only_fallbacks_count_as_model_calls():
+    router = IntentRouter(StubModel(reply="diet"), threshold=THRESHOLD)
+    turn = TurnContext(ConversationState())
+    with bind_turn(turn):
+        for message, _ in RULE_MESSAGES:
+            router.classify(message)
+        for message in FALLBACK_MESSAGES:
+            router.classify(message)
+    assert turn.model_calls == len(FALLBACK_MESSAGES)
+
+    decisions = router.stats.snapshot()
+    assert decisions["diet"]["decisions"] == {"rules": 3, "llm": len(FALLBACK_MESSAGES)}
+    assert decisions["general"]["decisions"] == {"rules": 3, "llm": 0}
@@ -0,0 +1,100 @@
+import base64
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from Backend.core.v1.common.exceptions import InvalidCursorException
+from Backend.core.v1.db.session import session_scope
+from Backend.core.v1.db_manager.postgresql.chat_db_manager import AsyncChatDBManager
+from Backend.core.v1.models.chat import ChatSessionModel
+from Backend.core.v1.types.chat import ChatSession
+from Backend.core.v1.types.utils import get_utc_now
+from Backend.services.v1.chat.service import ChatService, _decode_session_cursor, _encode_session_cursor
+
+
+async def create_sessions(user_id, offsets):
+    """Create one session per offset (in minutes), several sharing an ``updated_at`` when offsets repeat."""
+    now = get_utc_now()
+    positions = []
+    async with session_scope() as db:
+        manager = AsyncChatDBManager(db)
+        for i, offset in enumerate(offsets):
+            session = await manager.create(ChatSession(user_id=user_id, title=f"s{i}"))
+            updated_at = now - timedelta(minutes=offset)
+            await db.execute(update(ChatSessionModel).filter_by(id=session.id).values(updated_at=updated_at))
+            positions.append((updated_at, session.id))
+        await db.commit()
+    # Newest first, ties broken by id descending
+    return [session_id for _, session_id in sorted(positions, reverse=True)]
+
+
+async def list_page(user_id, limit, cursor=None):
+    async with session_scope() as db:
+        return await ChatService(AsyncChatDBManager(db), agent=SimpleNamespace()).list_sessions(user_id, limit, cursor)
+
+
+async def list_all(user_id, limit):
+    pages, cursor = [], None
+    while True:
+        page = await list_page(user_id, limit, cursor)
+        pages.append([s.id for s in page.sessions])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trips_the_keyset_position():
+    updated_at = get_utc_now()
+    assert _decode_session_cursor(_encode_session_cursor(updated_at, "abc")) == (updated_at, "abc")
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 6, 7])
+def test_pages_cover_every_session_once_despite_ties(run, limit):
+    user_id = f"pager-{limit}"
+
+    async def scenario():
+        # Three sessions share the same updated_at, so ties fall across page boundaries
+        expected = await create_sessions(user_id, [0, 5, 5, 5, 9, 12])
+        return expected, await list_all(user_id, limit)
+
+    expected, pages = run(scenario())
+    assert [sid for page in pages for sid in page] == expected
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+def test_last_page_has_no_next_cursor(run):
+    async def scenario():
+        await create_sessions("pager-last", [0, 1])
+        exact = await list_page("pager-last", 2)
+        short = await list_page("pager-last", 5)
+        empty = await list_page("pager-nobody", 5)
+        return exact, short, empty
+
+    exact, short, empty = run(scenario())
+    assert len(exact.sessions) == 2 and exact.next_cursor is None
+    assert len(short.sessions) == 2 and short.next_cursor is None
+    assert empty.sessions == [] and empty.next_cursor is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        base64.urlsafe_b64encode(b'{"id": "abc"}').decode(),
+        base64.urlsafe_b64encode(b'{"updated_at": "yesterday", "id": "abc"}').decode(),
+        base64.urlsafe_b64encode(b"[1, 2]").decode(),
+    ],
+)
+def test_malformed_cursor_is_rejected(run, cursor):
+    from Backend.main import app
+
+    with pytest.raises(InvalidCursorException):
+        run(list_page("pager-bad", 2, cursor))
+
+    with TestClient(app) as client:
+        response = client.get("/api/v1/chat/", params={"cursor": cursor}, headers={"X-API-Key": "test-user-key"})
+    assert response.status_code == 400
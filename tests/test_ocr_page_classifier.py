@@ -0,0 +1,186 @@
+import pytest
+
+pytest.importorskip("PyPDF2")
+
+from Backend.core.v1.agents import ocr_agent
+
+TEXT = b"BT /F1 12 Tf 72 720 Td (Rx: amoxicillin 500 mg, one capsule three times daily) Tj ET"
+SHORT_TEXT = b"BT /F1 12 Tf 72 720 Td (Page 2 of 3) Tj ET"
+DRAW_IMAGE = b"q 612 0 0 792 0 0 cm /Im1 Do Q"
+INLINE_IMAGE = b"q 612 0 0 792 0 0 cm BI /W 1 /H 1 /CS /G /BPC 8 ID \x80 EI Q"
+
+
+class PdfBuilder:
+    """Writes small PDFs object by object, so each kind of page can be built exactly."""
+
+    def __init__(self):
+        self.objects = []
+        self.font = self.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    def add(self, body=None):
+        self.objects.append(body)
+        return len(self.objects)
+
+    def stream(self, data, entries=b""):
+        return self.add(b"<< %s /Length %d >>\nstream\n%s\nendstream" % (entries, len(data), data))
+
+    def image(self):
+        return self.stream(b"\x80", b"/Type /XObject /Subtype /Image /Width 1 /Height 1 /ColorSpace /DeviceGray /BitsPerComponent 8")
+
+    def form(self, data, xobjects=None):
+        return self.stream(data, b"/Type /XObject /Subtype /Form /BBox [0 0 1 1] /Resources %s" % self.resources(xobjects))
+
+    def resources(self, xobjects=None):
+        entries = b" ".join(b"/%s %d 0 R" % (name.encode(), number) for name, number in (xobjects or {}).items())
+        return b"<< /Font << /F1 %d 0 R >> /XObject << %s >> >>" % (self.font, entries)
+
+    def write(self, path, pages):
+        """Write ``pages``, given as (content stream, XObject resources) pairs."""
+        parent = self.add()
+        kids = [
+            self.add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Resources %s /Contents %d 0 R >>"
+                % (parent, self.resources(xobjects), self.stream(content))
+            )
+            for content, xobjects in pages
+        ]
+        self.objects[parent - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+        )
+        catalog = self.add(b"<< /Type /Catalog /Pages %d 0 R >>" % parent)
+
+        out, offsets = bytearray(b"%PDF-1.4\n"), []
+        for number, body in enumerate(self.objects, start=1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(self.objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self.objects) + 1, catalog, xref)
+        path.write_bytes(bytes(out))
+        return str(path)
+
+
+def text_layer(pdf):
+    return TEXT, {}
+
+
+def text_over_scan(pdf):
+    return DRAW_IMAGE + b"\n" + TEXT, {"Im1": pdf.image()}
+
+
+def image_xobject(pdf):
+    return DRAW_IMAGE, {"Im1": pdf.image()}
+
+
+def short_text_over_scan(pdf):
+    return DRAW_IMAGE + b"\n" + SHORT_TEXT, {"Im1": pdf.image()}
+
+
+def image_inside_form(pdf):
+    return b"/Fm1 Do", {"Fm1": pdf.form(b"/Im1 Do", {"Im1": pdf.image()})}
+
+
+def image_inside_nested_forms(pdf):
+    inner = pdf.form(b"/Im1 Do", {"Im1": pdf.image()})
+    return b"/Fm1 Do", {"Fm1": pdf.form(b"/Fm2 Do", {"Fm2": inner})}
+
+
+def inline_image_inside_form(pdf):
+    return b"/Fm1 Do", {"Fm1": pdf.form(INLINE_IMAGE)}
+
+
+def inline_image(pdf):
+    return INLINE_IMAGE, {}
+
+
+def empty_page(pdf):
+    return b"", {}
+
+
+def short_text(pdf):
+    return SHORT_TEXT, {}
+
+
+def vector_drawing(pdf):
+    return b"0.5 g 72 72 468 648 re f", {}
+
+
+def form_without_images(pdf):
+    return b"/Fm1 Do", {"Fm1": pdf.form(b"0 0 1 1 re f")}
+
+
+def self_referencing_form(pdf):
+    form = pdf.add()
+    pdf.objects[form - 1] = (
+        b"<< /Type /XObject /Subtype /Form /BBox [0 0 1 1] /Resources << /XObject << /Fm1 %d 0 R >> >> /Length 11 >>\n"
+        b"stream\n0 0 1 1 re f\nendstream" % form
+    )
+    return b"/Fm1 Do", {"Fm1": form}
+
+
+@pytest.fixture
+def ocr_calls(monkeypatch):
+    """Replace EasyOCR with a stub that records the pages it is asked to read."""
+    calls = []
+
+    def ocr_pdf_pages(pdf_path, page_numbers):
+        calls.append(list(page_numbers))
+        return {n: (f"ocr text of page {n}", 0.0) for n in page_numbers}
+
+    monkeypatch.setattr(ocr_agent, "_ocr_pdf_pages", ocr_pdf_pages)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "page, method",
+    [
+        (text_layer, "text"),
+        (text_over_scan, "text"),
+        (image_xobject, "ocr"),
+        (short_text_over_scan, "ocr"),
+        (image_inside_form, "ocr"),
+        (image_inside_nested_forms, "ocr"),
+        (inline_image_inside_form, "ocr"),
+        (inline_image, "ocr"),
+        (empty_page, "blank"),
+        (short_text, "blank"),
+        (vector_drawing, "blank"),
+        (form_without_images, "blank"),
+        (self_referencing_form, "blank"),
+    ],
+)
+def test_page_is_classified(tmp_path, ocr_calls, page, method):
+    pdf = PdfBuilder()
+    path = pdf.write(tmp_path / "doc.pdf", [page(pdf)])
+    stats = []
+    ocr_agent.extract_text_from_pdf(path, stats)
+    assert [stat["method"] for stat in stats] == [method]
+    assert ocr_calls == [[1] if method == "ocr" else []]
+
+
+def test_only_image_pages_are_ocred(tmp_path, ocr_calls):
+    pdf = PdfBuilder()
+    path = pdf.write(
+        tmp_path / "doc.pdf",
+        [text_layer(pdf), image_inside_form(pdf), empty_page(pdf), inline_image(pdf)],
+    )
+    stats = []
+    text = ocr_agent.extract_text_from_pdf(path, stats)
+
+    assert ocr_calls == [[2, 4]]
+    assert [(stat["page"], stat["method"]) for stat in stats] == [(1, "text"), (2, "ocr"), (3, "blank"), (4, "ocr")]
+    assert text.splitlines() == [
+        "Rx: amoxicillin 500 mg, one capsule three times daily",
+        "ocr text of page 2",
+        "ocr text of page 4",
+    ]
+    assert [stat["chars"] for stat in stats] == [53, 18, 0, 18]
+
+
+def test_unreadable_resources_are_sent_to_ocr():
+    class BrokenPage(dict):
+        def get(self, key, default=None):
+            raise ValueError("bad xref")
+
+    assert ocr_agent._page_has_images(BrokenPage())
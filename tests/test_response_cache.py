@@ -0,0 +1,159 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from Backend.core.v1.common import cache as cache_module
+from Backend.core.v1.common.cache import (
+    ResponseCache,
+    SQLiteCacheBackend,
+    TTLLRUCache,
+    normalize_cache_input,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=clock, time=clock))
+    return clock
+
+
+def make_cache(shared=None, ttl=60, max_entries=16):
+    return ResponseCache("test", TTLLRUCache(max_entries=max_entries), shared, ttl=ttl, enabled=True)
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("Headache and fever", "headache and fever"),
+        ("  headache   and\tfever ", "headache and fever"),
+        ("HEADACHE\nAND FEVER", "headache and fever"),
+    ],
+)
+def test_trivially_different_inputs_share_a_key(first, second):
+    cache = make_cache()
+    assert normalize_cache_input(first) == normalize_cache_input(second)
+    assert cache.make_key([first], "model", "v1") == cache.make_key([second], "model", "v1")
+
+
+def test_model_and_prompt_version_are_part_of_the_key():
+    cache = make_cache()
+    key = cache.make_key(["headache"], "model", "v1")
+    assert cache.make_key(["headache"], "other-model", "v1") != key
+    assert cache.make_key(["headache"], "model", "v2") != key
+    assert ResponseCache("other", cache.local).make_key(["headache"], "model", "v1") != key
+
+
+def test_entries_expire_after_their_ttl(clock):
+    local = TTLLRUCache(max_entries=4)
+    local.set("k", "v", ttl=10)
+    clock.now += 9
+    assert local.get("k") == "v"
+    clock.now += 2
+    assert local.get("k") is None
+    assert len(local) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    local = TTLLRUCache(max_entries=2)
+    local.set("a", 1, ttl=60)
+    local.set("b", 2, ttl=60)
+    assert local.get("a") == 1
+    local.set("c", 3, ttl=60)
+    assert local.get("b") is None
+    assert local.get("a") == 1 and local.get("c") == 3
+
+
+def test_counters_track_local_hits_shared_hits_and_misses(tmp_path):
+    shared = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"advice": "rest"}
+
+    first_worker = make_cache(shared)
+    assert first_worker.get_or_compute(["Fever"], "m", "v1", compute) == {"advice": "rest"}
+    assert first_worker.get_or_compute(["fever "], "m", "v1", compute) == {"advice": "rest"}
+
+    # Another process sharing the SQLite tier
+    second_worker = make_cache(shared)
+    assert second_worker.get_or_compute(["fever"], "m", "v1", compute) == {"advice": "rest"}
+    assert second_worker.get_or_compute(["fever"], "m", "v1", compute) == {"advice": "rest"}
+
+    assert len(calls) == 1
+    assert first_worker.metrics.snapshot() == {
+        "hits": 1, "local_hits": 1, "shared_hits": 0, "misses": 1, "hit_rate": 0.5,
+    }
+    assert second_worker.metrics.snapshot() == {
+        "hits": 2, "local_hits": 1, "shared_hits": 1, "misses": 0, "hit_rate": 1.0,
+    }
+
+
+def test_shared_entries_expire(tmp_path, clock):
+    shared = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    shared.set("k", [1, 2], ttl=10)
+    assert shared.get("k") == [1, 2]
+    clock.now += 11
+    assert shared.get("k") is None
+
+
+def test_failed_computations_are_not_cached():
+    cache = make_cache()
+
+    def fail():
+        raise RuntimeError("model unavailable")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute(["fever"], "m", "v1", fail)
+    assert cache.get_or_compute(["fever"], "m", "v1", lambda: "ok") == "ok"
+
+
+def test_disabled_cache_always_computes():
+    cache = ResponseCache("test", TTLLRUCache(), enabled=False)
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute(["fever"], "m", "v1", lambda: calls.append(1) or "v")
+    assert len(calls) == 2
+    assert cache.metrics.snapshot()["misses"] == 0
+
+
+def test_async_path_keeps_the_shared_tier_off_the_event_loop(tmp_path):
+    class RecordingBackend(SQLiteCacheBackend):
+        threads = []
+
+        def get(self, key):
+            self.threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value, ttl):
+            self.threads.append(threading.get_ident())
+            super().set(key, value, ttl)
+
+    shared = RecordingBackend(str(tmp_path / "cache.db"))
+    cache = make_cache(shared)
+
+    async def compute():
+        return "advice"
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        first = await cache.get_or_compute_async(["fever"], "m", "v1", compute)
+        second = await cache.get_or_compute_async(["fever"], "m", "v1", compute)
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(scenario())
+    assert first == second == "advice"
+    assert len(RecordingBackend.threads) == 2
+    assert loop_thread not in RecordingBackend.threads
+    assert cache.metrics.snapshot()["local_hits"] == 1
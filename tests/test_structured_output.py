@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from Backend.core.v1.agents.conversation import ConversationState, TurnContext, bind_turn
+from Backend.core.v1.agents.structured_output import generate_structured, generate_structured_async
+
+VALID = '{"condition": "migraine", "advice": ["rest", "hydrate"]}'
+
+
+class Assessment(BaseModel):
+    condition: str
+    advice: List[str]
+
+
+class StubModel:
+    """Replies to successive calls with the given texts, recording each prompt."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def generate_content(self, prompt, generation_config=None, safety_settings=None):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text=self.replies.pop(0))
+
+    async def generate_content_async(self, prompt, generation_config=None, safety_settings=None):
+        return self.generate_content(prompt, generation_config, safety_settings)
+
+
+def call_sync(model, max_attempts):
+    return generate_structured(model, "Assess", Assessment, {}, max_attempts=max_attempts)
+
+
+def call_async(model, max_attempts):
+    return asyncio.run(generate_structured_async(model, "Assess", Assessment, {}, max_attempts=max_attempts))
+
+
+@pytest.fixture(params=[call_sync, call_async], ids=["sync", "async"])
+def generate(request):
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        f"```json\n{VALID}\n```",
+        f"```\n{VALID}\n```",
+        f"Here is the assessment:\n{VALID}\nStay well!",
+        '{"condition": "migraine", "advice": ["rest", "hydrate",],}',
+    ],
+    ids=["json-fence", "bare-fence", "prose", "trailing-commas"],
+)
+def test_drifted_json_is_repaired_without_another_call(generate, reply):
+    model = StubModel(reply)
+    assert generate(model, 3) == Assessment(condition="migraine", advice=["rest", "hydrate"])
+    assert len(model.prompts) == 1
+
+
+@pytest.mark.parametrize(
+    "bad_reply, error",
+    [
+        ('{"condition": "migraine", "advice": ["rest", "hyd', "response"),
+        ("```json\n{\"condition\": \"migraine\",\n```", "response"),
+        ('{"condition": "migraine"}', "advice: Field required"),
+    ],
+    ids=["truncated", "truncated-fence", "missing-field"],
+)
+def test_invalid_reply_is_retried_with_the_validation_error(generate, bad_reply, error):
+    model = StubModel(bad_reply, VALID)
+    assert generate(model, 3).condition == "migraine"
+    assert len(model.prompts) == 2
+    assert model.prompts[0] == "Assess"
+    assert model.prompts[1].startswith("Assess\n\nYour previous reply did not match the required JSON schema")
+    assert error in model.prompts[1]
+
+
+def test_raises_once_attempts_are_used_up(generate):
+    model = StubModel("not json", "```json\n{\"condition\": ", '{"advice": []}', VALID)
+    with pytest.raises(ValidationError):
+        generate(model, 3)
+    assert len(model.prompts) == 3
+    assert model.replies == [VALID]
+
+
+def test_every_attempt_counts_as_a_model_call(generate):
+    turn = TurnContext(ConversationState())
+    with bind_turn(turn):
+        generate(StubModel("{", "{", VALID), 3)
+    assert turn.model_calls == 3
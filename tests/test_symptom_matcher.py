@@ -0,0 +1,97 @@
+import pytest
+
+from Backend.core.v1.agents.symptom_matcher import SYMPTOM_KEYWORDS, match_symptoms, symptom_phrases
+
+
+def substring_match(text: str) -> bool:
+    """The check the chat agent used before the compiled matcher."""
+    text = text.lower()
+    return any(keyword in text for keyword in SYMPTOM_KEYWORDS)
+
+
+# Messages the substring check flagged as describing symptoms
+SYMPTOM_MESSAGES = [
+    "I have a headache",
+    "I've had headaches for a week",
+    "I have been coughing all night",
+    "My cough is worse in the morning",
+    "painful throat since monday",
+    "I have a sore throat and chills",
+    "feeling feverish and tired",
+    "I had a fever yesterday",
+    "chest pains when I climb stairs",
+    "my lower back pain is getting worse",
+    "Sneezing and a runny nose",
+    "I feel nauseous, nausea after eating",
+    "I get migraines twice a month",
+    "my joints are stiff, joint pain in the knees",
+    "Itching all over with hives",
+    "blurry vision and dizziness",
+    "She has been vomiting since lunch",
+    "my stomach is painfully bloated",
+    "constant fatigue and weakness",
+    "night sweats and unexplained weight loss",
+    "I have panic attacks at work",
+    "COUGHING and WHEEZING",
+]
+
+# Keywords inside unrelated words, which only the substring check matched
+SUBSTRING_FALSE_POSITIVES = [
+    "I just got back from Spain",
+    "We are painting the kitchen",
+    "Road trip to Las Vegas",
+    "The gastronomy tour was great",
+]
+
+NON_SYMPTOM_MESSAGES = [
+    "What should I eat for breakfast?",
+    "Thanks, that helps",
+    "Can you suggest a healthy dinner?",
+]
+
+
+@pytest.mark.parametrize("text", SYMPTOM_MESSAGES)
+def test_matches_everything_the_substring_check_found(text):
+    assert substring_match(text)
+    assert match_symptoms(text)
+
+
+@pytest.mark.parametrize("text", SUBSTRING_FALSE_POSITIVES)
+def test_ignores_keywords_inside_other_words(text):
+    assert substring_match(text)
+    assert match_symptoms(text) == []
+
+
+@pytest.mark.parametrize("text", NON_SYMPTOM_MESSAGES)
+def test_no_match_without_symptoms(text):
+    assert not substring_match(text)
+    assert match_symptoms(text) == []
+
+
+@pytest.mark.parametrize(
+    "text, term, matched",
+    [
+        ("coughing", "cough", "coughing"),
+        ("coughed twice", "cough", "coughed"),
+        ("painful throat", "pain", "painful"),
+        ("feeling feverish", "fever", "feverish"),
+        ("bad headaches", "headache", "headaches"),
+        ("rashes on my arm", "rash", "rashes"),
+    ],
+)
+def test_matches_inflected_forms(text, term, matched):
+    (match,) = match_symptoms(text)
+    assert match.term == term
+    assert text[match.start:match.end] == matched
+
+
+def test_prefers_the_longest_keyword():
+    assert [m.term for m in match_symptoms("chest pain and nausea after eating")] == [
+        "chest pain",
+        "nausea after eating",
+    ]
+
+
+def test_phrases_run_to_the_clause_boundary():
+    text = "Pain in my lower back, and coughing at night"
+    assert symptom_phrases(text, match_symptoms(text)) == ["pain in my lower back", "coughing at night"]
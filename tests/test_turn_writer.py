@@ -0,0 +1,209 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from Backend.core.v1.common.exceptions import DatabaseOperationException, QueueFullException
+from Backend.core.v1.db.session import session_scope
+from Backend.core.v1.db_manager.postgresql.chat_db_manager import AsyncChatDBManager
+from Backend.core.v1.types.chat import ChatMessage, ChatSession
+from Backend.services.v1.chat.turn_writer import ChatTurnWriter
+
+USER = "writer-user"
+
+
+def turn(text):
+    return [ChatMessage(role="user", content=text), ChatMessage(role="assistant", content=f"re: {text}")]
+
+
+async def new_session():
+    async with session_scope() as db:
+        return (await AsyncChatDBManager(db).create(ChatSession(user_id=USER, title="t"))).id
+
+
+async def stored(session_id):
+    async with session_scope() as db:
+        session = await AsyncChatDBManager(db).get_session(USER, session_id)
+    return [message.content for message in session.messages if message.role == "user"]
+
+
+def fail_sessions(monkeypatch, bad, error=None):
+    """Make any write that includes a session in ``bad`` fail."""
+    original = ChatTurnWriter._write
+
+    async def write(self, appends):
+        if any(append.session_id in bad for append in appends):
+            raise error or IntegrityError("INSERT", {}, Exception("bad row"))
+        return await original(self, appends)
+
+    monkeypatch.setattr(ChatTurnWriter, "_write", write)
+
+
+def test_flush_writes_all_sessions_in_one_batch(run):
+    async def scenario():
+        first, second = await new_session(), await new_session()
+        writer = ChatTurnWriter(flush_interval=60)
+        await writer.enqueue(USER, first, turn("a1"), None)
+        await writer.enqueue(USER, second, turn("b1"), None)
+        await writer.enqueue(USER, first, turn("a2"), {"summary": "s"})
+        assert await writer.flush() == 6
+        await writer.close()
+        return writer.stats(), await stored(first), await stored(second)
+
+    stats, first, second = run(scenario())
+    assert first == ["a1", "a2"]
+    assert second == ["b1"]
+    assert stats["flushes"] == 1 and stats["failed_flushes"] == 0
+    assert stats["turns_written"] == 3 and stats["pending_messages"] == 0
+
+
+def test_failed_batch_retries_each_session(run, monkeypatch):
+    async def scenario():
+        good, bad = await new_session(), await new_session()
+        fail_sessions(monkeypatch, {bad})
+        writer = ChatTurnWriter(flush_interval=60)
+        await writer.enqueue(USER, good, turn("ok"), None)
+        await writer.enqueue(USER, bad, turn("broken"), None)
+        written = await writer.flush()
+        await writer.flush_session(good)
+        with pytest.raises(DatabaseOperationException):
+            await writer.flush_session(bad)
+        return written, writer.stats(), writer.has_pending(bad), await stored(good)
+
+    written, stats, bad_pending, good = run(scenario())
+    assert written == 2
+    assert good == ["ok"]
+    assert stats["failed_flushes"] >= 1
+    assert bad_pending
+
+
+def test_requeued_turns_stay_ahead_of_newer_ones(run, monkeypatch):
+    async def scenario():
+        session_id = await new_session()
+        writer = ChatTurnWriter(flush_interval=60)
+        original = ChatTurnWriter._write
+        calls = {"n": 0}
+
+        async def write(self, appends):
+            calls["n"] += 1
+            if calls["n"] <= 2:
+                if calls["n"] == 1:
+                    # A turn arriving while the failing batch is being written
+                    await writer.enqueue(USER, session_id, turn("second"), None)
+                raise OperationalError("INSERT", {}, Exception("connection reset"))
+            return await original(self, appends)
+
+        monkeypatch.setattr(ChatTurnWriter, "_write", write)
+        await writer.enqueue(USER, session_id, turn("first"), None)
+        await writer.flush()
+        assert writer.has_pending(session_id)
+        await writer.flush()
+        return await stored(session_id)
+
+    assert run(scenario()) == ["first", "second"]
+
+
+def test_session_is_dropped_after_max_attempts(run, monkeypatch):
+    async def scenario():
+        good, bad = await new_session(), await new_session()
+        fail_sessions(monkeypatch, {bad})
+        writer = ChatTurnWriter(flush_interval=60, max_attempts=3)
+        await writer.enqueue(USER, bad, turn("broken"), None)
+        for _ in range(3):
+            await writer.flush()
+        assert not writer.has_pending(bad)
+        # The loss is reported once, then the session reads normally again
+        with pytest.raises(DatabaseOperationException):
+            await writer.flush_session(bad)
+        await writer.flush_session(bad)
+
+        await writer.enqueue(USER, good, turn("ok"), None)
+        await writer.flush()
+        return writer.stats(), await stored(bad), await stored(good)
+
+    stats, bad, good = run(scenario())
+    assert stats["dead_lettered_sessions"] == 1
+    assert stats["pending_sessions"] == 0
+    assert bad == []
+    assert good == ["ok"]
+
+
+def test_connection_errors_do_not_use_up_attempts(run, monkeypatch):
+    async def scenario():
+        session_id = await new_session()
+        fail_sessions(monkeypatch, {session_id}, OperationalError("INSERT", {}, Exception("refused")))
+        writer = ChatTurnWriter(flush_interval=60, max_attempts=2)
+        await writer.enqueue(USER, session_id, turn("kept"), None)
+        for _ in range(5):
+            await writer.flush()
+        return writer.has_pending(session_id), writer.stats()["dead_lettered_sessions"]
+
+    assert run(scenario()) == (True, 0)
+
+
+def test_full_queue_applies_backpressure(run, monkeypatch):
+    async def scenario():
+        session_id = await new_session()
+        writer = ChatTurnWriter(flush_interval=60, max_pending=4)
+        await writer.enqueue(USER, session_id, turn("1"), None)
+        await writer.enqueue(USER, session_id, turn("2"), None)
+        # Full: the next turn waits for a flush, which makes room
+        await writer.enqueue(USER, session_id, turn("3"), None)
+        flushes = writer.stats()["flushes"]
+
+        fail_sessions(monkeypatch, {session_id}, OperationalError("INSERT", {}, Exception("down")))
+        await writer.enqueue(USER, session_id, turn("4"), None)
+        with pytest.raises(QueueFullException):
+            await writer.enqueue(USER, session_id, turn("5"), None)
+        monkeypatch.undo()
+        await writer.close()
+        return flushes, await stored(session_id)
+
+    flushes, messages = run(scenario())
+    assert flushes == 1
+    assert messages == ["1", "2", "3", "4"]
+
+
+def test_close_drains_the_queue(run):
+    async def scenario():
+        session_id = await new_session()
+        writer = ChatTurnWriter(flush_interval=60)
+        for i in range(3):
+            await writer.enqueue(USER, session_id, turn(f"t{i}"), None)
+        await writer.close()
+        with pytest.raises(RuntimeError):
+            await writer.enqueue(USER, session_id, turn("late"), None)
+        return await stored(session_id)
+
+    assert run(scenario()) == ["t0", "t1", "t2"]
+
+
+def test_background_loop_survives_a_failed_flush(run, monkeypatch):
+    async def scenario():
+        session_id = await new_session()
+        writer = ChatTurnWriter(flush_interval=0.01)
+        original = ChatTurnWriter._requeue
+        calls = {"n": 0}
+
+        def requeue(self, batch):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise RuntimeError("bookkeeping bug")
+            return original(self, batch)
+
+        monkeypatch.setattr(ChatTurnWriter, "_requeue", requeue)
+        fail_sessions(monkeypatch, {session_id}, OperationalError("INSERT", {}, Exception("down")))
+        await writer.enqueue(USER, session_id, turn("lost"), None)
+        await asyncio.sleep(0.1)
+        task_alive = not writer._task.done()
+
+        monkeypatch.undo()
+        await writer.enqueue(USER, session_id, turn("later"), None)
+        await asyncio.sleep(0.1)
+        result = await stored(session_id)
+        await writer.close()
+        return task_alive, result
+
+    task_alive, messages = run(scenario())
+    assert task_alive
+    assert messages == ["later"]